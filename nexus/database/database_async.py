@@ -0,0 +1,755 @@
+"""
+Asyncio-native database layer mirroring DatabaseManager for async applications.
+Uses async drivers where available (asyncpg, aiosqlite, motor, redis.asyncio) and
+falls back to a bounded thread offload of the synchronous implementations otherwise.
+"""
+
+from nexus.database.database_management import (
+    DatabaseFactory, DatabaseInterface, DatabaseMetrics, IsolationLevel,
+    _to_numeric_placeholders
+)
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Callable
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import wraps, partial
+import importlib.util
+import asyncio
+import logging
+import time
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def measure_time_async(func):
+    """Decorator to measure async query execution time"""
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        start_time = time.time()
+        success = True
+        try:
+            return await func(self, *args, **kwargs)
+        except Exception as e:
+            success = False
+            raise e
+        finally:
+            execution_time = time.time() - start_time
+            query = args[0] if args else "Unknown"
+            if hasattr(self, 'metrics'):
+                self.metrics.record_query(str(query), execution_time, success)
+    return wrapper
+
+
+class AsyncDatabaseInterface(ABC):
+    """Abstract base class for asyncio database operations"""
+
+    def __init__(self, connection_params: Dict[str, Any],
+                 metrics: Optional[DatabaseMetrics] = None):
+        self.connection_params = connection_params
+        self.connection = None
+        self.logger = logging.getLogger(f"{self.__class__.__name__}")
+        self.metrics = metrics or DatabaseMetrics()
+        self._transaction_depth = 0
+        self._isolation_level = None
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Establish database connection"""
+        pass
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """Close database connection"""
+        pass
+
+    @abstractmethod
+    async def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        """Execute a query and return results"""
+        pass
+
+    @abstractmethod
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        """Execute a query multiple times with different parameters"""
+        pass
+
+    @abstractmethod
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        """Fetch a single row"""
+        pass
+
+    @abstractmethod
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        """Fetch all rows"""
+        pass
+
+    async def begin(self) -> None:
+        """Begin a transaction (implicit for most drivers)"""
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Commit current transaction"""
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Rollback current transaction"""
+        pass
+
+    async def is_connected(self) -> bool:
+        """Check if connection is alive"""
+        return self.connection is not None
+
+    async def set_isolation_level(self, level: IsolationLevel):
+        """Set transaction isolation level"""
+        self._isolation_level = level
+
+    @asynccontextmanager
+    async def transaction(self, isolation_level: Optional[IsolationLevel] = None):
+        """Async context manager for transactions with nested support"""
+        self._transaction_depth += 1
+        is_outer = self._transaction_depth == 1
+
+        try:
+            if is_outer:
+                if isolation_level:
+                    await self.set_isolation_level(isolation_level)
+                await self.begin()
+            yield self
+            if is_outer:
+                await self.commit()
+                self.logger.debug("Transaction committed")
+        except Exception as e:
+            if is_outer:
+                await self.rollback()
+                self.logger.error(f"Transaction rolled back: {e}")
+            raise e
+        finally:
+            self._transaction_depth -= 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get performance metrics"""
+        return self.metrics.get_stats()
+
+
+class AsyncPostgreSQLDatabase(AsyncDatabaseInterface):
+    """PostgreSQL implementation on top of asyncpg"""
+
+    async def connect(self) -> None:
+        import asyncpg
+        self.connection = await asyncpg.connect(
+            host=self.connection_params.get('host', 'localhost'),
+            port=self.connection_params.get('port', 5432),
+            database=self.connection_params['database'],
+            user=self.connection_params['user'],
+            password=self.connection_params['password'],
+            timeout=self.connection_params.get('timeout', 10)
+        )
+        self._transaction = None
+        self.metrics.connection_count += 1
+        self.metrics.active_connections += 1
+        self.logger.info("PostgreSQL (asyncpg) connection established")
+
+    async def disconnect(self) -> None:
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+            self.metrics.active_connections -= 1
+            self.logger.info("PostgreSQL (asyncpg) connection closed")
+
+    @measure_time_async
+    async def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        status = await self.connection.execute(_to_numeric_placeholders(query), *(params or ()))
+        # asyncpg returns a command tag such as "UPDATE 3"
+        last = status.split()[-1] if status else ''
+        return int(last) if last.isdigit() else status
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        await self.connection.executemany(_to_numeric_placeholders(query), params_list)
+
+    @measure_time_async
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        row = await self.connection.fetchrow(_to_numeric_placeholders(query), *(params or ()))
+        return dict(row) if row else None
+
+    @measure_time_async
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        rows = await self.connection.fetch(_to_numeric_placeholders(query), *(params or ()))
+        return [dict(row) for row in rows]
+
+    async def begin(self) -> None:
+        isolation_map = {
+            IsolationLevel.READ_UNCOMMITTED: 'read_uncommitted',
+            IsolationLevel.READ_COMMITTED: 'read_committed',
+            IsolationLevel.REPEATABLE_READ: 'repeatable_read',
+            IsolationLevel.SERIALIZABLE: 'serializable'
+        }
+        isolation = isolation_map.get(self._isolation_level, 'read_committed')
+        self._transaction = self.connection.transaction(isolation=isolation)
+        await self._transaction.start()
+
+    async def commit(self) -> None:
+        # asyncpg autocommits outside explicit transactions
+        if self._transaction:
+            await self._transaction.commit()
+            self._transaction = None
+
+    async def rollback(self) -> None:
+        if self._transaction:
+            await self._transaction.rollback()
+            self._transaction = None
+
+    async def is_connected(self) -> bool:
+        return self.connection is not None and not self.connection.is_closed()
+
+
+class AsyncSQLiteDatabase(AsyncDatabaseInterface):
+    """SQLite implementation on top of aiosqlite"""
+
+    async def connect(self) -> None:
+        import aiosqlite
+        self.connection = await aiosqlite.connect(
+            self.connection_params['database'],
+            timeout=self.connection_params.get('timeout', 10)
+        )
+        self.connection.row_factory = aiosqlite.Row
+        await self.connection.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
+        await self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.metrics.connection_count += 1
+        self.metrics.active_connections += 1
+        self.logger.info("SQLite (aiosqlite) connection established")
+
+    async def disconnect(self) -> None:
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+            self.metrics.active_connections -= 1
+            self.logger.info("SQLite (aiosqlite) connection closed")
+
+    @measure_time_async
+    async def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        cursor = await self.connection.execute(query, params or ())
+        rowcount = cursor.rowcount
+        await cursor.close()
+        return rowcount
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        await self.connection.executemany(query, params_list)
+
+    @measure_time_async
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        async with self.connection.execute(query, params or ()) as cursor:
+            row = await cursor.fetchone()
+        return dict(row) if row else None
+
+    @measure_time_async
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        async with self.connection.execute(query, params or ()) as cursor:
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def commit(self) -> None:
+        await self.connection.commit()
+
+    async def rollback(self) -> None:
+        await self.connection.rollback()
+
+
+class AsyncMongoDBDatabase(AsyncDatabaseInterface):
+    """MongoDB implementation on top of motor"""
+
+    async def connect(self) -> None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        uri = self.connection_params.get('uri', 'mongodb://localhost:27017')
+        self.client = AsyncIOMotorClient(
+            uri,
+            maxPoolSize=self.connection_params.get('pool_size', 10),
+            minPoolSize=self.connection_params.get('min_pool_size', 2),
+            serverSelectionTimeoutMS=self.connection_params.get('timeout', 10000)
+        )
+
+        # Verify connection
+        try:
+            await self.client.admin.command('ismaster')
+        except Exception:
+            raise Exception("Failed to connect to MongoDB")
+
+        self.connection = self.client[self.connection_params['database']]
+        self.metrics.connection_count += 1
+        self.metrics.active_connections += 1
+        self.logger.info("MongoDB (motor) connection established")
+
+    async def disconnect(self) -> None:
+        if getattr(self, 'client', None):
+            self.client.close()
+            self.connection = None
+            self.metrics.active_connections -= 1
+            self.logger.info("MongoDB (motor) connection closed")
+
+    async def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        raise NotImplementedError("Use insert_one, update_one, delete_one methods for MongoDB")
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        raise NotImplementedError("Use insert_many, update_many for MongoDB")
+
+    @measure_time_async
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        return await self.connection[query].find_one(params or {})
+
+    @measure_time_async
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        return await self.connection[query].find(params or {}).to_list(length=None)
+
+    @measure_time_async
+    async def insert_one(self, collection_name: str, document: Dict) -> str:
+        """Insert a single document"""
+        result = await self.connection[collection_name].insert_one(document)
+        return str(result.inserted_id)
+
+    @measure_time_async
+    async def insert_many(self, collection_name: str, documents: List[Dict]) -> List[str]:
+        """Insert multiple documents"""
+        result = await self.connection[collection_name].insert_many(documents)
+        return [str(id) for id in result.inserted_ids]
+
+    @measure_time_async
+    async def update_one(self, collection_name: str, filter_dict: Dict, update_dict: Dict) -> int:
+        """Update a single document"""
+        result = await self.connection[collection_name].update_one(filter_dict, {'$set': update_dict})
+        return result.modified_count
+
+    @measure_time_async
+    async def delete_one(self, collection_name: str, filter_dict: Dict) -> int:
+        """Delete a single document"""
+        result = await self.connection[collection_name].delete_one(filter_dict)
+        return result.deleted_count
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+class AsyncRedisDatabase(AsyncDatabaseInterface):
+    """Redis implementation on top of redis.asyncio"""
+
+    async def connect(self) -> None:
+        import redis.asyncio as aioredis
+        self.connection = aioredis.Redis(
+            host=self.connection_params.get('host', 'localhost'),
+            port=self.connection_params.get('port', 6379),
+            db=self.connection_params.get('db', 0),
+            password=self.connection_params.get('password'),
+            decode_responses=True,
+            max_connections=self.connection_params.get('pool_size', 10),
+            socket_timeout=self.connection_params.get('timeout', 10)
+        )
+        await self.connection.ping()  # Test connection
+        self.metrics.connection_count += 1
+        self.metrics.active_connections += 1
+        self.logger.info("Redis (asyncio) connection established")
+
+    async def disconnect(self) -> None:
+        if self.connection:
+            await self.connection.aclose()
+            self.connection = None
+            self.metrics.active_connections -= 1
+
+    @measure_time_async
+    async def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        return await self.connection.execute_command(query, *params if params else [])
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        pipeline = self.connection.pipeline()
+        for params in params_list:
+            pipeline.execute_command(query, *params)
+        await pipeline.execute()
+
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        value = await self.connection.get(query)
+        return {'key': query, 'value': value} if value else None
+
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        keys = await self.connection.keys(query)
+        values = await self.connection.mget(keys) if keys else []
+        return [{'key': k, 'value': v} for k, v in zip(keys, values)]
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+class ThreadOffloadDatabase(AsyncDatabaseInterface):
+    """
+    Async adapter running a synchronous DatabaseInterface on a bounded executor.
+    Used for backends without an async driver; concurrency is capped by the executor.
+    """
+
+    def __init__(self, sync_db: DatabaseInterface, executor: ThreadPoolExecutor,
+                 metrics: Optional[DatabaseMetrics] = None):
+        super().__init__(sync_db.connection_params, metrics or sync_db.metrics)
+        self.sync_db = sync_db
+        self.sync_db.metrics = self.metrics
+        self._executor = executor
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """Run a blocking call on the shared executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def connect(self) -> None:
+        await self._run(self.sync_db.connect)
+        self.connection = self.sync_db.connection
+
+    async def disconnect(self) -> None:
+        await self._run(self.sync_db.disconnect)
+        self.connection = None
+
+    async def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        return await self._run(self.sync_db.execute, query, params)
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        return await self._run(self.sync_db.execute_many, query, params_list)
+
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        return await self._run(self.sync_db.fetch_one, query, params)
+
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        return await self._run(self.sync_db.fetch_all, query, params)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_db.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_db.rollback)
+
+    async def set_isolation_level(self, level: IsolationLevel):
+        await self._run(self.sync_db.set_isolation_level, level)
+
+    async def is_connected(self) -> bool:
+        return await self._run(self.sync_db.is_connected)
+
+
+class AsyncConnectionPool:
+    """Asyncio connection pool; waiters are coroutines, not threads"""
+
+    def __init__(self, connection_factory: Callable[[], AsyncDatabaseInterface],
+                 min_size: int = 2, max_size: int = 10,
+                 logger: Optional[logging.Logger] = None):
+        self.connection_factory = connection_factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.active_connections = 0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def initialize(self):
+        """Initialize minimum connections"""
+        for _ in range(self.min_size):
+            async with self._lock:
+                self.active_connections += 1
+            conn = await self._create_connection()
+            if conn:
+                self.pool.put_nowait(conn)
+
+    async def _create_connection(self) -> Optional[AsyncDatabaseInterface]:
+        """Create a new database connection (caller has already reserved the slot)"""
+        try:
+            conn = self.connection_factory()
+            await conn.connect()
+            self.logger.info(f"Created new connection. Active: {self.active_connections}")
+            return conn
+        except Exception as e:
+            self.logger.error(f"Failed to create connection: {e}")
+            async with self._lock:
+                self.active_connections -= 1
+            return None
+
+    async def get_connection(self, timeout: float = 30) -> AsyncDatabaseInterface:
+        """Get a connection from the pool"""
+        try:
+            return self.pool.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        # Pool is empty, try to create new connection
+        async with self._lock:
+            can_create = self.active_connections < self.max_size
+            if can_create:
+                self.active_connections += 1
+        if can_create:
+            conn = await self._create_connection()
+            if conn:
+                return conn
+
+        self.waiting += 1
+        try:
+            return await asyncio.wait_for(self.pool.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Connection pool exhausted")
+        finally:
+            self.waiting -= 1
+
+    async def release_connection(self, conn: AsyncDatabaseInterface):
+        """Return a connection to the pool"""
+        if conn:
+            try:
+                self.pool.put_nowait(conn)
+            except asyncio.QueueFull:
+                self.logger.error("Failed to return connection to pool: pool full")
+                await conn.disconnect()
+                async with self._lock:
+                    self.active_connections -= 1
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float = 30):
+        """Context manager that checks a connection out and back in"""
+        conn = await self.get_connection(timeout)
+        try:
+            yield conn
+        finally:
+            await self.release_connection(conn)
+
+    async def close_all(self):
+        """Close all connections in the pool"""
+        while not self.pool.empty():
+            conn = self.pool.get_nowait()
+            try:
+                await conn.disconnect()
+            except Exception as e:
+                self.logger.warning(f"Error closing connection: {e}")
+            async with self._lock:
+                self.active_connections -= 1
+
+        self.logger.info("All connections closed")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool statistics"""
+        return {
+            'active_connections': self.active_connections,
+            'available_connections': self.pool.qsize(),
+            'waiting_requests': self.waiting,
+            'max_connections': self.max_size
+        }
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio counterpart of DatabaseManager with its own connection pool and metrics.
+    Call ``await manager.initialize()`` (or use ``async with``) before issuing queries.
+    """
+
+    # db_type -> (driver module, native implementation)
+    NATIVE_DRIVERS = {
+        'postgresql': ('asyncpg', AsyncPostgreSQLDatabase),
+        'sqlite': ('aiosqlite', AsyncSQLiteDatabase),
+        'mongodb': ('motor', AsyncMongoDBDatabase),
+        'redis': ('redis.asyncio', AsyncRedisDatabase),
+    }
+
+    def __init__(self, db_type: str, connection_params: Dict[str, Any],
+                 use_pool: bool = True, pool_config: Optional[Dict[str, int]] = None,
+                 prefer_native: bool = True, max_offload_threads: Optional[int] = None):
+        self.db_type = db_type.lower()
+        self.connection_params = connection_params
+        self.use_pool = use_pool
+        self.pool: Optional[AsyncConnectionPool] = None
+        self.metrics = DatabaseMetrics()
+        self.logger = logging.getLogger(f"AsyncDatabaseManager-{db_type}")
+
+        pool_config = pool_config or {}
+        self.pool_config = pool_config
+
+        # Validates db_type the same way the sync factory does
+        DatabaseFactory.create_database(self.db_type, connection_params)
+
+        self.native = prefer_native and self._has_native_driver()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not self.native:
+            # Bounded offload: never more threads than pooled connections
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_offload_threads or pool_config.get('max_size', 10),
+                thread_name_prefix=f"nexus-db-{self.db_type}"
+            )
+
+        if use_pool:
+            self.pool = AsyncConnectionPool(
+                self._create_connection,
+                min_size=pool_config.get('min_size', 2),
+                max_size=pool_config.get('max_size', 10),
+                logger=self.logger
+            )
+
+        self.logger.info(
+            f"Async manager for {db_type} using "
+            f"{'native driver' if self.native else 'thread offload'}"
+        )
+
+    def _has_native_driver(self) -> bool:
+        """Check whether an async driver is installed for this backend"""
+        driver = self.NATIVE_DRIVERS.get(self.db_type)
+        if not driver:
+            return False
+        try:
+            return importlib.util.find_spec(driver[0]) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def _create_connection(self) -> AsyncDatabaseInterface:
+        """Create an (unconnected) async database instance"""
+        if self.native:
+            db_class = self.NATIVE_DRIVERS[self.db_type][1]
+            return db_class(self.connection_params, metrics=self.metrics)
+
+        sync_db = DatabaseFactory.create_database(self.db_type, self.connection_params)
+        return ThreadOffloadDatabase(sync_db, self._executor, metrics=self.metrics)
+
+    async def initialize(self):
+        """Open the minimum number of pooled connections"""
+        if self.pool:
+            await self.pool.initialize()
+            self.logger.info(f"Async connection pool initialized for {self.db_type}")
+
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """Get a database connection (from pool or new)"""
+        if self.use_pool and self.pool:
+            async with self.pool.acquire() as conn:
+                yield conn
+        else:
+            conn = self._create_connection()
+            await conn.connect()
+            try:
+                yield conn
+            finally:
+                await conn.disconnect()
+
+    async def execute_query(self, query: str, params: Optional[tuple] = None,
+                            fetch: str = 'none') -> Any:
+        """
+        Execute a query with automatic connection management
+
+        Args:
+            query: SQL query or operation
+            params: Query parameters
+            fetch: 'none', 'one', or 'all'
+        """
+        async with self.get_connection() as conn:
+            if fetch == 'one':
+                return await conn.fetch_one(query, params)
+            elif fetch == 'all':
+                return await conn.fetch_all(query, params)
+            else:
+                return await conn.execute(query, params)
+
+    async def execute_transaction(self, operations: List[tuple],
+                                  isolation_level: Optional[IsolationLevel] = None) -> bool:
+        """
+        Execute multiple operations in a transaction
+
+        Args:
+            operations: List of (query, params) tuples
+            isolation_level: Transaction isolation level
+        """
+        try:
+            async with self.get_connection() as conn:
+                async with conn.transaction(isolation_level):
+                    for query, params in operations:
+                        await conn.execute(query, params)
+            return True
+        except Exception as e:
+            self.logger.error(f"Transaction failed: {e}")
+            return False
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check database health and connectivity"""
+        try:
+            async with self.get_connection() as conn:
+                is_connected = await conn.is_connected()
+
+                health_status = {
+                    'status': 'healthy' if is_connected else 'unhealthy',
+                    'database_type': self.db_type,
+                    'connected': is_connected,
+                    'driver': 'native' if self.native else 'thread_offload',
+                    'metrics': conn.get_metrics(),
+                    'timestamp': datetime.now().isoformat()
+                }
+
+                if self.pool:
+                    health_status['pool_stats'] = self.pool.get_stats()
+
+                return health_status
+        except Exception as e:
+            return {
+                'status': 'unhealthy',
+                'database_type': self.db_type,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get aggregated metrics from all connections"""
+        metrics = {
+            'database_type': self.db_type,
+            'query_metrics': self.metrics.get_stats()
+        }
+        if self.pool:
+            metrics['pool_stats'] = self.pool.get_stats()
+        return metrics
+
+    async def close(self):
+        """Close all connections and the offload executor"""
+        if self.pool:
+            await self.pool.close_all()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        self.logger.info("Async database manager closed")
+
+
+# Example usage
+if __name__ == "__main__":
+    async def main():
+        pg_params = {
+            'host': 'localhost',
+            'database': 'mydb',
+            'user': 'postgres',
+            'password': 'password'
+        }
+
+        async with AsyncDatabaseManager('postgresql', pg_params,
+                                        pool_config={'min_size': 2, 'max_size': 20}) as db:
+            users = await db.execute_query(
+                "SELECT * FROM users WHERE age > %s", (18,), fetch='all'
+            )
+            print(f"Found {len(users)} users")
+
+            # Thousands of concurrent queries share the pool without a thread each
+            results = await asyncio.gather(*[
+                db.execute_query("SELECT %s AS n", (i,), fetch='one')
+                for i in range(1000)
+            ])
+            print(f"Completed {len(results)} concurrent queries")
+
+            print(f"Health: {await db.health_check()}")
+
+    asyncio.run(main())
@@ -4,16 +4,28 @@ Supports: PostgreSQL, MySQL, SQLite, MongoDB, Oracle, SQL Server, Redis, Cassand
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union, Callable
-from contextlib import contextmanager
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Union, Callable, Iterator
+from contextlib import contextmanager, ExitStack
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
 from enum import Enum
 import logging
 import time
 import threading
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
+from collections import OrderedDict, deque
+import gzip
+import hashlib
+import io
+import itertools
 import json
+import pickle
+import random
+import re
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import math
+import weakref
 
 
 # Configure logging
@@ -31,30 +43,53 @@ class IsolationLevel(Enum):
     SERIALIZABLE = "SERIALIZABLE"
 
 
+def fingerprint_query(query: str) -> str:
+    """Normalize literals and whitespace so queries differing only in values share a fingerprint"""
+    normalized = re.sub(r"'(?:[^']|'')*'", '?', query)
+    normalized = re.sub(r'\b\d+(?:\.\d+)?\b', '?', normalized)
+    normalized = re.sub(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)', '(?+)', normalized)
+    normalized = ' '.join(normalized.split()).lower()
+    return hashlib.md5(normalized.encode()).hexdigest()[:16]
+
+
 class DatabaseMetrics:
     """Tracks database performance metrics"""
     
-    def __init__(self):
+    def __init__(self, slow_query_threshold: float = 1.0,
+                 on_slow_query: Optional[Callable[[Dict[str, Any], str, Optional[tuple]], None]] = None):
         self.query_count = 0
         self.total_query_time = 0.0
         self.slow_queries = []
         self.errors = []
         self.connection_count = 0
         self.active_connections = 0
+        self.statement_cache_hits = 0
+        self.statement_cache_misses = 0
+        self.slow_query_threshold = slow_query_threshold
+        self.on_slow_query = on_slow_query
+        self.on_query: Optional[Callable[[str], None]] = None
+        self.query_plans = OrderedDict()  # fingerprint -> captured plan
         self._lock = threading.Lock()
     
-    def record_query(self, query: str, execution_time: float, success: bool = True):
+    def record_query(self, query: str, execution_time: float, success: bool = True,
+                     params: Optional[tuple] = None):
         """Record query execution metrics"""
+        slow_record = None
         with self._lock:
             self.query_count += 1
             self.total_query_time += execution_time
             
-            if execution_time > 1.0:  # Slow query threshold: 1 second
-                self.slow_queries.append({
+            if execution_time > self.slow_query_threshold:
+                fingerprint = fingerprint_query(query)
+                slow_record = {
                     'query': query[:200],
+                    'fingerprint': fingerprint,
                     'execution_time': execution_time,
                     'timestamp': datetime.now().isoformat()
-                })
+                }
+                if fingerprint in self.query_plans:
+                    slow_record['plan'] = self.query_plans[fingerprint]['plan']
+                self.slow_queries.append(slow_record)
                 
                 # Keep only last 100 slow queries
                 if len(self.slow_queries) > 100:
@@ -65,18 +100,56 @@ class DatabaseMetrics:
                     'query': query[:200],
                     'timestamp': datetime.now().isoformat()
                 })
+        
+        # Notify outside the lock; listeners must not block (see SlowQueryExplainer)
+        if self.on_query:
+            self.on_query(query)
+        if slow_record and success and self.on_slow_query:
+            self.on_slow_query(slow_record, query, params)
+    
+    def record_query_plan(self, fingerprint: str, plan: Any):
+        """Store a captured plan and attach it to the matching slow-query records"""
+        with self._lock:
+            self.query_plans[fingerprint] = {
+                'plan': plan,
+                'captured_at': datetime.now().isoformat()
+            }
+            self.query_plans.move_to_end(fingerprint)
+            if len(self.query_plans) > 100:
+                self.query_plans.popitem(last=False)
+            
+            for record in self.slow_queries:
+                if record.get('fingerprint') == fingerprint:
+                    record['plan'] = plan
+    
+    def get_query_plan(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Get the last captured plan for a query fingerprint"""
+        with self._lock:
+            return self.query_plans.get(fingerprint)
+    
+    def record_statement_cache(self, hit: bool):
+        """Record a prepared statement cache lookup"""
+        with self._lock:
+            if hit:
+                self.statement_cache_hits += 1
+            else:
+                self.statement_cache_misses += 1
     
     def get_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
         with self._lock:
             avg_time = self.total_query_time / self.query_count if self.query_count > 0 else 0
+            lookups = self.statement_cache_hits + self.statement_cache_misses
             return {
                 'total_queries': self.query_count,
                 'average_query_time': round(avg_time, 4),
                 'slow_queries_count': len(self.slow_queries),
                 'errors_count': len(self.errors),
                 'active_connections': self.active_connections,
-                'total_connections': self.connection_count
+                'total_connections': self.connection_count,
+                'statement_cache_hits': self.statement_cache_hits,
+                'statement_cache_misses': self.statement_cache_misses,
+                'statement_cache_hit_rate': round(self.statement_cache_hits / lookups, 4) if lookups else 0
             }
     
     def reset(self):
@@ -86,6 +159,154 @@ class DatabaseMetrics:
             self.total_query_time = 0.0
             self.slow_queries.clear()
             self.errors.clear()
+            self.query_plans.clear()
+            self.statement_cache_hits = 0
+            self.statement_cache_misses = 0
+
+
+class SlowQueryExplainer:
+    """
+    Captures execution plans for slow queries on a dedicated background connection.
+    Plans are rate-limited per fingerprint and queued without blocking, so capture never amplifies load.
+    One explainer can be shared by every connection of a pool: attach() each connection's metrics
+    and captured plans are recorded in all of them.
+    """
+    
+    def __init__(self, connection_factory: Callable[[], 'DatabaseInterface'], explain_prefix: str,
+                 on_plan: Optional[Callable[[str, Any], None]] = None, min_interval: float = 300.0,
+                 queue_size: int = 100, logger: Optional[logging.Logger] = None):
+        self.connection_factory = connection_factory
+        self.explain_prefix = explain_prefix
+        self.on_plan = on_plan
+        self.min_interval = min_interval
+        self.queue = Queue(maxsize=queue_size)
+        self.logger = logger or logging.getLogger('SlowQueryExplainer')
+        self._last_capture: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._connection = None
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._attached: 'weakref.WeakSet[DatabaseMetrics]' = weakref.WeakSet()
+    
+    @classmethod
+    def for_database(cls, db_class, connection_params: Dict[str, Any],
+                     logger: Optional[logging.Logger] = None) -> Optional['SlowQueryExplainer']:
+        """Build an explainer for a backend class, or None if it has no EXPLAIN"""
+        if not db_class.explain_prefix:
+            return None
+        background_params = {**connection_params, 'explain_slow_queries': False}
+        return cls(
+            connection_factory=lambda: db_class(background_params),
+            explain_prefix=db_class.explain_prefix,
+            min_interval=connection_params.get('explain_min_interval', 300.0),
+            logger=logger
+        )
+    
+    def attach(self, metrics: 'DatabaseMetrics'):
+        """Send this connection's slow queries here and record captured plans in its metrics"""
+        with self._lock:
+            self._attached.add(metrics)
+        metrics.on_slow_query = self.submit
+    
+    def detach(self, metrics: 'DatabaseMetrics'):
+        with self._lock:
+            self._attached.discard(metrics)
+        if metrics.on_slow_query == self.submit:
+            metrics.on_slow_query = None
+    
+    def _publish(self, fingerprint: str, plan: Any):
+        if self.on_plan:
+            self.on_plan(fingerprint, plan)
+        with self._lock:
+            attached = list(self._attached)
+        for metrics in attached:
+            metrics.record_query_plan(fingerprint, plan)
+    
+    def submit(self, record: Dict[str, Any], query: str, params: Optional[tuple] = None) -> bool:
+        """Queue a plan capture unless this fingerprint was explained recently"""
+        if not _is_preparable(query) or isinstance(params, list):
+            # execute_many passes a list of parameter tuples, which cannot be explained
+            return False
+        
+        fingerprint = record['fingerprint']
+        now = time.time()
+        with self._lock:
+            last = self._last_capture.get(fingerprint)
+            if last is not None and now - last < self.min_interval:
+                return False
+            self._last_capture[fingerprint] = now
+            self._ensure_worker()
+        
+        try:
+            self.queue.put_nowait((fingerprint, query, params))
+            return True
+        except Full:
+            self.logger.debug(f"Explain queue full, skipping plan for {fingerprint}")
+            return False
+    
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stop_event.clear()
+            self._worker = threading.Thread(target=self._run, daemon=True, name='nexus-explain')
+            self._worker.start()
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                fingerprint, query, params = self.queue.get(timeout=0.1)
+            except Empty:
+                continue
+            
+            try:
+                plan = self.explain(query, params)
+                self._publish(fingerprint, plan)
+            except Exception as e:
+                self.logger.warning(f"Failed to capture plan for {fingerprint}: {e}")
+                self._close_connection()
+            finally:
+                self.queue.task_done()
+    
+    def explain(self, query: str, params: Optional[tuple] = None) -> Any:
+        """Run EXPLAIN for a query on the background connection"""
+        if self._connection is None:
+            self._connection = self.connection_factory()
+            self._connection.connect()
+        
+        try:
+            rows = self._connection.fetch_all(f"{self.explain_prefix} {query}", params)
+        finally:
+            self._connection.rollback()
+        return self._normalize_plan(rows)
+    
+    @staticmethod
+    def _normalize_plan(rows: List[Dict]) -> Any:
+        """Unwrap single-cell JSON plans (PostgreSQL/MySQL); keep row plans (SQLite) as-is"""
+        rows = [dict(row) for row in rows]
+        if len(rows) == 1 and len(rows[0]) == 1:
+            plan = next(iter(rows[0].values()))
+            if isinstance(plan, str):
+                try:
+                    return json.loads(plan)
+                except ValueError:
+                    return plan
+            return plan
+        return rows
+    
+    def _close_connection(self):
+        if self._connection is not None:
+            try:
+                self._connection.disconnect()
+            except Exception:
+                pass
+            self._connection = None
+    
+    def close(self):
+        """Stop the worker and close the background connection (a later submit restarts them)"""
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout=5)
+            self._worker = None
+        self._close_connection()
 
 
 def measure_time(func):
@@ -100,6 +321,26 @@ def measure_time(func):
         except Exception as e:
             success = False
             raise e
+        finally:
+            execution_time = time.time() - start_time
+            query = args[0] if args else "Unknown"
+            params = args[1] if len(args) > 1 else kwargs.get('params')
+            if hasattr(self, 'metrics'):
+                self.metrics.record_query(str(query), execution_time, success, params=params)
+    return wrapper
+
+
+def measure_iter(func):
+    """Decorator to measure a streaming query from first call until the iterator is closed"""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start_time = time.time()
+        success = True
+        try:
+            yield from func(self, *args, **kwargs)
+        except Exception as e:
+            success = False
+            raise e
         finally:
             execution_time = time.time() - start_time
             query = args[0] if args else "Unknown"
@@ -108,6 +349,279 @@ def measure_time(func):
     return wrapper
 
 
+# Quoted literals and identifiers match first, so a '%s' inside them is never a placeholder
+_PLACEHOLDER_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|%%|%s")
+
+
+def _to_numeric_placeholders(query: str) -> str:
+    """Convert DB-API '%s' placeholders outside quoted literals to PostgreSQL '$n' placeholders"""
+    counter = itertools.count(1)
+    
+    def replace(match):
+        token = match.group()
+        return f"${next(counter)}" if token == '%s' else token.replace('%%', '%')
+    
+    return _PLACEHOLDER_PATTERN.sub(replace, query)
+
+
+def _is_preparable(query: str) -> bool:
+    """Check whether a statement is plain DML/SELECT that servers can prepare"""
+    words = query.lstrip(' (\t\n\r').split(None, 1)
+    return bool(words) and words[0].upper() in ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'VALUES')
+
+
+_READ_VERBS = ('SELECT', 'WITH', 'SHOW', 'EXPLAIN', 'DESCRIBE', 'DESC', 'VALUES')
+_WRITE_MARKERS = re.compile(
+    r'\b(?:INSERT|UPDATE|DELETE|MERGE|UPSERT|REPLACE|CREATE|ALTER|DROP|TRUNCATE|'
+    r'GRANT|REVOKE|LOCK|INTO|NEXTVAL|SETVAL)\b|\bFOR\s+(?:NO\s+KEY\s+)?(?:KEY\s+)?SHARE\b',
+    re.IGNORECASE
+)
+
+
+def is_read_only_query(query: str) -> bool:
+    """Check whether a SQL statement only reads data and can be served by a replica"""
+    words = query.lstrip(' (\t\n\r').split(None, 1)
+    if not words or words[0].upper() not in _READ_VERBS:
+        return False
+    return not _WRITE_MARKERS.search(re.sub(r"'(?:[^']|'')*'", "''", query))
+
+
+# Upper bound on rows folded into a single multi-row INSERT to stay under server packet limits
+_MAX_ROWS_PER_STATEMENT = 1000
+
+_INSERT_VALUES = re.compile(
+    r'^(?P<head>\s*INSERT\s.+?\bVALUES\s*)(?P<row>\(\s*%s(?:\s*,\s*%s)*\s*\))(?P<tail>.*)$',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _split_insert_values(query: str) -> Optional[tuple]:
+    """Split 'INSERT ... VALUES (%s, ...) [tail]' into (head, row, tail); None for anything else"""
+    match = _INSERT_VALUES.match(query)
+    if not match or 'RETURNING' in match.group('tail').upper():
+        return None
+    return match.group('head'), match.group('row'), match.group('tail')
+
+
+def _group_statements(queries: List[tuple]) -> List[tuple]:
+    """Group consecutive (query, params) pairs sharing the same statement into (query, [params, ...])"""
+    groups = []
+    for query, params in queries:
+        if groups and params is not None and groups[-1][0] == query and groups[-1][1][-1] is not None:
+            groups[-1][1].append(params)
+        else:
+            groups.append((query, [params]))
+    return groups
+
+
+_TABLE_CLAUSE = re.compile(
+    r'\b(?:TRUNCATE(?:\s+TABLE)?|TABLE|FROM|JOIN|INTO|UPDATE)\s+(.*?)'
+    r'(?=\b(?:WHERE|GROUP|ORDER|HAVING|LIMIT|OFFSET|UNION|INTERSECT|EXCEPT|JOIN|INNER|LEFT|RIGHT|'
+    r'FULL|CROSS|NATURAL|OUTER|ON|USING|SET|VALUES|SELECT|RETURNING|WINDOW|FOR)\b|[();]|$)',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def referenced_tables(query: str) -> set:
+    """Best-effort set of table names a SQL statement reads or writes (lowercase, schema stripped)"""
+    tables = set()
+    for match in _TABLE_CLAUSE.finditer(re.sub(r"'(?:[^']|'')*'", "''", query)):
+        for part in match.group(1).split(','):
+            words = part.split()
+            if not words:
+                continue
+            name = words[0].split('.')[-1].strip('"`[]').lower()
+            if name and name.upper() not in ('IF', 'ONLY', 'LATERAL'):
+                tables.add(name)
+    return tables
+
+
+class QueryResultCache:
+    """Byte-bounded LRU cache of query results with table-level invalidation"""
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 60.0):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (payload, expires_at, tables)
+        self._table_keys: Dict[str, set] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(query: str, params: Optional[tuple], fetch: str) -> str:
+        """Key on whitespace-normalized SQL, parameters and fetch mode"""
+        normalized = ' '.join(query.split())
+        return f"{fetch}:{normalized}:{json.dumps(params, default=str, sort_keys=True)}"
+    
+    def get(self, key: str) -> tuple:
+        """Return (found, result); results are unpickled so callers never share cached objects"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[0]
+        return True, pickle.loads(payload)
+    
+    def snapshot(self, tables: set) -> tuple:
+        """Capture table generations before a read so a concurrent write can veto storing it"""
+        with self._lock:
+            return self._epoch, tuple(self._generations.get(t, 0) for t in sorted(tables))
+    
+    def put(self, key: str, result: Any, tables: set, snapshot: tuple,
+            ttl: Optional[float] = None) -> bool:
+        """Store a result unless its tables were written since the snapshot or it exceeds max_bytes"""
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(payload)
+        if size > self.max_bytes:
+            return False
+        
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            current = (self._epoch, tuple(self._generations.get(t, 0) for t in sorted(tables)))
+            if current != snapshot:
+                return False
+            
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, expires_at, tables)
+            self.current_bytes += size
+            for table in tables:
+                self._table_keys.setdefault(table, set()).add(key)
+            
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+    
+    def _remove(self, key: str):
+        """Drop an entry and its reverse-index references (caller holds the lock)"""
+        payload, _, tables = self._entries.pop(key)
+        self.current_bytes -= len(payload)
+        for table in tables:
+            keys = self._table_keys.get(table)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._table_keys[table]
+    
+    def invalidate_tables(self, tables: set) -> int:
+        """Remove every entry that read any of the given tables"""
+        removed = 0
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._table_keys.get(table, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+    
+    def clear(self):
+        """Remove every entry, e.g. after a write whose tables could not be determined"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._epoch += 1
+            self._entries.clear()
+            self._table_keys.clear()
+            self.current_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+def _record_bulk_failure(result: Dict[str, Any], index: int, record: Any, error: Any) -> None:
+    """Append a per-record failure to a bulk_write result"""
+    result['failed'].append({'index': index, 'record': record, 'error': str(error)})
+
+
+def _finish_bulk_result(result: Dict[str, Any], total: int) -> Dict[str, Any]:
+    """Count records that were never attempted because an ordered write stopped early"""
+    result['skipped'] = total - result['succeeded'] - len(result['failed'])
+    return result
+
+
+class PreparedStatementCache:
+    """LRU cache of server-side prepared statements owned by a single connection"""
+    
+    def __init__(self, max_size: int = 100, on_evict: Optional[Callable[[Any], None]] = None):
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    def lookup(self, query: str) -> tuple:
+        """Return (found, handle) and mark the entry as recently used"""
+        with self._lock:
+            if query in self._statements:
+                self._statements.move_to_end(query)
+                return True, self._statements[query]
+            return False, None
+    
+    def put(self, query: str, handle: Any):
+        """Cache a prepared handle, evicting the least recently used one"""
+        evicted = []
+        with self._lock:
+            self._statements[query] = handle
+            self._statements.move_to_end(query)
+            while len(self._statements) > self.max_size:
+                evicted.append(self._statements.popitem(last=False)[1])
+        
+        for old_handle in evicted:
+            if old_handle is not None and self.on_evict:
+                self.on_evict(old_handle)
+    
+    def clear(self):
+        """Forget all handles (the server drops them with the session)"""
+        with self._lock:
+            self._statements.clear()
+    
+    def __len__(self) -> int:
+        return len(self._statements)
+    
+    def __contains__(self, query: str) -> bool:
+        return query in self._statements
+
+
+def _connect_with_explainer(db_class, connection_params: Dict[str, Any],
+                            explainer: Optional[SlowQueryExplainer]) -> 'DatabaseInterface':
+    """Open a connection that reports slow queries to a shared explainer instead of its own"""
+    if explainer is None:
+        db = db_class(connection_params)
+    else:
+        db = db_class({**connection_params, 'explain_slow_queries': False})
+        db.enable_slow_query_explain(explainer=explainer)
+    db.connect()
+    return db
+
+
 class ConnectionPool:
     """Thread-safe connection pool"""
     
@@ -123,6 +637,9 @@ class ConnectionPool:
         self.active_connections = 0
         self._lock = threading.Lock()
         self.logger = logger or logging.getLogger(__name__)
+        # One plan-capture worker for the whole pool so rate limiting is per fingerprint
+        self.explainer = (SlowQueryExplainer.for_database(db_class, connection_params, self.logger)
+                          if connection_params.get('explain_slow_queries') else None)
         self._initialize_pool()
     
     def _initialize_pool(self):
@@ -135,8 +652,7 @@ class ConnectionPool:
     def _create_connection(self):
         """Create a new database connection"""
         try:
-            db = self.db_class(self.connection_params)
-            db.connect()
+            db = _connect_with_explainer(self.db_class, self.connection_params, self.explainer)
             with self._lock:
                 self.active_connections += 1
             self.logger.info(f"Created new connection. Active: {self.active_connections}")
@@ -183,6 +699,8 @@ class ConnectionPool:
             except Empty:
                 break
         
+        if self.explainer:
+            self.explainer.close()
         self.logger.info("All connections closed")
     
     def get_stats(self) -> Dict[str, int]:
@@ -197,13 +715,29 @@ class ConnectionPool:
 class DatabaseInterface(ABC):
     """Abstract base class for database operations with enterprise features"""
     
+    # Prefix used to capture plans for slow queries; None when the backend has no EXPLAIN
+    explain_prefix: Optional[str] = None
+    # False for backends whose fetch operations never modify data (document, key-value, search)
+    sql_statements: bool = True
+    
     def __init__(self, connection_params: Dict[str, Any]):
         self.connection_params = connection_params
         self.connection = None
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
-        self.metrics = DatabaseMetrics()
+        self.metrics = DatabaseMetrics(
+            slow_query_threshold=connection_params.get('slow_query_threshold', 1.0)
+        )
         self._transaction_depth = 0
         self._isolation_level = None
+        self.statement_cache = PreparedStatementCache(
+            max_size=connection_params.get('statement_cache_size', 100),
+            on_evict=self._deallocate_statement
+        )
+        self.explainer: Optional[SlowQueryExplainer] = None
+        self._owns_explainer = False
+        self.last_batch_stats: List[Dict[str, Any]] = []
+        if connection_params.get('explain_slow_queries'):
+            self.enable_slow_query_explain(connection_params.get('explain_min_interval', 300.0))
     
     @abstractmethod
     def connect(self) -> None:
@@ -235,6 +769,14 @@ class DatabaseInterface(ABC):
         """Fetch all rows"""
         pass
     
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream rows one at a time, fetching from the server in batches.
+        Backends override this with server-side cursors; this fallback buffers fetch_all.
+        """
+        yield from self.fetch_all(query, params)
+    
     @abstractmethod
     def commit(self) -> None:
         """Commit current transaction"""
@@ -252,6 +794,14 @@ class DatabaseInterface(ABC):
         except:
             return False
     
+    def cancel_query(self, thread_id: Optional[int] = None) -> bool:
+        """
+        Ask the server to abort the statement running on this connection; False if unsupported.
+        Backends that spread one object over several connections (SQLite readers) abort only the
+        statement started by thread_id when it is given.
+        """
+        return False
+    
     def reconnect(self) -> bool:
         """Attempt to reconnect to the database"""
         try:
@@ -267,6 +817,50 @@ class DatabaseInterface(ABC):
         """Set transaction isolation level"""
         self._isolation_level = level
     
+    def prepare(self, query: str, param_types: tuple = ()) -> Any:
+        """
+        Prepare a statement server-side and keep it in this connection's LRU cache.
+        Statements declared with explicit parameter types are cached per type signature;
+        one prepared without types is reused by every execute/fetch call of the query.
+        Returns the native handle, or None if the backend cannot prepare the statement.
+        """
+        key = (query, param_types) if param_types else query
+        found, handle = self.statement_cache.lookup(key)
+        self.metrics.record_statement_cache(found)
+        if not found:
+            handle = self._prepare_statement(query, param_types)
+            self.statement_cache.put(key, handle)
+        return handle
+    
+    def _prepare_statement(self, query: str, param_types: tuple = ()) -> Any:
+        """Create a native prepared statement (backends override)"""
+        return None
+    
+    def _statement_param_types(self, params: tuple) -> Optional[tuple]:
+        """Parameter types to declare when preparing, or None if the call must not be prepared"""
+        return ()
+    
+    def _deallocate_statement(self, handle: Any) -> None:
+        """Release a prepared statement evicted from the cache"""
+        pass
+    
+    def _cached_statement(self, query: str, params: Optional[tuple]) -> Any:
+        """Return a cached prepared handle for parameterized DML/SELECT, else None"""
+        if not self.statement_cache.enabled or not isinstance(params, (tuple, list)) or not params:
+            return None
+        if not _is_preparable(query):
+            return None
+        param_types = self._statement_param_types(params)
+        if param_types is None:
+            return None
+        if param_types:
+            # A handle from an explicit prepare(query) without declared types serves every call
+            found, handle = self.statement_cache.lookup(query)
+            if found and handle is not None:
+                self.metrics.record_statement_cache(True)
+                return handle
+        return self.prepare(query, param_types)
+    
     @contextmanager
     def transaction(self, isolation_level: Optional[IsolationLevel] = None):
         """Context manager for transactions with nested support"""
@@ -298,23 +892,122 @@ class DatabaseInterface(ABC):
             except Exception as e:
                 self.logger.warning(f"Query failed (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
+                    # Full jitter keeps clients from retrying in lockstep against a struggling server
+                    time.sleep(random.uniform(0, retry_delay * (attempt + 1)))
                     if not self.is_connected():
                         self.reconnect()
                 else:
                     raise
     
-    def batch_execute(self, queries: List[tuple], batch_size: int = 1000) -> int:
-        """Execute multiple queries in batches"""
+    def batch_execute(self, queries: List[tuple], batch_size: int = 1000,
+                      on_batch: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
+        """
+        Execute multiple queries in batches, one transaction per batch.
+        Consecutive runs of the same statement are sent through the backend's batch primitive.
+        """
         total_affected = 0
-        for i in range(0, len(queries), batch_size):
+        self.last_batch_stats = []
+        for batch_number, i in enumerate(range(0, len(queries), batch_size), 1):
             batch = queries[i:i + batch_size]
+            groups = _group_statements(batch)
+            start_time = time.time()
             with self.transaction():
-                for query, params in batch:
-                    affected = self.execute(query, params)
+                for query, params_list in groups:
+                    if len(params_list) == 1:
+                        affected = self.execute(query, params_list[0])
+                    else:
+                        affected = self._execute_batch(query, params_list)
                     total_affected += affected if affected else 0
+            
+            stats = {
+                'batch': batch_number,
+                'statements': len(batch),
+                'round_trips': len(groups),
+                'execution_time': time.time() - start_time
+            }
+            self.last_batch_stats.append(stats)
+            if on_batch:
+                on_batch(stats)
+        return total_affected
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """Run one statement for many parameter sets; backends override with their batch primitive"""
+        total_affected = 0
+        for params in params_list:
+            affected = self.execute(query, params)
+            total_affected += affected if affected else 0
         return total_affected
     
+    def bulk_write(self, target: str, records: List[Any], batch_size: int = 1000,
+                   ordered: bool = False) -> Dict[str, Any]:
+        """
+        Write many records, reporting per-record failures instead of aborting.
+        For SQL backends target is the statement and records are its parameter tuples; a failing
+        batch is rolled back and retried record by record. With ordered=True nothing is sent
+        after the first failure.
+        """
+        result = {'succeeded': 0, 'failed': [], 'skipped': 0}
+        for start in range(0, len(records), batch_size):
+            chunk = records[start:start + batch_size]
+            try:
+                with self.transaction():
+                    self._execute_batch(target, chunk)
+                result['succeeded'] += len(chunk)
+                continue
+            except Exception as e:
+                self.logger.warning(f"Batch at record {start} failed, retrying per record: {e}")
+            
+            for offset, params in enumerate(chunk):
+                try:
+                    with self.transaction():
+                        self.execute(target, params)
+                    result['succeeded'] += 1
+                except Exception as e:
+                    _record_bulk_failure(result, start + offset, params, e)
+                    if ordered:
+                        break
+            if ordered and result['failed']:
+                break
+        
+        return _finish_bulk_result(result, len(records))
+    
+    def enable_slow_query_explain(self, min_interval: float = 300.0,
+                                  explainer: Optional[SlowQueryExplainer] = None) -> bool:
+        """
+        Automatically capture EXPLAIN plans for slow queries on a background connection.
+        Each query fingerprint is explained at most once per min_interval seconds.
+        Pass a shared explainer (one per pool or manager) to rate-limit across connections;
+        otherwise this connection owns one and stops it on disconnect().
+        """
+        if not self.explain_prefix:
+            self.logger.warning(f"{self.__class__.__name__} does not support EXPLAIN capture")
+            return False
+        
+        self.disable_slow_query_explain()
+        self._owns_explainer = explainer is None
+        if explainer is None:
+            explainer = SlowQueryExplainer.for_database(
+                self.__class__, {**self.connection_params, 'explain_min_interval': min_interval},
+                logger=self.logger
+            )
+        self.explainer = explainer
+        explainer.attach(self.metrics)
+        return True
+    
+    def disable_slow_query_explain(self):
+        """Stop capturing plans; an owned explainer's thread and connection are closed"""
+        if self.explainer:
+            self.explainer.detach(self.metrics)
+            if self._owns_explainer:
+                self.explainer.close()
+            self.explainer = None
+            self._owns_explainer = False
+    
+    def _stop_explainer(self):
+        """Release an owned explainer's background thread and connection on disconnect"""
+        if self.explainer and self._owns_explainer:
+            self.explainer.close()
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get performance metrics"""
         return self.metrics.get_stats()
@@ -327,6 +1020,9 @@ class DatabaseInterface(ABC):
 class PostgreSQLDatabase(DatabaseInterface):
     """PostgreSQL database implementation with enterprise features"""
     
+    _statement_ids = itertools.count(1)
+    explain_prefix = "EXPLAIN (FORMAT JSON)"
+    
     def connect(self) -> None:
         import psycopg2
         from psycopg2.extras import RealDictCursor
@@ -349,31 +1045,144 @@ class PostgreSQLDatabase(DatabaseInterface):
     def disconnect(self) -> None:
         if self.connection:
             self.connection.close()
+            self.statement_cache.clear()
             self.metrics.active_connections -= 1
             self.logger.info("PostgreSQL connection closed")
+        self._stop_explainer()
+    
+    def _statement_param_types(self, params: tuple) -> Optional[tuple]:
+        """
+        Declare each parameter with the type psycopg2 would give its literal, so a
+        prepared call resolves types exactly like the unprepared one. Strings and NULLs
+        stay 'unknown' (inferred from context, as untyped literals are); values without
+        a fixed mapping are executed unprepared.
+        """
+        types = []
+        for value in params:
+            if value is None or isinstance(value, str):
+                types.append('unknown')
+            elif isinstance(value, bool):
+                types.append('boolean')
+            elif isinstance(value, int):
+                types.append('bigint' if -2**63 <= value < 2**63 else 'numeric')
+            elif isinstance(value, float):
+                types.append('numeric' if math.isfinite(value) else 'double precision')
+            elif isinstance(value, Decimal):
+                types.append('numeric')
+            elif isinstance(value, datetime):
+                types.append('timestamptz' if value.tzinfo is not None else 'timestamp')
+            elif isinstance(value, date):
+                types.append('date')
+            elif isinstance(value, dt_time):
+                types.append('timetz' if value.tzinfo is not None else 'time')
+            elif isinstance(value, timedelta):
+                types.append('interval')
+            elif isinstance(value, (bytes, bytearray, memoryview)):
+                types.append('bytea')
+            else:
+                return None
+        return tuple(types)
+    
+    def _prepare_statement(self, query: str, param_types: tuple = ()) -> Optional[str]:
+        """PREPARE the statement inside a savepoint so a failure never aborts the transaction"""
+        name = f"nexus_stmt_{next(self._statement_ids)}"
+        declared = f" ({', '.join(param_types)})" if param_types else ""
+        with self.connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    f"SAVEPOINT nexus_prepare; "
+                    f"PREPARE {name}{declared} AS {_to_numeric_placeholders(query)}; "
+                    f"RELEASE SAVEPOINT nexus_prepare"
+                )
+            except Exception as e:
+                self.logger.debug(f"Statement not preparable, using plain execution: {e}")
+                cursor.execute("ROLLBACK TO SAVEPOINT nexus_prepare; RELEASE SAVEPOINT nexus_prepare")
+                return None
+        return name
+    
+    def cancel_query(self, thread_id: Optional[int] = None) -> bool:
+        self.connection.cancel()
+        return True
+    
+    def _deallocate_statement(self, handle: str) -> None:
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"DEALLOCATE {handle}")
+        except Exception as e:
+            self.logger.warning(f"Failed to deallocate {handle}: {e}")
+    
+    def _run(self, cursor, query: str, params: Optional[tuple]):
+        """Execute via a cached prepared statement when possible"""
+        name = self._cached_statement(query, params)
+        if name:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(query, params)
     
     @measure_time
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
         with self.connection.cursor() as cursor:
-            cursor.execute(query, params)
+            self._run(cursor, query, params)
             return cursor.rowcount
     
+    @measure_time
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """Multi-row VALUES via execute_values for INSERTs, one prepared statement per row otherwise"""
+        from psycopg2.extras import execute_values
+        
         with self.connection.cursor() as cursor:
-            cursor.executemany(query, params_list)
+            parts = _split_insert_values(query)
+            if parts is None:
+                # Run statements one by one so rowcount is the rows each one touched
+                affected = 0
+                for params in params_list:
+                    self._run(cursor, query, params)
+                    affected += max(cursor.rowcount, 0)
+                return affected
+            
+            head, row, tail = parts
+            affected = 0
+            for i in range(0, len(params_list), _MAX_ROWS_PER_STATEMENT):
+                chunk = params_list[i:i + _MAX_ROWS_PER_STATEMENT]
+                execute_values(cursor, f"{head}%s{tail}", chunk, template=row, page_size=len(chunk))
+                affected += cursor.rowcount
+            return affected
     
     @measure_time
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
         with self.connection.cursor() as cursor:
-            cursor.execute(query, params)
+            self._run(cursor, query, params)
             return cursor.fetchone()
     
     @measure_time
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
         with self.connection.cursor() as cursor:
-            cursor.execute(query, params)
+            self._run(cursor, query, params)
             return cursor.fetchall()
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream rows through a named server-side cursor"""
+        from psycopg2.extras import RealDictCursor
+        cursor = self.connection.cursor(
+            name=f"nexus_iter_{next(self._statement_ids)}",
+            cursor_factory=RealDictCursor
+        )
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
     def commit(self) -> None:
         self.connection.commit()
     
@@ -407,6 +1216,8 @@ class PostgreSQLDatabase(DatabaseInterface):
 class MySQLDatabase(DatabaseInterface):
     """MySQL database implementation with enterprise features"""
     
+    explain_prefix = "EXPLAIN FORMAT=JSON"
+    
     def connect(self) -> None:
         import mysql.connector
         self.connection = mysql.connector.connect(
@@ -427,24 +1238,66 @@ class MySQLDatabase(DatabaseInterface):
     def disconnect(self) -> None:
         if self.connection:
             self.connection.close()
+            self.statement_cache.clear()
             self.metrics.active_connections -= 1
             self.logger.info("MySQL connection closed")
+        self._stop_explainer()
+    
+    def _prepare_statement(self, query: str, param_types: tuple = ()) -> Any:
+        """Server-side prepared cursor; re-executing the same SQL skips the prepare"""
+        return self.connection.cursor(prepared=True)
+    
+    def _deallocate_statement(self, handle: Any) -> None:
+        try:
+            handle.close()
+        except Exception as e:
+            self.logger.warning(f"Failed to close prepared statement: {e}")
     
     @measure_time
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        prepared = self._cached_statement(query, params)
+        if prepared is not None:
+            prepared.execute(query, params)
+            return prepared.rowcount
+        
         cursor = self.connection.cursor()
         cursor.execute(query, params)
         rowcount = cursor.rowcount
         cursor.close()
         return rowcount
     
+    @measure_time
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """Rewrite INSERT ... VALUES into multi-row statements; executemany for everything else"""
         cursor = self.connection.cursor()
-        cursor.executemany(query, params_list)
-        cursor.close()
+        try:
+            parts = _split_insert_values(query)
+            if parts is None:
+                cursor.executemany(query, params_list)
+                return cursor.rowcount
+            
+            head, row, tail = parts
+            affected = 0
+            for i in range(0, len(params_list), _MAX_ROWS_PER_STATEMENT):
+                chunk = params_list[i:i + _MAX_ROWS_PER_STATEMENT]
+                values = tuple(value for params in chunk for value in params)
+                cursor.execute(f"{head}{', '.join([row] * len(chunk))}{tail}", values)
+                affected += cursor.rowcount
+            return affected
+        finally:
+            cursor.close()
     
     @measure_time
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        prepared = self._cached_statement(query, params)
+        if prepared is not None:
+            prepared.execute(query, params)
+            rows = prepared.fetchall()  # drain so the statement can be re-executed
+            return dict(zip(prepared.column_names, rows[0])) if rows else None
+        
         cursor = self.connection.cursor(dictionary=True)
         cursor.execute(query, params)
         result = cursor.fetchone()
@@ -453,12 +1306,35 @@ class MySQLDatabase(DatabaseInterface):
     
     @measure_time
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        prepared = self._cached_statement(query, params)
+        if prepared is not None:
+            prepared.execute(query, params)
+            return [dict(zip(prepared.column_names, row)) for row in prepared.fetchall()]
+        
         cursor = self.connection.cursor(dictionary=True)
         cursor.execute(query, params)
         results = cursor.fetchall()
         cursor.close()
         return results
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream rows through an unbuffered cursor (rows stay on the server until fetched)"""
+        cursor = self.connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # Unread rows must be consumed before the connection can be reused
+            if cursor.with_rows:
+                cursor.fetchall()
+            cursor.close()
+    
     def commit(self) -> None:
         self.connection.commit()
     
@@ -475,67 +1351,235 @@ class MySQLDatabase(DatabaseInterface):
 
 
 class SQLiteDatabase(DatabaseInterface):
-    """SQLite database implementation with enterprise features"""
+    """
+    SQLite database implementation with enterprise features.
+    One writer connection serializes writes; an optional pool of read-only connections
+    (read_pool_size) serves concurrent readers under WAL.
+    """
+    
+    explain_prefix = "EXPLAIN QUERY PLAN"
+    
+    _JOURNAL_MODES = ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF')
+    _SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+    _TEMP_STORES = ('DEFAULT', 'FILE', 'MEMORY')
+    
+    def __init__(self, connection_params: Dict[str, Any]):
+        super().__init__(connection_params)
+        self._readers: Optional[Queue] = None
+        self._write_lock = threading.RLock()
+        # Thread whose uncommitted changes the writer currently holds; only it reads from the writer
+        self._writer_owner: Optional[int] = None
+        # Thread ident -> connection running that thread's statement, for cancel_query
+        self._running: Dict[int, Any] = {}
+        self._running_lock = threading.Lock()
+    
+    def _pragma_choice(self, name: str, default: str, allowed: tuple) -> str:
+        """Validate a PRAGMA keyword value from the connection params"""
+        value = str(self.connection_params.get(name, default)).upper()
+        if value not in allowed:
+            raise ValueError(f"Invalid SQLite {name}: {value}")
+        return value
+    
+    def _apply_profile(self, connection, read_only: bool = False):
+        """Apply the performance PRAGMAs shared by writer and reader connections"""
+        busy_timeout = int(self.connection_params.get('busy_timeout',
+                                                       self.connection_params.get('timeout', 10) * 1000))
+        connection.execute(f"PRAGMA busy_timeout={busy_timeout}")
+        # Negative cache_size is KiB, positive is pages (SQLite semantics)
+        connection.execute(f"PRAGMA cache_size={int(self.connection_params.get('cache_size', -64000))}")
+        connection.execute(f"PRAGMA mmap_size={int(self.connection_params.get('mmap_size', 268435456))}")
+        connection.execute(f"PRAGMA temp_store={self._pragma_choice('temp_store', 'MEMORY', self._TEMP_STORES)}")
+        if read_only:
+            connection.execute("PRAGMA query_only=ON")
+        else:
+            connection.execute(f"PRAGMA journal_mode={self._pragma_choice('journal_mode', 'WAL', self._JOURNAL_MODES)}")
+            connection.execute(f"PRAGMA synchronous={self._pragma_choice('synchronous', 'NORMAL', self._SYNCHRONOUS)}")
     
     def connect(self) -> None:
         import sqlite3
         self.connection = sqlite3.connect(
             self.connection_params['database'],
             timeout=self.connection_params.get('timeout', 10),
-            check_same_thread=False
+            check_same_thread=False,
+            # BEGIN IMMEDIATE takes the write lock up front so busy_timeout applies instead of
+            # failing with SQLITE_BUSY when a deferred transaction tries to upgrade
+            isolation_level=self.connection_params.get('isolation_level', 'IMMEDIATE')
         )
         self.connection.row_factory = sqlite3.Row
-        self.connection.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
-        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._apply_profile(self.connection)
+        
+        read_pool_size = self.connection_params.get('read_pool_size', 0)
+        if read_pool_size and self.connection_params['database'] != ':memory:':
+            self._readers = Queue()
+            for _ in range(read_pool_size):
+                self._readers.put(self._connect_reader())
+        
         self.metrics.connection_count += 1
         self.metrics.active_connections += 1
         self.logger.info("SQLite connection established")
     
+    def _connect_reader(self):
+        """Open a read-only connection to the same database file"""
+        import sqlite3
+        from pathlib import Path
+        reader = sqlite3.connect(
+            f"{Path(self.connection_params['database']).resolve().as_uri()}?mode=ro",
+            uri=True,
+            timeout=self.connection_params.get('timeout', 10),
+            check_same_thread=False
+        )
+        reader.row_factory = sqlite3.Row
+        self._apply_profile(reader, read_only=True)
+        return reader
+    
     def disconnect(self) -> None:
+        if self._readers is not None:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except Empty:
+                    break
+            self._readers = None
         if self.connection:
             self.connection.close()
             self.metrics.active_connections -= 1
             self.logger.info("SQLite connection closed")
+        self._stop_explainer()
     
-    @measure_time
-    def execute(self, query: str, params: Optional[tuple] = None) -> Any:
-        cursor = self.connection.cursor()
-        cursor.execute(query, params or ())
-        rowcount = cursor.rowcount
-        cursor.close()
-        return rowcount
+    def cancel_query(self, thread_id: Optional[int] = None) -> bool:
+        with self._running_lock:
+            # Interrupt under the lock so the connection cannot be handed to another statement first
+            for ident, connection in self._running.items():
+                if thread_id is None or ident == thread_id:
+                    connection.interrupt()
+        return True
     
-    def execute_many(self, query: str, params_list: List[tuple]) -> None:
-        cursor = self.connection.cursor()
-        cursor.executemany(query, params_list)
-        cursor.close()
+    @contextmanager
+    def _running_on(self, connection):
+        """Register the connection running this thread's statement so cancel_query can find it"""
+        ident = threading.get_ident()
+        with self._running_lock:
+            previous = self._running.get(ident)
+            self._running[ident] = connection
+        try:
+            yield connection
+        finally:
+            with self._running_lock:
+                if previous is None:
+                    self._running.pop(ident, None)
+                else:
+                    self._running[ident] = previous
     
-    @measure_time
-    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
-        cursor = self.connection.cursor()
-        cursor.execute(query, params or ())
-        row = cursor.fetchone()
-        cursor.close()
-        return dict(row) if row else None
+    def _claim_writer(self):
+        """Record which thread left the writer inside a transaction (caller holds _write_lock)"""
+        self._writer_owner = threading.get_ident() if self.connection.in_transaction else None
+    
+    @contextmanager
+    def _read_connection(self, query: str):
+        """
+        Use a pooled reader for plain reads unless this thread has uncommitted changes to see.
+        Other threads keep reading committed data from the readers while a transaction is open.
+        """
+        if (self._readers is None or self._writer_owner == threading.get_ident()
+                or not is_read_only_query(query)):
+            with self._running_on(self.connection):
+                yield self.connection
+            return
+        
+        reader = self._readers.get()
+        try:
+            with self._running_on(reader):
+                yield reader
+        finally:
+            self._readers.put(reader)
+    
+    @contextmanager
+    def transaction(self, isolation_level: Optional[IsolationLevel] = None):
+        """Hold the writer for the whole transaction so concurrent writers queue behind it"""
+        with self._write_lock:
+            self._writer_owner = threading.get_ident()
+            try:
+                with super().transaction(isolation_level) as db:
+                    yield db
+            finally:
+                self._claim_writer()
+    
+    @measure_time
+    def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        with self._write_lock, self._running_on(self.connection):
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query, params or ())
+                return cursor.rowcount
+            finally:
+                cursor.close()
+                self._claim_writer()
+    
+    @measure_time
+    def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        with self._write_lock, self._running_on(self.connection):
+            cursor = self.connection.cursor()
+            try:
+                cursor.executemany(query, params_list)
+                return cursor.rowcount
+            finally:
+                cursor.close()
+                self._claim_writer()
+    
+    @measure_time
+    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        with self._read_connection(query) as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, params or ())
+            row = cursor.fetchone()
+            cursor.close()
+            return dict(row) if row else None
     
     @measure_time
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
-        cursor = self.connection.cursor()
-        cursor.execute(query, params or ())
-        rows = cursor.fetchall()
-        cursor.close()
-        return [dict(row) for row in rows]
+        with self._read_connection(query) as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, params or ())
+            rows = cursor.fetchall()
+            cursor.close()
+            return [dict(row) for row in rows]
+    
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        with self._read_connection(query) as connection:
+            cursor = connection.cursor()
+            cursor.arraysize = batch_size
+            try:
+                cursor.execute(query, params or ())
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
     
     def commit(self) -> None:
-        self.connection.commit()
+        with self._write_lock:
+            self.connection.commit()
+            self._writer_owner = None
     
     def rollback(self) -> None:
-        self.connection.rollback()
+        with self._write_lock:
+            self.connection.rollback()
+            self._writer_owner = None
 
 
 class MongoDBDatabase(DatabaseInterface):
     """MongoDB database implementation with enterprise features"""
     
+    sql_statements = False
+    
     def connect(self) -> None:
         from pymongo import MongoClient
         from pymongo.errors import ConnectionFailure
@@ -581,6 +1625,16 @@ class MongoDBDatabase(DatabaseInterface):
         collection = self.connection[query]
         return list(collection.find(params or {}))
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream documents using the driver's cursor batching"""
+        cursor = self.connection[query].find(params or {}, batch_size=batch_size)
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+    
     @measure_time
     def insert_one(self, collection_name: str, document: Dict) -> str:
         """Insert a single document"""
@@ -595,6 +1649,36 @@ class MongoDBDatabase(DatabaseInterface):
         result = collection.insert_many(documents)
         return [str(id) for id in result.inserted_ids]
     
+    def bulk_write(self, target: str, records: List[Any], batch_size: int = 1000,
+                   ordered: bool = False) -> Dict[str, Any]:
+        """
+        Bulk write into a collection. Records are documents to insert or pymongo write
+        operations (UpdateOne, DeleteOne, ...); unordered batches keep going past bad records.
+        """
+        from pymongo import InsertOne
+        from pymongo.errors import BulkWriteError
+        
+        collection = self.connection[target]
+        result = {'succeeded': 0, 'failed': [], 'skipped': 0}
+        for start in range(0, len(records), batch_size):
+            chunk = records[start:start + batch_size]
+            operations = [InsertOne(r) if isinstance(r, dict) else r for r in chunk]
+            try:
+                collection.bulk_write(operations, ordered=ordered)
+                result['succeeded'] += len(chunk)
+            except BulkWriteError as e:
+                write_errors = e.details.get('writeErrors', [])
+                for error in write_errors:
+                    index = start + error['index']
+                    _record_bulk_failure(result, index, records[index], error.get('errmsg'))
+                if ordered:
+                    # The server stops at the first error; everything before it was written
+                    result['succeeded'] += write_errors[0]['index'] if write_errors else 0
+                    break
+                result['succeeded'] += len(chunk) - len(write_errors)
+        
+        return _finish_bulk_result(result, len(records))
+    
     @measure_time
     def update_one(self, collection_name: str, filter_dict: Dict, update_dict: Dict) -> int:
         """Update a single document"""
@@ -637,6 +1721,8 @@ class OracleDatabase(DatabaseInterface):
             password=self.connection_params['password'],
             dsn=dsn
         )
+        # Client-side statement cache complements the per-connection prepared cursors
+        self.connection.stmtcachesize = max(self.statement_cache.max_size, 20)
         self.metrics.connection_count += 1
         self.metrics.active_connections += 1
         self.logger.info("Oracle connection established")
@@ -644,23 +1730,58 @@ class OracleDatabase(DatabaseInterface):
     def disconnect(self) -> None:
         if self.connection:
             self.connection.close()
+            self.statement_cache.clear()
             self.metrics.active_connections -= 1
     
+    def cancel_query(self, thread_id: Optional[int] = None) -> bool:
+        self.connection.cancel()
+        return True
+    
+    def _prepare_statement(self, query: str, param_types: tuple = ()) -> Any:
+        cursor = self.connection.cursor()
+        cursor.prepare(query)
+        return cursor
+    
+    def _deallocate_statement(self, handle: Any) -> None:
+        try:
+            handle.close()
+        except Exception as e:
+            self.logger.warning(f"Failed to close prepared cursor: {e}")
+    
     @measure_time
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
+        prepared = self._cached_statement(query, params)
+        if prepared is not None:
+            prepared.execute(None, params)
+            return prepared.rowcount
+        
         cursor = self.connection.cursor()
         cursor.execute(query, params or {})
         rowcount = cursor.rowcount
         cursor.close()
         return rowcount
     
+    @measure_time
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """Array DML: the whole parameter list goes to the server in one round trip"""
         cursor = self.connection.cursor()
         cursor.executemany(query, params_list)
+        affected = cursor.rowcount
         cursor.close()
+        return affected
     
     @measure_time
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+        prepared = self._cached_statement(query, params)
+        if prepared is not None:
+            prepared.execute(None, params)
+            columns = [col[0] for col in prepared.description]
+            row = prepared.fetchone()
+            return dict(zip(columns, row)) if row else None
+        
         cursor = self.connection.cursor()
         cursor.execute(query, params or {})
         columns = [col[0] for col in cursor.description]
@@ -670,6 +1791,12 @@ class OracleDatabase(DatabaseInterface):
     
     @measure_time
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        prepared = self._cached_statement(query, params)
+        if prepared is not None:
+            prepared.execute(None, params)
+            columns = [col[0] for col in prepared.description]
+            return [dict(zip(columns, row)) for row in prepared.fetchall()]
+        
         cursor = self.connection.cursor()
         cursor.execute(query, params or {})
         columns = [col[0] for col in cursor.description]
@@ -677,6 +1804,25 @@ class OracleDatabase(DatabaseInterface):
         cursor.close()
         return [dict(zip(columns, row)) for row in rows]
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream rows with arraysize/prefetch tuned to the batch size"""
+        cursor = self.connection.cursor()
+        cursor.arraysize = batch_size
+        cursor.prefetchrows = batch_size + 1
+        try:
+            cursor.execute(query, params or {})
+            columns = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            cursor.close()
+    
     def commit(self) -> None:
         self.connection.commit()
     
@@ -714,10 +1860,18 @@ class SQLServerDatabase(DatabaseInterface):
         cursor.close()
         return rowcount
     
+    @measure_time
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """Bind the parameter array client-side with fast_executemany"""
         cursor = self.connection.cursor()
+        cursor.fast_executemany = True
         cursor.executemany(query, params_list)
+        affected = cursor.rowcount
         cursor.close()
+        return affected if affected >= 0 else len(params_list)
     
     @measure_time
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
@@ -737,6 +1891,23 @@ class SQLServerDatabase(DatabaseInterface):
         cursor.close()
         return [dict(zip(columns, row)) for row in rows]
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        cursor = self.connection.cursor()
+        cursor.arraysize = batch_size
+        try:
+            cursor.execute(query, params or ())
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            cursor.close()
+    
     def commit(self) -> None:
         self.connection.commit()
     
@@ -747,6 +1918,8 @@ class SQLServerDatabase(DatabaseInterface):
 class RedisDatabase(DatabaseInterface):
     """Redis database implementation with enterprise features"""
     
+    sql_statements = False
+    
     def connect(self) -> None:
         import redis
         self.connection = redis.Redis(
@@ -772,11 +1945,49 @@ class RedisDatabase(DatabaseInterface):
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
         return self.connection.execute_command(query, *params if params else [])
     
+    @measure_time
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """Pipeline the commands; Redis has no row count, so this returns commands sent"""
         pipeline = self.connection.pipeline()
         for params in params_list:
             pipeline.execute_command(query, *params)
         pipeline.execute()
+        return len(params_list)
+    
+    def bulk_write(self, target: str, records: List[tuple], batch_size: int = 1000,
+                   ordered: bool = False) -> Dict[str, Any]:
+        """
+        Run a command (e.g. 'SET', 'HSET') once per argument tuple in non-transactional pipelines.
+        Errors come back per reply, so one bad record never fails its batch. A pipeline runs every
+        queued command, so ordered writes are sent one at a time and stop at the first error.
+        """
+        result = {'succeeded': 0, 'failed': [], 'skipped': 0}
+        if ordered:
+            for index, args in enumerate(records):
+                try:
+                    self.connection.execute_command(target, *args)
+                    result['succeeded'] += 1
+                except Exception as e:
+                    _record_bulk_failure(result, index, args, e)
+                    break
+            return _finish_bulk_result(result, len(records))
+        
+        for start in range(0, len(records), batch_size):
+            chunk = records[start:start + batch_size]
+            pipeline = self.connection.pipeline(transaction=False)
+            for args in chunk:
+                pipeline.execute_command(target, *args)
+            replies = pipeline.execute(raise_on_error=False)
+            for offset, reply in enumerate(replies):
+                if isinstance(reply, Exception):
+                    _record_bulk_failure(result, start + offset, chunk[offset], reply)
+                else:
+                    result['succeeded'] += 1
+        
+        return _finish_bulk_result(result, len(records))
     
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
         value = self.connection.get(query)
@@ -786,6 +1997,24 @@ class RedisDatabase(DatabaseInterface):
         keys = self.connection.keys(query)
         return [{'key': k, 'value': self.connection.get(k)} for k in keys]
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream matching keys with SCAN instead of KEYS, one MGET per batch"""
+        batch = []
+        for key in self.connection.scan_iter(match=query, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield from self._mget_batch(batch)
+                batch = []
+        if batch:
+            yield from self._mget_batch(batch)
+    
+    def _mget_batch(self, keys: List[str]) -> Iterator[Dict]:
+        for key, value in zip(keys, self.connection.mget(keys)):
+            if value is not None:
+                yield {'key': key, 'value': value}
+    
     @measure_time
     def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
         return self.connection.set(key, value, ex=ex)
@@ -832,30 +2061,108 @@ class CassandraDatabase(DatabaseInterface):
     def disconnect(self) -> None:
         if self.connection:
             self.connection.shutdown()
+            self.statement_cache.clear()
         if self.cluster:
             self.cluster.shutdown()
             self.metrics.active_connections -= 1
     
+    def _prepare_statement(self, query: str, param_types: tuple = ()) -> Any:
+        # Prepared statements use '?' markers instead of the simple-statement '%s'
+        return self.connection.prepare(query.replace('%s', '?'))
+    
+    def _statement(self, query: str, params: Optional[tuple]) -> Any:
+        prepared = self._cached_statement(query, params)
+        return prepared if prepared is not None else query
+    
     @measure_time
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
-        return self.connection.execute(query, params)
+        return self.connection.execute(self._statement(query, params), params)
     
+    @measure_time
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
-        prepared = self.connection.prepare(query)
-        for params in params_list:
-            self.connection.execute(prepared, params)
+        self._execute_batch(query, params_list)
+    
+    def _execute_batch(self, query: str, params_list: List[tuple]) -> int:
+        """
+        Pipeline the bound statements over the session instead of waiting on each.
+        CQL reports no row counts, so this returns statements sent.
+        """
+        from cassandra.concurrent import execute_concurrent_with_args
+        prepared = self.prepare(query)
+        execute_concurrent_with_args(
+            self.connection, prepared, params_list,
+            concurrency=self.connection_params.get('concurrency', 100)
+        )
+        return len(params_list)
+    
+    def bulk_write(self, target: str, records: List[tuple], batch_size: int = 1000,
+                   ordered: bool = False) -> Dict[str, Any]:
+        """
+        Run a prepared statement for every record with execute_concurrent, collecting failures.
+        Ordered writes are executed one at a time and stop at the first failing record.
+        """
+        from cassandra.concurrent import execute_concurrent_with_args
+        
+        prepared = self.prepare(target)
+        result = {'succeeded': 0, 'failed': [], 'skipped': 0}
+        if ordered:
+            for index, params in enumerate(records):
+                try:
+                    self.connection.execute(prepared, params)
+                    result['succeeded'] += 1
+                except Exception as e:
+                    _record_bulk_failure(result, index, params, e)
+                    break
+            return _finish_bulk_result(result, len(records))
+        
+        for start in range(0, len(records), batch_size):
+            chunk = records[start:start + batch_size]
+            outcomes = execute_concurrent_with_args(
+                self.connection, prepared, chunk,
+                concurrency=self.connection_params.get('concurrency', 100),
+                raise_on_first_error=False
+            )
+            for offset, (success, outcome) in enumerate(outcomes):
+                if success:
+                    result['succeeded'] += 1
+                else:
+                    _record_bulk_failure(result, start + offset, chunk[offset], outcome)
+        
+        return _finish_bulk_result(result, len(records))
     
     @measure_time
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
-        result = self.connection.execute(query, params)
+        result = self.connection.execute(self._statement(query, params), params)
         row = result.one()
         return dict(row._asdict()) if row else None
     
     @measure_time
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
-        result = self.connection.execute(query, params)
+        result = self.connection.execute(self._statement(query, params), params)
         return [dict(row._asdict()) for row in result]
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream pages explicitly via the driver's paging state"""
+        from cassandra.query import SimpleStatement
+        statement = self._statement(query, params)
+        if isinstance(statement, str):
+            statement = SimpleStatement(statement, fetch_size=batch_size)
+        else:
+            statement = statement.bind(params)
+            statement.fetch_size = batch_size
+            params = None
+        
+        paging_state = None
+        while True:
+            result = self.connection.execute(statement, params, paging_state=paging_state)
+            for row in result.current_rows:
+                yield dict(row._asdict())
+            paging_state = result.paging_state
+            if not paging_state:
+                break
+    
     def commit(self) -> None:
         pass
     
@@ -866,6 +2173,8 @@ class CassandraDatabase(DatabaseInterface):
 class ElasticsearchDatabase(DatabaseInterface):
     """Elasticsearch database implementation with enterprise features"""
     
+    sql_statements = False
+    
     def connect(self) -> None:
         from elasticsearch import Elasticsearch
         self.connection = Elasticsearch(
@@ -906,6 +2215,37 @@ class ElasticsearchDatabase(DatabaseInterface):
         result = self.connection.search(index=query, body=params or {"query": {"match_all": {}}})
         return [hit['_source'] for hit in result['hits']['hits']]
     
+    @measure_iter
+    def fetch_iter(self, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream every matching document with a point-in-time and search_after"""
+        body = dict(params or {"query": {"match_all": {}}})
+        pit = self.connection.open_point_in_time(index=query, keep_alive='1m')
+        pit_id = pit['id']
+        search_after = None
+        try:
+            while True:
+                page_body = {
+                    **body,
+                    'size': batch_size,
+                    'pit': {'id': pit_id, 'keep_alive': '1m'},
+                    'sort': body.get('sort', [{'_shard_doc': 'asc'}])
+                }
+                if search_after is not None:
+                    page_body['search_after'] = search_after
+                result = self.connection.search(body=page_body)
+                hits = result['hits']['hits']
+                if not hits:
+                    break
+                for hit in hits:
+                    yield hit['_source']
+                pit_id = result.get('pit_id', pit_id)
+                search_after = hits[-1]['sort']
+                if len(hits) < batch_size:
+                    break
+        finally:
+            self.connection.close_point_in_time(body={'id': pit_id})
+    
     @measure_time
     def index(self, index_name: str, document: Dict, doc_id: Optional[str] = None) -> Dict:
         """Index a document"""
@@ -927,6 +2267,55 @@ class ElasticsearchDatabase(DatabaseInterface):
         """Delete a document"""
         return self.connection.delete(index=index_name, id=doc_id)
     
+    def bulk_write(self, target: str, records: List[Dict], batch_size: int = 1000,
+                   ordered: bool = False) -> Dict[str, Any]:
+        """
+        Bulk index documents into an index with helpers.parallel_bulk (streaming_bulk when ordered).
+        A document's '_id' key becomes the document id; records with '_op_type' or '_source' are
+        passed through as raw bulk actions. Elasticsearch applies every action of a bulk request,
+        so ordered writes send one action per request and stop at the first failure.
+        """
+        from elasticsearch import helpers
+        
+        actions = (self._bulk_action(target, record) for record in records)
+        if ordered:
+            responses = helpers.streaming_bulk(
+                self.connection, actions, chunk_size=1,
+                raise_on_error=False, raise_on_exception=False
+            )
+        else:
+            responses = helpers.parallel_bulk(
+                self.connection, actions, chunk_size=batch_size,
+                thread_count=self.connection_params.get('bulk_threads', 4),
+                raise_on_error=False, raise_on_exception=False
+            )
+        
+        result = {'succeeded': 0, 'failed': [], 'skipped': 0}
+        # Both helpers yield one response per action, in submission order
+        for index, (ok, item) in enumerate(responses):
+            if ok:
+                result['succeeded'] += 1
+            else:
+                details = next(iter(item.values()), {}) if isinstance(item, dict) else item
+                _record_bulk_failure(result, index, records[index],
+                                     details.get('error') if isinstance(details, dict) else details)
+            if ordered and result['failed']:
+                break
+        
+        return _finish_bulk_result(result, len(records))
+    
+    @staticmethod
+    def _bulk_action(index_name: str, record: Dict) -> Dict:
+        """Turn a document into a bulk index action"""
+        if '_op_type' in record or '_source' in record:
+            return {'_index': index_name, **record}
+        document = dict(record)
+        action = {'_index': index_name}
+        if '_id' in document:
+            action['_id'] = document.pop('_id')
+        action['_source'] = document
+        return action
+    
     def commit(self) -> None:
         pass
     
@@ -939,22 +2328,482 @@ class MariaDBDatabase(MySQLDatabase):
     pass
 
 
+class ConcurrencyLimitExceeded(RuntimeError):
+    """Raised when the adaptive limiter sheds a request instead of queueing it"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker is open and the database is not being called"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit driven by observed latency.
+    The limit grows by one per window of fast successes and shrinks multiplicatively when
+    latency rises above tolerance x the recent minimum (or latency_target) or a query fails.
+    """
+    
+    def __init__(self, initial_limit: int = 10, min_limit: int = 1, max_limit: int = 200,
+                 latency_target: Optional[float] = None, tolerance: float = 2.0,
+                 backoff_ratio: float = 0.9, max_wait: float = 0.0, window_size: int = 100):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=window_size)
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+    
+    def acquire(self) -> bool:
+        """Take a slot, waiting at most max_wait seconds; False means the request should be shed"""
+        deadline = time.time() + self.max_wait
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.rejected += 1
+                    return False
+                self._condition.wait(remaining)
+            self.in_flight += 1
+            return True
+    
+    def release(self, latency: Optional[float] = None, success: bool = True):
+        """Return a slot and adjust the limit; latency None releases without a sample"""
+        with self._condition:
+            self.in_flight -= 1
+            if latency is not None:
+                self._adjust(latency, success)
+            self._condition.notify()
+    
+    def _adjust(self, latency: float, success: bool):
+        """Additive increase on fast successes, multiplicative decrease on slow or failed calls"""
+        self._latencies.append(latency)
+        threshold = self.latency_target or self.tolerance * min(self._latencies)
+        
+        if success and latency <= threshold:
+            # Only grow while the limit is actually being used
+            if self.in_flight + 1 >= int(self.limit) / 2:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            return
+        
+        # Back off at most once per observed latency so one burst of slow calls is one signal
+        now = time.time()
+        if now - self._last_decrease >= latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            self._last_decrease = now
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'rejected': self.rejected,
+                'min_latency': min(self._latencies) if self._latencies else None
+            }
+
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Driver exception classes that signal an unreachable or unhealthy server
+_CONNECTION_ERROR_TYPES = {
+    'OperationalError', 'InterfaceError', 'ConnectionError', 'ConnectionFailure', 'AutoReconnect',
+    'ServerSelectionTimeoutError', 'NetworkTimeout', 'NoHostAvailable', 'OperationTimedOut',
+    'Unavailable', 'ConnectionTimeout', 'TimeoutError'
+}
+# Errors caused by the statement itself; several drivers raise these as OperationalError
+_CLIENT_ERROR_PATTERN = re.compile(
+    r"syntax|no such (table|column|function)|unknown (column|table)|does ?n[o']t exist|"
+    r"already exists|constraint|duplicate|permission denied|access denied",
+    re.IGNORECASE
+)
+_CONNECTION_ERROR_PATTERN = re.compile(
+    r"connect|timed? ?out|reset by peer|refused|broken pipe|gone away|lost|unavailable|network",
+    re.IGNORECASE
+)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether an error means the database is unreachable or failing, rather than a bad query"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    message = str(error)
+    if _CLIENT_ERROR_PATTERN.search(message):
+        return False
+    if {cls.__name__ for cls in type(error).__mro__} & _CONNECTION_ERROR_TYPES:
+        return True
+    return bool(_CONNECTION_ERROR_PATTERN.search(message))
+
+
+class CircuitBreaker:
+    """
+    Opens on a high error rate over recent calls and probes for recovery after a cool-down.
+    Only errors accepted by is_failure count against the database; client errors such as syntax
+    errors or constraint violations prove the server answered and count as successes.
+    """
+    
+    def __init__(self, failure_rate_threshold: float = 0.5, minimum_calls: int = 20,
+                 window_size: int = 100, open_timeout: float = 30.0, half_open_max_calls: int = 1,
+                 is_failure: Callable[[BaseException], bool] = is_connection_error,
+                 logger: Optional[logging.Logger] = None):
+        self.is_failure = is_failure
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CircuitState.CLOSED
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._outcomes = deque(maxlen=window_size)
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.logger = logger or logging.getLogger(__name__)
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may go to the database"""
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if time.time() - self.opened_at < self.open_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self._probes = 0
+                self.logger.info("Circuit half-open, probing database")
+            
+            if self.state == CircuitState.HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    self.rejected += 1
+                    return False
+                self._probes += 1
+            return True
+    
+    def record_success(self):
+        """Record a successful call; a successful probe closes the circuit"""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.state = CircuitState.CLOSED
+                self._outcomes.clear()
+                self.logger.info("Circuit closed after successful probe")
+            else:
+                self._outcomes.append(True)
+    
+    def record_failure(self):
+        """Record a failed call; trips the circuit when the failure rate crosses the threshold"""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.minimum_calls:
+                failure_rate = self._outcomes.count(False) / len(self._outcomes)
+                if failure_rate >= self.failure_rate_threshold:
+                    self._open()
+    
+    def record_error(self, error: BaseException):
+        """Record a call that raised, counting it as a failure only if the database is at fault"""
+        if self.is_failure(error):
+            self.record_failure()
+        else:
+            self.record_success()
+    
+    def _open(self):
+        """Trip the circuit (caller holds the lock)"""
+        self.state = CircuitState.OPEN
+        self.opened_at = time.time()
+        self.times_opened += 1
+        self._outcomes.clear()
+        self.logger.warning(f"Circuit opened for {self.open_timeout}s")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics"""
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                'state': self.state.value,
+                'failure_rate': round(self._outcomes.count(False) / calls, 4) if calls else 0,
+                'times_opened': self.times_opened,
+                'rejected': self.rejected
+            }
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge a read: once the first attempt has run longer than the rolling
+    latency percentile, if the hedge budget (a percentage of requests) allows another attempt.
+    """
+    
+    def __init__(self, percentile: float = 95.0, budget_percent: float = 5.0,
+                 min_samples: int = 20, window_size: int = 1000, min_delay: float = 0.001,
+                 max_burst: float = 10.0):
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_burst = max_burst
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies = deque(maxlen=window_size)
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+    
+    def record_latency(self, latency: float):
+        """Add a completed read latency to the rolling window"""
+        with self._lock:
+            self._latencies.append(latency)
+    
+    def hedge_delay(self) -> Optional[float]:
+        """Rolling percentile latency, or None until enough samples are collected"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+    
+    def on_request(self):
+        """Every read earns a fraction of a hedge token"""
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.max_burst, self._tokens + self.budget_percent / 100)
+    
+    def try_hedge(self) -> bool:
+        """Spend a token for a hedge; False when the budget is exhausted"""
+        with self._lock:
+            if self._tokens < 1 - 1e-9:  # tolerate float drift from fractional earnings
+                return False
+            self._tokens = max(0.0, self._tokens - 1)
+            self.hedges_sent += 1
+            return True
+    
+    def record_win(self):
+        """Count a hedge that answered before the original attempt"""
+        with self._lock:
+            self.hedges_won += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics"""
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges_sent': self.hedges_sent,
+                'hedges_won': self.hedges_won,
+                'hedge_rate': round(self.hedges_sent / self.requests, 4) if self.requests else 0,
+                'hedge_delay': delay
+            }
+
+
+class _HedgeAttempt:
+    """One in-flight copy of a hedged read"""
+    
+    def __init__(self, node: '_ReplicaNode'):
+        self.node = node
+        self.future = None
+        self.connection = None
+        self.thread_id = None
+        self.cancelled = False
+        self._lock = threading.Lock()
+    
+    def attach(self, connection) -> bool:
+        """Record the connection running this attempt (None once done); False if already cancelled"""
+        with self._lock:
+            self.connection = connection
+            self.thread_id = threading.get_ident() if connection is not None else None
+            return not self.cancelled
+    
+    def cancel(self) -> bool:
+        """Stop the attempt; True if it was still queued and will never run"""
+        with self._lock:
+            self.cancelled = True
+            if self.future is not None and self.future.cancel():
+                return True
+            # Holding the lock keeps the attempt from detaching and pooling the connection meanwhile
+            if self.connection is not None:
+                try:
+                    self.connection.cancel_query(self.thread_id)
+                except Exception:
+                    pass
+        return False
+
+
+class _ReplicaNode:
+    """Routing state for a single read replica"""
+    
+    def __init__(self, name: str, manager: 'DatabaseManager'):
+        self.name = name
+        self.manager = manager
+        self.outstanding = 0
+        self.total_requests = 0
+        self.healthy = True
+        self.last_error = None
+        self.ejected_at = None
+
+
+class ReplicaRouter:
+    """Spreads reads over healthy replicas using least-outstanding-requests balancing"""
+    
+    def __init__(self, db_type: str, replicas: List[Dict[str, Any]], use_pool: bool = True,
+                 pool_config: Optional[Dict[str, int]] = None,
+                 health_check_interval: float = 30.0, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.nodes = []
+        for index, params in enumerate(replicas):
+            params = dict(params)
+            name = params.pop('name', None) or f"replica-{index}"
+            manager = DatabaseManager(db_type, params, use_pool, pool_config)
+            self.nodes.append(_ReplicaNode(name, manager))
+        self.health_check_interval = health_check_interval
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._health_thread = None
+        
+        if health_check_interval and health_check_interval > 0:
+            self._health_thread = threading.Thread(
+                target=self._health_loop, daemon=True, name="ReplicaRouter-health"
+            )
+            self._health_thread.start()
+    
+    def choose(self, exclude: Optional[set] = None) -> Optional[_ReplicaNode]:
+        """Reserve the healthy replica with the fewest requests in flight"""
+        with self._lock:
+            healthy = [node for node in self.nodes if node.healthy and node not in (exclude or ())]
+            if not healthy:
+                return None
+            # Rotate the starting point so ties are spread instead of always hitting the first node
+            offset = self._next % len(healthy)
+            self._next += 1
+            rotated = healthy[offset:] + healthy[:offset]
+            node = min(rotated, key=lambda n: n.outstanding)
+            node.outstanding += 1
+            node.total_requests += 1
+            return node
+    
+    def release(self, node: _ReplicaNode):
+        """Release a reservation made by choose()"""
+        with self._lock:
+            node.outstanding -= 1
+    
+    @contextmanager
+    def connection(self):
+        """Yield a replica connection, or None when no replica can serve the read"""
+        node = self.choose()
+        if node is None:
+            yield None
+            return
+        
+        try:
+            with ExitStack() as stack:
+                try:
+                    conn = stack.enter_context(node.manager.get_connection())
+                except Exception as e:
+                    self.eject(node, f"connection failed: {e}")
+                    conn = None
+                yield conn
+        finally:
+            self.release(node)
+    
+    def eject(self, node: _ReplicaNode, reason: str):
+        """Stop routing reads to a replica until it passes a health check"""
+        with self._lock:
+            if not node.healthy:
+                return
+            node.healthy = False
+            node.last_error = reason
+            node.ejected_at = time.time()
+        self.logger.warning(f"Replica {node.name} ejected: {reason}")
+    
+    def check_health(self) -> Dict[str, Dict[str, Any]]:
+        """Run health_check on every replica, ejecting failures and readmitting recoveries"""
+        results = {}
+        for node in self.nodes:
+            health = node.manager.health_check()
+            if health.get('status') == 'healthy':
+                if not node.healthy:
+                    with self._lock:
+                        node.healthy = True
+                        node.last_error = None
+                        node.ejected_at = None
+                    self.logger.info(f"Replica {node.name} readmitted")
+            else:
+                self.eject(node, health.get('error', 'health check failed'))
+            results[node.name] = health
+        return results
+    
+    def _health_loop(self):
+        """Background loop that keeps replica health current"""
+        while not self._stop_event.wait(self.health_check_interval):
+            try:
+                self.check_health()
+            except Exception as e:
+                self.logger.error(f"Replica health check failed: {e}")
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get routing statistics for each replica"""
+        with self._lock:
+            return [{
+                'name': node.name,
+                'healthy': node.healthy,
+                'outstanding_requests': node.outstanding,
+                'total_requests': node.total_requests,
+                'last_error': node.last_error
+            } for node in self.nodes]
+    
+    def close(self):
+        """Stop health checks and close every replica manager"""
+        self._stop_event.set()
+        if self._health_thread:
+            self._health_thread.join(timeout=5)
+        for node in self.nodes:
+            node.manager.close()
+
+
 class DatabaseManager:
     """
     Enterprise database manager with connection pooling, monitoring, and failover support
     """
     
     def __init__(self, db_type: str, connection_params: Dict[str, Any],
-                 use_pool: bool = True, pool_config: Optional[Dict[str, int]] = None):
+                 use_pool: bool = True, pool_config: Optional[Dict[str, int]] = None,
+                 replicas: Optional[List[Dict[str, Any]]] = None,
+                 replica_health_interval: float = 30.0,
+                 cache_config: Optional[Dict[str, Any]] = None,
+                 concurrency_config: Optional[Dict[str, Any]] = None,
+                 circuit_breaker_config: Optional[Dict[str, Any]] = None,
+                 hedge_config: Optional[Dict[str, Any]] = None):
         self.db_type = db_type.lower()
         self.connection_params = connection_params
         self.use_pool = use_pool
         self.pool = None
+        self.router = None
+        self.result_cache = None
+        self.limiter = None
+        self.circuit_breaker = None
+        self.hedging = None
+        self._hedge_executor = None
+        self._local = threading.local()
         self.logger = logging.getLogger(f"DatabaseManager-{db_type}")
         
         # Get database class
         self.db_class = self._get_db_class()
         
+        # Without a pool every call opens a fresh connection, so the manager shares one explainer
+        self.explainer = None
+        if not use_pool and connection_params.get('explain_slow_queries'):
+            self.explainer = SlowQueryExplainer.for_database(self.db_class, connection_params, self.logger)
+        
         # Initialize connection pool if enabled
         if use_pool:
             pool_config = pool_config or {}
@@ -967,6 +2816,35 @@ class DatabaseManager:
                 logger=self.logger
             )
             self.logger.info(f"Connection pool initialized for {db_type}")
+        
+        # Read replicas each get their own manager and pool; the primary keeps all writes
+        if replicas:
+            self.router = ReplicaRouter(
+                self.db_type, replicas, use_pool, pool_config,
+                health_check_interval=replica_health_interval, logger=self.logger
+            )
+            self.logger.info(f"Read routing enabled across {len(replicas)} replica(s)")
+        
+        # Opt-in result cache for reads, invalidated by writes made through this manager
+        if cache_config is not None:
+            self.result_cache = QueryResultCache(
+                max_bytes=cache_config.get('max_bytes', 64 * 1024 * 1024),
+                default_ttl=cache_config.get('default_ttl', 60.0)
+            )
+        
+        # Shed load instead of queueing when the database slows down or starts failing
+        if concurrency_config is not None:
+            self.limiter = AdaptiveConcurrencyLimiter(**concurrency_config)
+        if circuit_breaker_config is not None:
+            self.circuit_breaker = CircuitBreaker(logger=self.logger, **circuit_breaker_config)
+        
+        # Hedged reads need at least two equivalent endpoints to race
+        if hedge_config is not None and self.router and len(self.router.nodes) > 1:
+            hedge_config = dict(hedge_config)
+            max_workers = hedge_config.pop('max_workers', 32)
+            self.hedging = HedgePolicy(**hedge_config)
+            self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                      thread_name_prefix="DatabaseManager-hedge")
     
     def _get_db_class(self):
         """Get the appropriate database class"""
@@ -989,9 +2867,40 @@ class DatabaseManager:
         
         return db_class
     
+    def _is_read(self, query: Any, fetch: str) -> bool:
+        """Check whether a fetch can be served by a replica"""
+        if fetch not in ('one', 'all'):
+            return False
+        if not self.db_class.sql_statements:
+            return True
+        return isinstance(query, str) and is_read_only_query(query)
+    
+    @contextmanager
+    def get_connection(self, read_only: bool = False):
+        """
+        Get a database connection (from pool or new)
+        
+        Args:
+            read_only: Allow the connection to come from a read replica
+        """
+        # An open transaction on this thread keeps every statement on its connection
+        pinned = getattr(self._local, 'connection', None)
+        if pinned is not None:
+            yield pinned
+            return
+        
+        if read_only and self.router:
+            with self.router.connection() as conn:
+                if conn is not None:
+                    yield conn
+                    return
+        
+        with self._primary_connection() as conn:
+            yield conn
+    
     @contextmanager
-    def get_connection(self):
-        """Get a database connection (from pool or new)"""
+    def _primary_connection(self):
+        """Get a connection to the primary (from pool or new)"""
         if self.use_pool and self.pool:
             conn = self.pool.get_connection()
             try:
@@ -999,15 +2908,14 @@ class DatabaseManager:
             finally:
                 self.pool.release_connection(conn)
         else:
-            conn = self.db_class(self.connection_params)
-            conn.connect()
+            conn = _connect_with_explainer(self.db_class, self.connection_params, self.explainer)
             try:
                 yield conn
             finally:
                 conn.disconnect()
     
     def execute_query(self, query: str, params: Optional[tuple] = None, 
-                     fetch: str = 'none') -> Any:
+                     fetch: str = 'none', cache_ttl: Optional[float] = None) -> Any:
         """
         Execute a query with automatic connection management
         
@@ -1015,29 +2923,223 @@ class DatabaseManager:
             query: SQL query or operation
             params: Query parameters
             fetch: 'none', 'one', or 'all'
+            cache_ttl: Result cache TTL override in seconds; 0 bypasses the cache
         """
-        with self.get_connection() as conn:
-            if fetch == 'one':
-                return conn.fetch_one(query, params)
-            elif fetch == 'all':
-                return conn.fetch_all(query, params)
-            else:
-                return conn.execute(query, params)
+        is_read = self._is_read(query, fetch)
+        in_transaction = getattr(self._local, 'connection', None) is not None
+        
+        if (self.result_cache and is_read and not in_transaction and cache_ttl != 0
+                and self.db_class.sql_statements):
+            return self._execute_cached(query, params, fetch, cache_ttl)
+        
+        result = self._execute(query, params, fetch, read_only=self.router is not None and is_read)
+        if self.result_cache and not (isinstance(query, str) and is_read_only_query(query)):
+            self._invalidate_written([query])
+        return result
+    
+    @contextmanager
+    def _admission(self):
+        """Apply the concurrency limit and circuit breaker around one database call"""
+        if getattr(self._local, 'connection', None) is not None:
+            # Statements inside an open transaction were admitted with the transaction
+            yield
+            return
+        
+        if self.limiter and not self.limiter.acquire():
+            raise ConcurrencyLimitExceeded(
+                f"Concurrency limit {self.limiter.get_stats()['limit']} reached for {self.db_type}"
+            )
+        if self.circuit_breaker and not self.circuit_breaker.allow_request():
+            if self.limiter:
+                self.limiter.release()
+            raise CircuitOpenError(f"Circuit open for {self.db_type}")
+        
+        start_time = time.time()
+        try:
+            yield
+        except Exception as e:
+            if self.circuit_breaker:
+                self.circuit_breaker.record_error(e)
+            if self.limiter:
+                self.limiter.release(time.time() - start_time, success=False)
+            raise
+        if self.circuit_breaker:
+            self.circuit_breaker.record_success()
+        if self.limiter:
+            self.limiter.release(time.time() - start_time)
+    
+    def _execute(self, query: str, params: Optional[tuple], fetch: str, read_only: bool) -> Any:
+        """Run a query on a routed connection"""
+        if read_only and self.hedging and getattr(self._local, 'connection', None) is None:
+            with self._admission():
+                return self._hedged_read(query, params, fetch)
+        
+        with self._admission(), self.get_connection(read_only=read_only) as conn:
+            return self._run(conn, query, params, fetch)
+    
+    @staticmethod
+    def _run(conn: DatabaseInterface, query: str, params: Optional[tuple], fetch: str) -> Any:
+        """Dispatch a query on a connection according to the fetch mode"""
+        if fetch == 'one':
+            return conn.fetch_one(query, params)
+        elif fetch == 'all':
+            return conn.fetch_all(query, params)
+        else:
+            return conn.execute(query, params)
+    
+    def _hedged_read(self, query: str, params: Optional[tuple], fetch: str) -> Any:
+        """
+        Send a read to one replica and, if it is slower than the rolling percentile, a duplicate
+        to another. The first successful answer wins and the other attempt is cancelled.
+        """
+        self.hedging.on_request()
+        first = self.router.choose()
+        if first is None:
+            with self.get_connection() as conn:
+                return self._run(conn, query, params, fetch)
+        
+        attempts = [self._start_attempt(first, query, params, fetch)]
+        try:
+            delay = self.hedging.hedge_delay()
+            if delay is not None:
+                done, _ = wait([attempts[0].future], timeout=delay)
+                if not done and self.hedging.try_hedge():
+                    second = self.router.choose(exclude={first})
+                    if second is not None:
+                        attempts.append(self._start_attempt(second, query, params, fetch))
+            
+            pending = {attempt.future: attempt for attempt in attempts}
+            error = None
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempt = pending.pop(future)
+                    if future.exception() is None:
+                        if attempt is not attempts[0]:
+                            self.hedging.record_win()
+                        return future.result()
+                    error = future.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                if not attempt.future.done() and attempt.cancel():
+                    self.router.release(attempt.node)
+    
+    def _start_attempt(self, node: _ReplicaNode, query: str, params: Optional[tuple],
+                       fetch: str) -> _HedgeAttempt:
+        """Submit one copy of a hedged read; the node reservation is released when it finishes"""
+        attempt = _HedgeAttempt(node)
+        
+        def run():
+            start_time = time.time()
+            try:
+                with node.manager.get_connection() as conn:
+                    if not attempt.attach(conn):
+                        raise RuntimeError("Hedged attempt cancelled")
+                    try:
+                        result = self._run(conn, query, params, fetch)
+                    except Exception:
+                        if attempt.cancelled:
+                            # Clear the aborted statement before the connection goes back to the pool
+                            conn.rollback()
+                        raise
+                    finally:
+                        attempt.attach(None)
+                self.hedging.record_latency(time.time() - start_time)
+                return result
+            finally:
+                self.router.release(node)
+        
+        attempt.future = self._hedge_executor.submit(run)
+        return attempt
+    
+    def _execute_cached(self, query: str, params: Optional[tuple], fetch: str,
+                        ttl: Optional[float]) -> Any:
+        """Serve a read from the result cache, filling it on a miss"""
+        key = QueryResultCache.make_key(query, params, fetch)
+        found, result = self.result_cache.get(key)
+        if found:
+            return result
+        
+        tables = referenced_tables(query)
+        snapshot = self.result_cache.snapshot(tables)
+        result = self._execute(query, params, fetch, read_only=self.router is not None)
+        self.result_cache.put(key, result, tables, snapshot, ttl)
+        return result
+    
+    def _invalidate_written(self, queries: List[Any]):
+        """Invalidate cached reads on tables touched by writes; deferred until an open transaction ends"""
+        tables = set()
+        for query in queries:
+            # '*' marks a write whose tables could not be determined
+            tables |= (referenced_tables(query) if isinstance(query, str) else set()) or {'*'}
+        
+        pending = getattr(self._local, 'written_tables', None)
+        if pending is not None:
+            pending |= tables
+        else:
+            self._apply_invalidation(tables)
+    
+    def _apply_invalidation(self, tables: set):
+        """Drop cached results for the given tables, or everything for unknown writes"""
+        if '*' in tables:
+            self.result_cache.clear()
+        else:
+            self.result_cache.invalidate_tables(tables)
+    
+    @contextmanager
+    def transaction(self, isolation_level: Optional[IsolationLevel] = None,
+                    read_only: bool = False):
+        """
+        Open a transaction and pin this thread's queries to its connection
+        
+        Args:
+            isolation_level: Transaction isolation level
+            read_only: Run the transaction on a read replica
+        """
+        pinned = getattr(self._local, 'connection', None)
+        if pinned is not None:
+            with pinned.transaction(isolation_level):
+                yield pinned
+            return
+        
+        with self._admission(), self.get_connection(read_only=read_only) as conn:
+            self._local.connection = conn
+            self._local.written_tables = written = set()
+            if self.result_cache:
+                # Statements run directly on the yielded connection bypass execute_query
+                conn.metrics.on_query = lambda query: self._track_write(query, written)
+            try:
+                with conn.transaction(isolation_level):
+                    yield conn
+            finally:
+                conn.metrics.on_query = None
+                self._local.connection = None
+                self._local.written_tables = None
+                if self.result_cache and written:
+                    self._apply_invalidation(written)
+    
+    @staticmethod
+    def _track_write(query: str, written: set):
+        """Collect the tables a statement inside a transaction may have changed"""
+        if not is_read_only_query(query):
+            written |= referenced_tables(query) or {'*'}
     
     def execute_transaction(self, operations: List[tuple], 
-                          isolation_level: Optional[IsolationLevel] = None) -> bool:
+                          isolation_level: Optional[IsolationLevel] = None,
+                          read_only: bool = False) -> bool:
         """
         Execute multiple operations in a transaction
         
         Args:
             operations: List of (query, params) tuples
             isolation_level: Transaction isolation level
+            read_only: Run the transaction on a read replica
         """
         try:
-            with self.get_connection() as conn:
-                with conn.transaction(isolation_level):
-                    for query, params in operations:
-                        conn.execute(query, params)
+            with self.transaction(isolation_level, read_only=read_only) as conn:
+                for query, params in operations:
+                    conn.execute(query, params)
             return True
         except Exception as e:
             self.logger.error(f"Transaction failed: {e}")
@@ -1061,6 +3163,12 @@ class DatabaseManager:
                 if self.pool:
                     health_status['pool_stats'] = self.pool.get_stats()
                 
+                if self.router:
+                    replicas = self.router.check_health()
+                    health_status['replicas'] = {
+                        name: replica.get('status') for name, replica in replicas.items()
+                    }
+                
                 return health_status
         except Exception as e:
             return {
@@ -1072,17 +3180,31 @@ class DatabaseManager:
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get aggregated metrics from all connections"""
+        metrics = {'database_type': self.db_type}
         if self.pool:
-            return {
-                'pool_stats': self.pool.get_stats(),
-                'database_type': self.db_type
-            }
-        return {'database_type': self.db_type}
+            metrics['pool_stats'] = self.pool.get_stats()
+        if self.router:
+            metrics['replica_stats'] = self.router.get_stats()
+        if self.result_cache:
+            metrics['result_cache'] = self.result_cache.get_stats()
+        if self.limiter:
+            metrics['concurrency'] = self.limiter.get_stats()
+        if self.circuit_breaker:
+            metrics['circuit_breaker'] = self.circuit_breaker.get_stats()
+        if self.hedging:
+            metrics['hedging'] = self.hedging.get_stats()
+        return metrics
     
     def close(self):
         """Close all connections"""
+        if self._hedge_executor:
+            self._hedge_executor.shutdown(wait=True)
+        if self.router:
+            self.router.close()
         if self.pool:
             self.pool.close_all()
+        if self.explainer:
+            self.explainer.close()
         self.logger.info("Database manager closed")
 
 
@@ -1123,7 +3245,8 @@ class DatabaseFactory:
     @classmethod
     def create_manager(cls, db_type: str, connection_params: Dict[str, Any],
                       use_pool: bool = True, pool_config: Optional[Dict[str, int]] = None,
-                      singleton: bool = False) -> DatabaseManager:
+                      singleton: bool = False,
+                      replicas: Optional[List[Dict[str, Any]]] = None) -> DatabaseManager:
         """
         Create a database manager
         
@@ -1133,17 +3256,18 @@ class DatabaseFactory:
             use_pool: Enable connection pooling
             pool_config: Pool configuration
             singleton: Use singleton pattern (one instance per database)
+            replicas: Connection parameters for read replicas
         """
         if singleton:
             key = f"{db_type}_{connection_params.get('database', 'default')}"
             with cls._lock:
                 if key not in cls._instances:
                     cls._instances[key] = DatabaseManager(
-                        db_type, connection_params, use_pool, pool_config
+                        db_type, connection_params, use_pool, pool_config, replicas
                     )
                 return cls._instances[key]
         
-        return DatabaseManager(db_type, connection_params, use_pool, pool_config)
+        return DatabaseManager(db_type, connection_params, use_pool, pool_config, replicas)
     
     @classmethod
     def close_all(cls):
@@ -1228,6 +3352,156 @@ def migrate_data(source_db: DatabaseInterface, target_db: DatabaseInterface,
     return bulk_insert(target_db, target_table, records, batch_size)
 
 
+def _iter_batches(rows: Iterator[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Group an iterator into lists of at most batch_size items"""
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _open_export_stream(output_file: str, compression: Optional[str]):
+    """Open a text stream for NDJSON output, compressing with gzip or zstd if requested"""
+    if compression is None:
+        if output_file.endswith('.gz'):
+            compression = 'gzip'
+        elif output_file.endswith('.zst'):
+            compression = 'zstd'
+    
+    if compression is None:
+        return open(output_file, 'w', encoding='utf-8')
+    if compression == 'gzip':
+        return gzip.open(output_file, 'wt', encoding='utf-8')
+    if compression == 'zstd':
+        import zstandard
+        raw = open(output_file, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding='utf-8')
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def stream_export(db: DatabaseInterface, query: str, params: Optional[tuple] = None,
+                  output_file: str = 'export.ndjson', format: str = 'ndjson',
+                  compression: Optional[str] = None, batch_size: int = 1000,
+                  progress_callback: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Export query results incrementally through fetch_iter, holding one batch in memory
+    
+    Args:
+        db: Database instance
+        query: SQL query
+        params: Query parameters
+        output_file: Output file path
+        format: 'ndjson' or 'parquet'
+        compression: NDJSON: None, 'gzip' or 'zstd' (inferred from .gz/.zst); Parquet: codec name
+        batch_size: Rows fetched and written per batch
+        progress_callback: Called with the running row count after each batch
+    """
+    batches = _iter_batches(db.fetch_iter(query, params, batch_size=batch_size), batch_size)
+    total_rows = 0
+    
+    if format == 'ndjson':
+        with _open_export_stream(output_file, compression) as f:
+            for batch in batches:
+                f.write(''.join(json.dumps(row, default=str) + '\n' for row in batch))
+                total_rows += len(batch)
+                if progress_callback:
+                    progress_callback(total_rows)
+    elif format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        writer = None
+        try:
+            for batch in batches:
+                table = pa.Table.from_pylist(batch, schema=writer.schema if writer else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_file, table.schema,
+                                              compression=compression or 'snappy')
+                writer.write_table(table)
+                total_rows += len(batch)
+                if progress_callback:
+                    progress_callback(total_rows)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
+    
+    return total_rows
+
+
+def stream_migrate(source_db: DatabaseInterface, target_db: DatabaseInterface,
+                   source_query: str, target_table: str, batch_size: int = 1000,
+                   transform_fn: Optional[Callable] = None, params: Optional[tuple] = None,
+                   queue_size: int = 4,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Migrate data with fetching and inserting pipelined on separate threads.
+    At most queue_size batches are buffered between them, so memory stays constant.
+    
+    Args:
+        source_db: Source database
+        target_db: Target database
+        source_query: Query to fetch data from source
+        target_table: Target table name
+        batch_size: Rows per fetched and inserted batch
+        transform_fn: Optional transformation function
+        params: Source query parameters
+        queue_size: Maximum batches waiting to be inserted
+        progress_callback: Called with the running inserted row count after each batch
+    """
+    batches = Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done = object()
+    
+    def fetch():
+        """Producer: read the source and hand batches to the inserter"""
+        outcome = done
+        try:
+            rows = source_db.fetch_iter(source_query, params, batch_size=batch_size)
+            for batch in _iter_batches(rows, batch_size):
+                if transform_fn:
+                    batch = [transform_fn(record) for record in batch]
+                while not stop.is_set():
+                    try:
+                        batches.put(batch, timeout=0.5)
+                        break
+                    except Full:
+                        continue
+                if stop.is_set():
+                    return
+        except Exception as e:
+            outcome = e
+        batches.put(outcome)
+    
+    fetcher = threading.Thread(target=fetch, daemon=True, name="stream_migrate-fetch")
+    fetcher.start()
+    
+    total_inserted = 0
+    try:
+        while True:
+            batch = batches.get()
+            if batch is done:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            total_inserted += bulk_insert(target_db, target_table, batch, batch_size)
+            if progress_callback:
+                progress_callback(total_inserted)
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue so it can exit
+        while fetcher.is_alive():
+            try:
+                batches.get_nowait()
+            except Empty:
+                fetcher.join(timeout=0.1)
+    
+    return total_inserted
+
+
 # Example usage
 if __name__ == "__main__":
     # Example 1: Using DatabaseManager with connection pooling
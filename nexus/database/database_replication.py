@@ -4,17 +4,26 @@ Automatically replicates changes across multiple database instances in real-time
 """
 
 from nexus.database.database_management import DatabaseFactory, DatabaseInterface
-from typing import Dict, Any, List, Optional, Callable, Tuple
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import deque
+from contextlib import contextmanager
 import threading
 import logging
 import time
 import queue
 import json
 import hashlib
+import bisect
+import os
+import atexit
+import math
+import itertools
+import re
+import zlib
 
 
 logging.basicConfig(
@@ -23,6 +32,18 @@ logging.basicConfig(
 )
 
 
+class ReplicationTimeoutError(TimeoutError):
+    """Raised when a synchronous write is not acknowledged by enough replicas in time"""
+
+
+class EventsNotRetainedError(LookupError):
+    """Raised when a catch-up read starts before the oldest event the log still retains"""
+
+    def __init__(self, message: str, first_sequence: int):
+        super().__init__(message)
+        self.first_sequence = first_sequence
+
+
 class ReplicationMode(Enum):
     """Replication modes"""
     SYNCHRONOUS = "synchronous"      # Wait for all replicas
@@ -54,6 +75,7 @@ class ReplicationEvent:
     params: Optional[tuple]
     source_db: str
     checksum: str
+    sequence: Optional[int] = None  # Log sequence number, set once logged
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -78,6 +100,10 @@ class ReplicaConfig:
     priority: int = 100  # Lower = higher priority
     enabled: bool = True
     max_lag_seconds: int = 30  # Maximum acceptable replication lag
+    apply_batch_size: int = 500  # Max events applied per replica transaction
+    apply_batch_ms: float = 10.0  # Max time spent gathering a batch
+    apply_lanes: int = 1  # Parallel apply lanes (each with its own connection)
+    partition_keys: Dict[str, str] = field(default_factory=dict)  # table -> key column for lane hashing
 
 
 @dataclass
@@ -89,6 +115,8 @@ class ReplicationStats:
     total_lag_ms: float = 0.0
     average_lag_ms: float = 0.0
     last_event_time: Optional[datetime] = None
+    batches_applied: int = 0
+    batch_fallbacks: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -96,46 +124,482 @@ class ReplicationStats:
             'events_failed': self.events_failed,
             'replicas_synced': self.replicas_synced,
             'average_lag_ms': round(self.average_lag_ms, 2),
+            'batches_applied': self.batches_applied,
+            'batch_fallbacks': self.batch_fallbacks,
             'last_event_time': self.last_event_time.isoformat() if self.last_event_time else None
         }
 
 
+class _LogSegment:
+    """A single log segment and its sparse offset index"""
+
+    def __init__(self, path: str, base_seq: int):
+        self.path = path
+        self.base_seq = base_seq
+        self.last_seq = base_seq - 1
+        self.size = 0
+        self.max_timestamp: Optional[datetime] = None
+        # (first seq at offset, max timestamp of events before offset, byte offset)
+        self.index: List[Tuple[int, Optional[datetime], int]] = []
+        self._bytes_since_index = 0
+
+    def record(self, seq: int, timestamp: datetime, offset: int, length: int, interval: int):
+        """Account for an appended event, adding an index entry every `interval` bytes"""
+        if not self.index or self._bytes_since_index >= interval:
+            self.index.append((seq, self.max_timestamp, offset))
+            self._bytes_since_index = 0
+        self._bytes_since_index += length
+        self.last_seq = seq
+        self.size = offset + length
+        if self.max_timestamp is None or timestamp > self.max_timestamp:
+            self.max_timestamp = timestamp
+
+    def seek_sequence(self, seq: int) -> Tuple[int, int]:
+        """(first seq, byte offset) of the last index entry at or before `seq`"""
+        lo, hi = 0, len(self.index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.index[mid][0] <= seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._entry(lo - 1)
+
+    def seek_timestamp(self, timestamp: datetime) -> Tuple[int, int]:
+        """(first seq, byte offset) after which events at or after `timestamp` may appear"""
+        # Index entries carry the running max timestamp, so they are monotonic
+        lo, hi = 0, len(self.index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            max_before = self.index[mid][1]
+            if max_before is None or max_before < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._entry(lo - 1)
+
+    def _entry(self, pos: int) -> Tuple[int, int]:
+        if pos < 0:
+            return self.base_seq, 0
+        return self.index[pos][0], self.index[pos][2]
+
+    def index_path(self) -> str:
+        return self.path + '.idx'
+
+    def save_index(self):
+        """Persist the index next to a sealed segment"""
+        with open(self.index_path(), 'w') as f:
+            json.dump({
+                'base_seq': self.base_seq,
+                'last_seq': self.last_seq,
+                'size': self.size,
+                'max_timestamp': self.max_timestamp.isoformat() if self.max_timestamp else None,
+                'index': [
+                    [seq, ts.isoformat() if ts else None, offset]
+                    for seq, ts, offset in self.index
+                ]
+            }, f)
+
+    @classmethod
+    def load_index(cls, path: str) -> Optional['_LogSegment']:
+        try:
+            with open(path + '.idx', 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        segment = cls(path, data['base_seq'])
+        segment.last_seq = data['last_seq']
+        segment.size = data['size']
+        if data['max_timestamp']:
+            segment.max_timestamp = datetime.fromisoformat(data['max_timestamp'])
+        segment.index = [
+            (seq, datetime.fromisoformat(ts) if ts else None, offset)
+            for seq, ts, offset in data['index']
+        ]
+        return segment
+
+
 class ReplicationLog:
-    """Manages replication event log"""
-    
-    def __init__(self, log_file: str = 'replication.log'):
+    """
+    Manages replication event log
+
+    The log is split into segments of at most ``segment_size`` bytes. The
+    active segment lives at ``log_file``; sealed segments are renamed to
+    ``<log_file>.<base_seq>`` with a sparse ``.idx`` sidecar mapping sequence
+    numbers and timestamps to byte offsets, so catch-up reads seek straight
+    to the first relevant event instead of parsing the whole history.
+
+    Writes use group commit: callers enqueue events and a single writer
+    thread holding an open handle appends whatever has queued up in one
+    write, syncs once per batch according to ``fsync`` ('batch', 'interval'
+    or 'none'), then completes every caller's future.
+    """
+
+    FSYNC_POLICIES = ('batch', 'interval', 'none')
+
+    def __init__(self, log_file: str = 'replication.log',
+                 segment_size: int = 64 * 1024 * 1024,
+                 index_interval: int = 4096,
+                 retention_segments: Optional[int] = None,
+                 retention_seconds: Optional[float] = None,
+                 fsync: str = 'batch',
+                 fsync_interval: float = 1.0,
+                 max_batch: int = 1000,
+                 max_batch_delay: float = 0.0):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
         self.log_file = log_file
+        self.segment_size = segment_size
+        self.index_interval = index_interval
+        self.retention_segments = retention_segments
+        self.retention_seconds = retention_seconds
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_batch = max_batch
+        self.max_batch_delay = max_batch_delay
         self.lock = threading.Lock()
-    
-    def log_event(self, event: ReplicationEvent):
-        """Log replication event"""
+        self._segments: List[_LogSegment] = []
+        self._pruned_through: Optional[datetime] = None  # newest timestamp removed by retention
+        self._load_segments()
+
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._handle = None
+        self._last_fsync = time.monotonic()
+        self._atexit_registered = False
+        self._write_stats = {'batches': 0, 'events': 0, 'fsyncs': 0, 'max_batch': 0}
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the most recently logged event (0 when empty)"""
+        return self._segments[-1].last_seq if self._segments else 0
+
+    def log_event(self, event: ReplicationEvent) -> int:
+        """Log replication event and return its sequence number once durable"""
+        return self.log_event_async(event).result()
+
+    def log_event_async(self, event: ReplicationEvent) -> Future:
+        """Queue an event for the writer; the future resolves to its sequence number"""
+        future: Future = Future()
+        self._ensure_writer()
+        self._queue.put((event, future))
+        return future
+
+    def close(self):
+        """Flush queued events and stop the writer (it restarts on the next write)"""
+        with self._writer_lock:
+            writer = self._writer
+            if writer is None:
+                return
+            self._queue.put(None)
+            writer.join()
+            self._writer = None
         with self.lock:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(event.to_dict()) + '\n')
-    
+            self._close_handle()
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(target=self._write_loop, daemon=True,
+                                            name='ReplicationLogWriter')
+            self._writer.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _write_loop(self):
+        """Drain the queue in batches until a stop sentinel arrives"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_batch_delay
+            while len(batch) < self.max_batch:
+                try:
+                    remaining = deadline - time.monotonic()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Tuple[ReplicationEvent, Future]]):
+        """Append a batch with one write (per segment) and one sync, then ack it"""
+        done: List[Tuple[ReplicationEvent, Future, int]] = []
+        try:
+            with self.lock:
+                buffer = []
+                for event, future in batch:
+                    active = self._active_segment()
+                    seq = active.last_seq + 1
+                    record = event.to_dict()
+                    record['seq'] = seq
+                    line = (json.dumps(record) + '\n').encode('utf-8')
+                    buffer.append(line)
+                    active.record(seq, event.timestamp, active.size, len(line), self.index_interval)
+                    done.append((event, future, seq))
+                    if active.size >= self.segment_size:
+                        self._flush_buffer(buffer)
+                        buffer = []
+                        self._close_handle()
+                        self._roll_segment()
+                self._flush_buffer(buffer)
+                self._write_stats['batches'] += 1
+                self._write_stats['events'] += len(batch)
+                self._write_stats['max_batch'] = max(self._write_stats['max_batch'], len(batch))
+        except Exception as e:
+            logging.getLogger('ReplicationLog').error(f"Failed to write log batch: {e}")
+            with self.lock:
+                self._close_handle()
+                # Resync the active segment with what actually reached disk
+                if self._segments:
+                    base_seq = self._segments[-1].base_seq
+                    self._segments[-1] = (self._scan_segment(self.log_file, base_seq)
+                                          if os.path.exists(self.log_file)
+                                          else _LogSegment(self.log_file, base_seq))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for event, future, seq in done:
+            event.sequence = seq
+            future.set_result(seq)
+
+    def _flush_buffer(self, buffer: List[bytes]):
+        if not buffer:
+            return
+        if self._handle is None:
+            self._handle = open(self.log_file, 'ab')
+        self._handle.write(b''.join(buffer))
+        self._handle.flush()
+        now = time.monotonic()
+        if self.fsync == 'batch' or (self.fsync == 'interval'
+                                     and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._handle.fileno())
+            self._last_fsync = now
+            self._write_stats['fsyncs'] += 1
+
+    def _close_handle(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
     def get_events_since(self, timestamp: datetime) -> List[ReplicationEvent]:
-        """Get events since timestamp (for replica recovery)"""
+        """
+        Get events since timestamp (for replica recovery).
+        Raises EventsNotRetainedError if retention already removed events from that range.
+        """
+        events = []
+        with self._pinned_segments() as pinned:
+            horizon, first_event = self._retention_horizon(pinned)
+            if (horizon is not None and timestamp <= horizon) or \
+                    (horizon is None and first_event is not None and timestamp < first_event.timestamp):
+                raise EventsNotRetainedError(
+                    f"Events since {timestamp.isoformat()} are no longer retained",
+                    pinned[0][0].base_seq
+                )
+            for segment, handle, size in pinned:
+                if segment.max_timestamp is None or segment.max_timestamp < timestamp:
+                    continue
+                start = segment.seek_timestamp(timestamp)
+                for event in self._read_segment(handle, size, start):
+                    if event.timestamp >= timestamp:
+                        events.append(event)
+        return events
+
+    def get_events_after(self, sequence: int) -> List[ReplicationEvent]:
+        """
+        Get events with a sequence number greater than `sequence`.
+        Raises EventsNotRetainedError if retention already removed some of them.
+        """
         events = []
+        with self._pinned_segments() as pinned:
+            if pinned and pinned[0][0].base_seq > sequence + 1:
+                raise EventsNotRetainedError(
+                    f"Events after sequence {sequence} are no longer retained; "
+                    f"the log starts at {pinned[0][0].base_seq}",
+                    pinned[0][0].base_seq
+                )
+            for segment, handle, size in pinned:
+                if segment.last_seq <= sequence:
+                    continue
+                start = segment.seek_sequence(sequence + 1)
+                for event in self._read_segment(handle, size, start):
+                    if event.sequence > sequence:
+                        events.append(event)
+        return events
+
+    def apply_retention(self) -> int:
+        """Delete sealed segments outside the retention policy; returns segments removed"""
+        with self.lock:
+            return self._apply_retention()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get log statistics"""
+        with self.lock:
+            segments = list(self._segments)
+        return {
+            'segments': len(segments),
+            'total_bytes': sum(s.size for s in segments),
+            'first_sequence': segments[0].base_seq if segments else 0,
+            'last_sequence': segments[-1].last_seq if segments else 0,
+            'batches_written': self._write_stats['batches'],
+            'events_written': self._write_stats['events'],
+            'max_batch_size': self._write_stats['max_batch'],
+            'avg_batch_size': round(self._write_stats['events'] / max(self._write_stats['batches'], 1), 2),
+            'fsyncs': self._write_stats['fsyncs'],
+            'pending': self._queue.qsize()
+        }
+
+    @contextmanager
+    def _pinned_segments(self):
+        """
+        Open every segment under the lock and yield (segment, handle, size) tuples.
+        An open handle keeps reading the same file after a roll renames it or
+        retention deletes it, so readers never race the writer.
+        """
+        pinned = []
+        try:
+            with self.lock:
+                for segment in self._segments:
+                    try:
+                        handle = open(segment.path, 'rb')
+                    except FileNotFoundError:
+                        continue  # active segment before its first write
+                    pinned.append((segment, handle, segment.size))
+            yield pinned
+        finally:
+            for _, handle, _ in pinned:
+                handle.close()
+
+    def _retention_horizon(self, pinned) -> Tuple[Optional[datetime], Optional[ReplicationEvent]]:
+        """
+        Newest timestamp retention removed (known only for pruning done by this process)
+        and, when older events were pruned, the first retained event.
+        """
+        if not pinned or pinned[0][0].base_seq == 1:
+            return None, None
+        if self._pruned_through is not None:
+            return self._pruned_through, None
+        first = next(self._read_segment(pinned[0][1], pinned[0][2], (pinned[0][0].base_seq, 0)), None)
+        return None, first
+
+    def _active_segment(self) -> _LogSegment:
+        if not self._segments:
+            self._segments.append(_LogSegment(self.log_file, 1))
+        return self._segments[-1]
+
+    def _roll_segment(self):
+        """Seal the active segment and start a new one at the base path"""
+        active = self._segments[-1]
+        sealed_path = f"{self.log_file}.{active.base_seq:020d}"
+        os.replace(self.log_file, sealed_path)
+        active.path = sealed_path
+        active.save_index()
+        open(self.log_file, 'ab').close()
+        self._segments.append(_LogSegment(self.log_file, active.last_seq + 1))
+        self._apply_retention()
+
+    def _apply_retention(self) -> int:
+        sealed = self._segments[:-1]
+        doomed = []
+        if self.retention_segments is not None and len(sealed) > self.retention_segments:
+            doomed.extend(sealed[:len(sealed) - self.retention_segments])
+        if self.retention_seconds is not None:
+            cutoff = datetime.now() - timedelta(seconds=self.retention_seconds)
+            doomed.extend(
+                s for s in sealed
+                if s not in doomed and s.max_timestamp is not None and s.max_timestamp < cutoff
+            )
+        for segment in doomed:
+            for path in (segment.path, segment.index_path()):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._segments.remove(segment)
+            if segment.max_timestamp is not None and (
+                    self._pruned_through is None or segment.max_timestamp > self._pruned_through):
+                self._pruned_through = segment.max_timestamp
+        return len(doomed)
+
+    def _load_segments(self):
+        """Rebuild segment metadata from files left by a previous run"""
+        directory = os.path.dirname(self.log_file) or '.'
+        prefix = os.path.basename(self.log_file) + '.'
         try:
-            with open(self.log_file, 'r') as f:
-                for line in f:
-                    event_data = json.loads(line)
-                    event_time = datetime.fromisoformat(event_data['timestamp'])
-                    if event_time >= timestamp:
-                        events.append(ReplicationEvent(
-                            event_id=event_data['event_id'],
-                            timestamp=event_time,
-                            operation=event_data['operation'],
-                            table=event_data['table'],
-                            query=event_data['query'],
-                            params=tuple(event_data['params']) if event_data['params'] else None,
-                            source_db=event_data['source_db'],
-                            checksum=event_data['checksum']
-                        ))
+            names = os.listdir(directory)
         except FileNotFoundError:
-            pass
-        
-        return events
+            names = []
+        sealed = sorted(
+            n for n in names
+            if n.startswith(prefix) and n[len(prefix):].isdigit()
+        )
+        for name in sealed:
+            path = os.path.join(directory, name)
+            segment = _LogSegment.load_index(path) or self._scan_segment(path, int(name[len(prefix):]))
+            self._segments.append(segment)
+        base_seq = self._segments[-1].last_seq + 1 if self._segments else 1
+        if os.path.exists(self.log_file):
+            self._segments.append(self._scan_segment(self.log_file, base_seq))
+        elif self._segments:
+            self._segments.append(_LogSegment(self.log_file, base_seq))
+
+    def _scan_segment(self, path: str, base_seq: int) -> _LogSegment:
+        """Build the index for a segment by scanning it once"""
+        segment = _LogSegment(path, base_seq)
+        offset = 0
+        seq = base_seq - 1
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                data = json.loads(line)
+                seq = data.get('seq', seq + 1)
+                segment.record(seq, datetime.fromisoformat(data['timestamp']),
+                               offset, len(line), self.index_interval)
+                offset += len(line)
+        if os.path.getsize(path) > offset:
+            # Drop a torn write at the tail so new appends stay line-aligned
+            os.truncate(path, offset)
+        return segment
+
+    def _read_segment(self, handle, size: int, start: Tuple[int, int]):
+        """Yield events from an indexed (seq, offset) position of a pinned handle up to `size` bytes"""
+        seq, position = start
+        handle.seek(position)
+        while position < size:
+            line = handle.readline()
+            if not line.endswith(b'\n'):
+                break  # end of file or a write still in progress
+            position += len(line)
+            yield self._parse_event(line, seq)
+            seq += 1
+
+    @staticmethod
+    def _parse_event(line: bytes, seq: int) -> ReplicationEvent:
+        event_data = json.loads(line)
+        return ReplicationEvent(
+            event_id=event_data['event_id'],
+            timestamp=datetime.fromisoformat(event_data['timestamp']),
+            operation=event_data['operation'],
+            table=event_data['table'],
+            query=event_data['query'],
+            params=tuple(event_data['params']) if event_data['params'] else None,
+            source_db=event_data['source_db'],
+            checksum=event_data['checksum'],
+            sequence=event_data.get('seq', seq)
+        )
 
 
 class ReplicaManager:
@@ -145,12 +609,27 @@ class ReplicaManager:
         self.config = config
         self.logger = logging.getLogger(f"Replica-{config.name}")
         self.db: Optional[DatabaseInterface] = None
+        # Routed reads get their own connection so they never share one with the apply worker
+        self.read_db: Optional[DatabaseInterface] = None
+        self._read_db_lock = threading.Lock()
         self.is_connected = False
         self.last_sync_time: Optional[datetime] = None
+        self.applied_sequence = 0  # Highest log sequence committed with every earlier event
+        self.failed_sequence: Optional[int] = None  # Lowest sequence dropped or not applied
+        self._applied_ahead: Set[int] = set()  # Applied sequences waiting on an earlier one
+        self._sequence_lock = threading.Lock()
+        self.applied_through: Optional[datetime] = None  # Primary timestamp of the last applied event
         self.event_queue = queue.Queue(maxsize=10000)
         self.stats = ReplicationStats()
         self._stop_event = threading.Event()
         self._worker_thread: Optional[threading.Thread] = None
+        self._acks: Dict[int, Future] = {}
+        self._acks_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._partition_keys = {t.lower(): c for t, c in config.partition_keys.items()}
+        # Extra connections for apply lanes 1..N-1; lane 0 uses self.db
+        self._lane_dbs: List[DatabaseInterface] = []
+        self._lane_executor: Optional[ThreadPoolExecutor] = None
     
     def connect(self):
         """Connect to replica database"""
@@ -160,6 +639,14 @@ class ReplicaManager:
                 self.config.connection_params
             )
             self.db.connect()
+            self._lane_dbs = []
+            for _ in range(self.config.apply_lanes - 1):
+                lane_db = DatabaseFactory.create_database(
+                    self.config.db_type,
+                    self.config.connection_params
+                )
+                lane_db.connect()
+                self._lane_dbs.append(lane_db)
             self.is_connected = True
             self.logger.info(f"Connected to replica: {self.config.name}")
         except Exception as e:
@@ -169,11 +656,37 @@ class ReplicaManager:
     
     def disconnect(self):
         """Disconnect from replica database"""
+        with self._read_db_lock:
+            if self.read_db is not None:
+                self.read_db.disconnect()
+                self.read_db = None
         if self.db:
             self.db.disconnect()
+            for lane_db in self._lane_dbs:
+                lane_db.disconnect()
+            self._lane_dbs = []
             self.is_connected = False
             self.logger.info(f"Disconnected from replica: {self.config.name}")
     
+    def mark_synced(self, sequence: int):
+        """Treat every logged event up to `sequence` as already applied on this replica"""
+        with self._sequence_lock:
+            if self.failed_sequence is None and sequence > self.applied_sequence:
+                self.applied_sequence = sequence
+                self._applied_ahead = {s for s in self._applied_ahead if s > sequence}
+    
+    def get_read_db(self) -> DatabaseInterface:
+        """Connection for routed reads, opened on first use"""
+        with self._read_db_lock:
+            if self.read_db is None:
+                read_db = DatabaseFactory.create_database(
+                    self.config.db_type,
+                    self.config.connection_params
+                )
+                read_db.connect()
+                self.read_db = read_db
+            return self.read_db
+    
     def start_worker(self):
         """Start background worker to process events"""
         if self._worker_thread is None or not self._worker_thread.is_alive():
@@ -182,6 +695,11 @@ class ReplicaManager:
                 target=self._process_events,
                 daemon=True
             )
+            if self.config.apply_lanes > 1 and self._lane_executor is None:
+                self._lane_executor = ThreadPoolExecutor(
+                    max_workers=self.config.apply_lanes,
+                    thread_name_prefix=f"apply-{self.config.name}"
+                )
             self._worker_thread.start()
             self.logger.info(f"Started worker thread for {self.config.name}")
     
@@ -191,73 +709,332 @@ class ReplicaManager:
         if self._worker_thread:
             self._worker_thread.join(timeout=5)
             self.logger.info(f"Stopped worker thread for {self.config.name}")
+        if self._lane_executor is not None:
+            self._lane_executor.shutdown(wait=True)
+            self._lane_executor = None
+        
+        # Nothing will apply the queued events now, so nack anyone waiting on them
+        with self._acks_lock:
+            pending, self._acks = self._acks, {}
+        for ack in pending.values():
+            if not ack.done():
+                ack.set_result(False)
     
-    def enqueue_event(self, event: ReplicationEvent) -> bool:
-        """Add event to replication queue"""
+    def enqueue_event(self, event: ReplicationEvent, ack: Optional[Future] = None) -> bool:
+        """
+        Add event to replication queue. When `ack` is given it is resolved
+        with True once the event is committed on this replica, or False if
+        it could not be applied.
+        """
+        if ack is not None:
+            with self._acks_lock:
+                self._acks[id(event)] = ack
         try:
             self.event_queue.put(event, timeout=1)
             return True
         except queue.Full:
             self.logger.error(f"Event queue full for {self.config.name}")
+            self._record_failed_sequence(event.sequence)
+            self._complete_ack(event, False)
             return False
     
+    def _record_failed_sequence(self, sequence: Optional[int]):
+        """Remember a sequence this replica will never apply; applied_sequence stops below it"""
+        if sequence is None:
+            return
+        with self._sequence_lock:
+            if self.failed_sequence is None or sequence < self.failed_sequence:
+                self.failed_sequence = sequence
+    
+    def _record_applied_sequence(self, sequence: int):
+        """Advance applied_sequence over the contiguous run of applied sequences"""
+        with self._sequence_lock:
+            if sequence <= self.applied_sequence:
+                return
+            self._applied_ahead.add(sequence)
+            while self.applied_sequence + 1 in self._applied_ahead:
+                if self.failed_sequence is not None and self.applied_sequence + 1 >= self.failed_sequence:
+                    break
+                self.applied_sequence += 1
+                self._applied_ahead.discard(self.applied_sequence)
+    
+    def _complete_ack(self, event: ReplicationEvent, success: bool):
+        """Resolve the acknowledgement future registered for an event, if any"""
+        with self._acks_lock:
+            ack = self._acks.pop(id(event), None)
+        if ack is not None and not ack.done():
+            ack.set_result(success)
+    
     def _process_events(self):
-        """Background worker to process replication events"""
+        """Background worker to process replication events in batches"""
         while not self._stop_event.is_set():
+            batch = self._drain_batch()
+            if not batch:
+                continue
+            
+            results = [False] * len(batch)
             try:
-                # Get event with timeout
-                event = self.event_queue.get(timeout=0.1)
-                
-                # Process event
-                success = self._apply_event(event)
-                
+                if self.config.apply_lanes > 1:
+                    results = self._apply_partitioned(batch)
+                else:
+                    results = self._apply_batch(batch)
+            except Exception as e:
+                self.logger.error(f"Error processing batch of {len(batch)} events: {e}")
+            finally:
+                # Every drained event is acked and marked done, even if the apply raised
+                self._finish_batch(batch, results)
+    
+    def _finish_batch(self, batch: List[ReplicationEvent], results: List[bool]):
+        """Publish progress and stats for an applied batch, then ack and release its events"""
+        try:
+            # Publish progress before acking so readers holding a token see it.
+            # applied_sequence only moves over an unbroken run of sequences, so a
+            # token at or above a missing event is never served by this replica.
+            for event, success in zip(batch, results):
+                if not success:
+                    self._record_failed_sequence(event.sequence)
+                    continue
+                if event.sequence is not None:
+                    self._record_applied_sequence(event.sequence)
+                if self.applied_through is None or event.timestamp > self.applied_through:
+                    self.applied_through = event.timestamp
+            
+            now = datetime.now()
+            for event, success in zip(batch, results):
                 if success:
                     self.stats.events_processed += 1
                     self.stats.replicas_synced += 1
-                    self.last_sync_time = datetime.now()
+                    self.last_sync_time = now
                 else:
                     self.stats.events_failed += 1
                 
                 # Calculate lag
-                lag_ms = (datetime.now() - event.timestamp).total_seconds() * 1000
+                lag_ms = (now - event.timestamp).total_seconds() * 1000
                 self.stats.total_lag_ms += lag_ms
-                self.stats.average_lag_ms = self.stats.total_lag_ms / max(self.stats.events_processed, 1)
-                
+            
+            self.stats.average_lag_ms = self.stats.total_lag_ms / max(self.stats.events_processed, 1)
+        except Exception as e:
+            self.logger.error(f"Error recording batch progress: {e}")
+        finally:
+            for event, success in zip(batch, results):
+                self._complete_ack(event, success)
                 self.event_queue.task_done()
-                
+    
+    def _drain_batch(self) -> List[ReplicationEvent]:
+        """Collect up to apply_batch_size events, waiting at most apply_batch_ms"""
+        try:
+            batch = [self.event_queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        
+        deadline = time.monotonic() + self.config.apply_batch_ms / 1000
+        while len(batch) < self.config.apply_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self.event_queue.get(timeout=remaining))
+                else:
+                    batch.append(self.event_queue.get_nowait())
             except queue.Empty:
-                continue
-            except Exception as e:
-                self.logger.error(f"Error processing event: {e}")
+                break
+        return batch
     
-    def _apply_event(self, event: ReplicationEvent) -> bool:
-        """Apply replication event to replica"""
+    def _apply_partitioned(self, events: List[ReplicationEvent]) -> List[bool]:
+        """
+        Apply a batch across parallel lanes. Events touching the same row (or
+        the same table, when no key is known) always land in the same lane and
+        keep their order; anything that cannot be placed in a lane, such as
+        DDL, is a barrier that runs alone once the lanes before it finish.
+        Lanes do not order writes across tables, so events that fail in a lane
+        (e.g. a child row whose parent sat in another lane) are retried one by
+        one, in log order, once the lanes finish.
+        """
         if not self.is_connected:
             self.logger.warning(f"Not connected to {self.config.name}, attempting reconnect...")
             try:
                 self.connect()
-            except:
-                return False
+            except Exception:
+                return [False] * len(events)
+        
+        results = [False] * len(events)
+        lanes: Dict[int, List[int]] = {}
+        
+        def run_lanes():
+            if not lanes:
+                return
+            dbs = [self.db] + self._lane_dbs
+            futures = {
+                lane: self._lane_executor.submit(
+                    self._apply_batch, [events[i] for i in positions], dbs[lane]
+                ) if self._lane_executor is not None else None
+                for lane, positions in lanes.items()
+            }
+            for lane, positions in lanes.items():
+                future = futures[lane]
+                lane_results = (future.result() if future is not None
+                                else self._apply_batch([events[i] for i in positions], dbs[lane]))
+                for position, success in zip(positions, lane_results):
+                    results[position] = success
+            retry = sorted(p for positions in lanes.values() for p in positions if not results[p])
+            lanes.clear()
+            for position in retry:
+                results[position] = self._apply_event(events[position])
+        
+        for position, event in enumerate(events):
+            lane = self._lane_for(event)
+            if lane is None:
+                run_lanes()
+                results[position] = self._apply_event(event)
+            else:
+                lanes.setdefault(lane, []).append(position)
+        run_lanes()
+        return results
+    
+    def _lane_for(self, event: ReplicationEvent) -> Optional[int]:
+        """Lane index for an event, or None when it must run as a barrier"""
+        if event.operation not in ('INSERT', 'UPDATE', 'DELETE'):
+            return None
+        
+        table = event.table.lower()
+        key_column = self._partition_keys.get(table)
+        if key_column is None:
+            routing_key = table
+        else:
+            key = self._extract_key(event, key_column)
+            if key is None:
+                # Could touch any row of a keyed table; serialize it
+                return None
+            routing_key = f"{table}\x00{key}"
+        return zlib.crc32(routing_key.encode('utf-8')) % self.config.apply_lanes
+    
+    @staticmethod
+    def _extract_key(event: ReplicationEvent, column: str) -> Optional[str]:
+        """Value bound to `column` for a single-row statement, if it can be determined"""
+        query = event.query
+        params = event.params or ()
+        placeholder = r'(?:%s|\?)'
+        column_re = rf'\b{re.escape(column)}\b'
+        
+        if event.operation == 'INSERT':
+            match = re.search(r'INSERT\s+INTO\s+[^\s(]+\s*\(([^)]*)\)\s*VALUES\s*\(', query, re.IGNORECASE)
+            if not match:
+                return None
+            columns = [c.strip().strip('"`[]').lower() for c in match.group(1).split(',')]
+            if column.lower() not in columns or len(columns) != len(params):
+                return None
+            return str(params[columns.index(column.lower())])
+        
+        where = re.search(r'\bWHERE\b', query, re.IGNORECASE)
+        if not where or re.search(r'\bOR\b', query[where.end():], re.IGNORECASE):
+            return None
+        if event.operation == 'UPDATE':
+            set_clause = re.search(r'\bSET\b(.*)', query[:where.start()], re.IGNORECASE | re.DOTALL)
+            if set_clause and re.search(column_re + r'\s*=', set_clause.group(1), re.IGNORECASE):
+                return None  # Statement moves the row to a different key
+        match = re.search(column_re + r'\s*=\s*' + placeholder, query[where.end():], re.IGNORECASE)
+        if not match:
+            return None
+        index = len(re.findall(placeholder, query[:where.end() + match.start()]))
+        return str(params[index]) if index < len(params) else None
+    
+    def _apply_batch(self, events: List[ReplicationEvent],
+                     db: Optional[DatabaseInterface] = None) -> List[bool]:
+        """
+        Apply events in a single transaction, grouping runs of identical
+        statements into execute_many. Falls back to per-event apply on error
+        so one bad statement does not fail its neighbours.
+        """
+        if len(events) == 1:
+            return [self._apply_event(events[0], db)]
+        
+        if db is None:
+            if not self.is_connected:
+                self.logger.warning(f"Not connected to {self.config.name}, attempting reconnect...")
+                try:
+                    self.connect()
+                except Exception:
+                    return [False] * len(events)
+            db = self.db
+        
+        try:
+            for query, params_list in self._group_statements(events):
+                if len(params_list) > 1:
+                    db.execute_many(query, params_list)
+                else:
+                    db.execute(query, params_list[0])
+            db.commit()
+            with self._stats_lock:
+                self.stats.batches_applied += 1
+            self.logger.debug(f"Applied batch of {len(events)} events to {self.config.name}")
+            return [True] * len(events)
+            
+        except Exception as e:
+            self.logger.warning(f"Batch apply failed on {self.config.name}, retrying per event: {e}")
+            self._rollback_quietly(db)
+            with self._stats_lock:
+                self.stats.batch_fallbacks += 1
+            return [self._apply_event(event, db) for event in events]
+    
+    @staticmethod
+    def _group_statements(events: List[ReplicationEvent]) -> List[Tuple[str, List[Optional[tuple]]]]:
+        """Group consecutive events sharing the same statement, preserving order"""
+        groups: List[Tuple[str, List[Optional[tuple]]]] = []
+        for event in events:
+            if (groups and groups[-1][0] == event.query
+                    and event.params is not None and groups[-1][1][-1] is not None):
+                groups[-1][1].append(event.params)
+            else:
+                groups.append((event.query, [event.params]))
+        return groups
+    
+    def _apply_event(self, event: ReplicationEvent, db: Optional[DatabaseInterface] = None) -> bool:
+        """Apply replication event to replica (on a lane connection when given)"""
+        if db is None:
+            if not self.is_connected:
+                self.logger.warning(f"Not connected to {self.config.name}, attempting reconnect...")
+                try:
+                    self.connect()
+                except:
+                    return False
+            db = self.db
         
         try:
             # Execute query
-            self.db.execute(event.query, event.params)
-            self.db.commit()
+            db.execute(event.query, event.params)
+            db.commit()
             
             self.logger.debug(f"Applied {event.operation} on {event.table} to {self.config.name}")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to apply event to {self.config.name}: {e}")
-            self.db.rollback()
+            self._rollback_quietly(db)
             return False
     
+    def _rollback_quietly(self, db: DatabaseInterface):
+        """Roll back after a failed apply; a broken connection must not escape the worker"""
+        try:
+            db.rollback()
+        except Exception as e:
+            self.logger.warning(f"Rollback failed on {self.config.name}: {e}")
+    
     def get_lag(self) -> float:
         """Get current replication lag in seconds"""
         if self.last_sync_time:
             return (datetime.now() - self.last_sync_time).total_seconds()
         return float('inf')
     
+    def get_staleness(self) -> float:
+        """
+        Seconds this replica trails the primary: zero when nothing is pending,
+        otherwise the age of the newest primary write it has applied
+        """
+        if self.event_queue.unfinished_tasks == 0:
+            return 0.0
+        if self.applied_through is None:
+            return float('inf')
+        return max(0.0, (datetime.now() - self.applied_through).total_seconds())
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get replica statistics"""
         return {
@@ -267,6 +1044,9 @@ class ReplicaManager:
             'enabled': self.config.enabled,
             'queue_size': self.event_queue.qsize(),
             'lag_seconds': round(self.get_lag(), 2),
+            'staleness_seconds': round(self.get_staleness(), 2),
+            'applied_sequence': self.applied_sequence,
+            'failed_sequence': self.failed_sequence,
             'stats': self.stats.to_dict()
         }
 
@@ -274,17 +1054,41 @@ class ReplicaManager:
 class DatabaseReplicationManager:
     """
     Main replication manager - orchestrates replication across multiple databases
+    
+    In SYNCHRONOUS and SEMI_SYNC modes execute() waits until every enabled
+    replica (or ``min_replicas_sync`` of them) has committed the event. If the
+    acks do not arrive within ``ack_timeout`` seconds, ``ack_timeout_policy``
+    decides: 'raise' raises ReplicationTimeoutError (the primary has already
+    committed), 'degrade' logs a warning and replicates asynchronously until
+    the replicas have drained their queues, then waits for acks again.
+    
+    SELECTs run on the primary unless ``read_routing`` is enabled. Routed
+    SELECTs are spread over healthy replicas whose staleness is within the
+    query's ``max_staleness`` (default: the replica's ``max_lag_seconds``),
+    each replica serving them on a read connection separate from its apply
+    worker. ``execute(..., return_token=True)`` returns the write's log
+    sequence; passing it as ``min_sequence`` restricts the read to replicas
+    that have applied it, falling back to the primary otherwise.
     """
     
+    ACK_TIMEOUT_POLICIES = ('degrade', 'raise')
+    
     def __init__(self, 
                  primary_config: ReplicaConfig,
                  replica_configs: List[ReplicaConfig],
                  mode: ReplicationMode = ReplicationMode.SYNCHRONOUS,
                  min_replicas_sync: int = 1,
-                 conflict_resolution: ConflictResolution = ConflictResolution.PRIMARY_WINS):
+                 conflict_resolution: ConflictResolution = ConflictResolution.PRIMARY_WINS,
+                 log_config: Optional[Dict[str, Any]] = None,
+                 ack_timeout: float = 5.0,
+                 ack_timeout_policy: str = 'degrade',
+                 read_routing: bool = False):
         
         self.logger = logging.getLogger('ReplicationManager')
         
+        if ack_timeout_policy not in self.ACK_TIMEOUT_POLICIES:
+            raise ValueError(f"Unsupported ack timeout policy: {ack_timeout_policy}")
+        
         # Set primary
         primary_config.role = ReplicaRole.PRIMARY
         self.primary = ReplicaManager(primary_config)
@@ -299,10 +1103,23 @@ class DatabaseReplicationManager:
         self.min_replicas_sync = min_replicas_sync
         self.conflict_resolution = conflict_resolution
         
-        self.replication_log = ReplicationLog()
+        self.replication_log = ReplicationLog(**(log_config or {}))
         self.is_active = False
         self._lock = threading.Lock()
         
+        # Acknowledgement protocol for SYNCHRONOUS / SEMI_SYNC modes
+        self.ack_timeout = ack_timeout
+        self.ack_timeout_policy = ack_timeout_policy
+        self.degraded = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ack_latencies = deque(maxlen=1000)
+        self.ack_stats = {'acked_writes': 0, 'ack_timeouts': 0, 'degraded_writes': 0}
+        
+        # Read routing
+        self.read_routing = read_routing
+        self._read_counter = itertools.count()
+        self.read_stats = {'primary_reads': 0, 'replica_reads': 0, 'token_fallbacks': 0}
+        
         self.logger.info(f"Initialized replication manager with {len(self.replicas)} replicas")
     
     def start(self):
@@ -312,9 +1129,15 @@ class DatabaseReplicationManager:
         # Connect to primary
         self.primary.connect()
         
-        # Connect to all replicas
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.replicas)),
+            thread_name_prefix='replication-fanout'
+        )
+        
+        # Connect to all replicas; each is taken to be in sync with the log it starts from
         for name, replica in self.replicas.items():
             try:
+                replica.mark_synced(self.replication_log.last_sequence)
                 replica.connect()
                 replica.start_worker()
             except Exception as e:
@@ -334,16 +1157,25 @@ class DatabaseReplicationManager:
             replica.stop_worker()
             replica.disconnect()
         
+        self.replication_log.close()
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
         # Disconnect primary
         self.primary.disconnect()
         
         self.logger.info("Replication system stopped")
     
     def execute(self, query: str, params: Optional[tuple] = None, 
-                table: Optional[str] = None) -> Any:
+                table: Optional[str] = None, return_token: bool = False) -> Any:
         """
         Execute query on primary and replicate to all replicas
         This is the main method to use for all database operations
+        
+        With return_token=True the log sequence of the write is returned
+        instead of the driver result, for use as a read-your-writes token.
         """
         if not self.is_active:
             raise RuntimeError("Replication system not started")
@@ -384,46 +1216,69 @@ class DatabaseReplicationManager:
         elif self.mode == ReplicationMode.SEMI_SYNC:
             self._replicate_semi_sync(event)
         
-        return result
+        return event.sequence if return_token else result
     
     def execute_query(self, query: str, params: Optional[tuple] = None,
-                     fetch: str = 'none', table: Optional[str] = None) -> Any:
+                     fetch: str = 'none', table: Optional[str] = None,
+                     max_staleness: Optional[float] = None,
+                     min_sequence: Optional[int] = None) -> Any:
         """
         Execute query with fetch options (none, one, all)
+        
+        SELECTs run on a replica within `max_staleness` seconds of the primary
+        that has applied `min_sequence` (a token from execute), or on the
+        primary when no replica qualifies.
         """
-        # For SELECT queries, read from primary only
         if query.strip().upper().startswith('SELECT'):
+            target = self._route_read(max_staleness, min_sequence)
+            db = self.primary.db
+            if target is not self.primary:
+                try:
+                    db = target.get_read_db()
+                except Exception as e:
+                    self.logger.warning(f"Read connection to {target.config.name} failed, using primary: {e}")
             if fetch == 'one':
-                return self.primary.db.fetch_one(query, params)
+                return db.fetch_one(query, params)
             elif fetch == 'all':
-                return self.primary.db.fetch_all(query, params)
+                return db.fetch_all(query, params)
             else:
-                return self.primary.db.execute(query, params)
+                return db.execute(query, params)
         
         # For write operations, replicate
         return self.execute(query, params, table)
     
+    def _route_read(self, max_staleness: Optional[float] = None,
+                    min_sequence: Optional[int] = None) -> ReplicaManager:
+        """Pick a replica for a read (round-robin over eligible ones) or the primary"""
+        candidates = []
+        if self.read_routing and self.is_active:
+            for replica in self.replicas.values():
+                if not (replica.config.enabled and replica.is_connected):
+                    continue
+                bound = max_staleness if max_staleness is not None else replica.config.max_lag_seconds
+                if replica.get_staleness() > bound:
+                    continue
+                if min_sequence is not None and replica.applied_sequence < min_sequence:
+                    continue
+                candidates.append(replica)
+        
+        with self._lock:
+            if candidates:
+                self.read_stats['replica_reads'] += 1
+                return candidates[next(self._read_counter) % len(candidates)]
+            self.read_stats['primary_reads'] += 1
+            if min_sequence is not None and self.read_routing and self.replicas:
+                self.read_stats['token_fallbacks'] += 1
+        return self.primary
+    
     def _replicate_synchronous(self, event: ReplicationEvent):
-        """Synchronous replication - wait for all replicas"""
+        """Synchronous replication - wait for all replicas to commit"""
         enabled_replicas = [r for r in self.replicas.values() if r.config.enabled]
         
         if not enabled_replicas:
             return
         
-        with ThreadPoolExecutor(max_workers=len(enabled_replicas)) as executor:
-            futures = {
-                executor.submit(replica.enqueue_event, event): replica.config.name
-                for replica in enabled_replicas
-            }
-            
-            for future in as_completed(futures, timeout=30):
-                replica_name = futures[future]
-                try:
-                    success = future.result()
-                    if success:
-                        self.logger.debug(f"Event queued to {replica_name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to queue event to {replica_name}: {e}")
+        self._replicate_with_acks(event, enabled_replicas, len(enabled_replicas))
     
     def _replicate_asynchronous(self, event: ReplicationEvent):
         """Asynchronous replication - don't wait"""
@@ -432,24 +1287,100 @@ class DatabaseReplicationManager:
                 replica.enqueue_event(event)
     
     def _replicate_semi_sync(self, event: ReplicationEvent):
-        """Semi-synchronous - wait for minimum N replicas"""
+        """Semi-synchronous - wait for minimum N replicas to commit"""
         enabled_replicas = [r for r in self.replicas.values() if r.config.enabled]
         
         if not enabled_replicas:
             return
         
+        if len(enabled_replicas) < self.min_replicas_sync:
+            self.logger.warning(
+                f"Only {len(enabled_replicas)}/{self.min_replicas_sync} replicas available for semi-sync"
+            )
+        
         # Sort by priority
         enabled_replicas.sort(key=lambda r: r.config.priority)
+        required = min(self.min_replicas_sync, len(enabled_replicas))
+        self._replicate_with_acks(event, enabled_replicas, required)
+    
+    def _replicate_with_acks(self, event: ReplicationEvent,
+                             replicas: List[ReplicaManager], required: int):
+        """Fan the event out and wait for `required` commit acknowledgements"""
+        if self.degraded:
+            if not self._replicas_caught_up(replicas):
+                for replica in replicas:
+                    replica.enqueue_event(event)
+                with self._lock:
+                    self.ack_stats['degraded_writes'] += 1
+                return
+            self.degraded = False
+            self.logger.info("Replicas caught up, resuming acknowledged replication")
         
-        synced_count = 0
-        for replica in enabled_replicas:
-            if replica.enqueue_event(event):
-                synced_count += 1
-                if synced_count >= self.min_replicas_sync:
-                    break
+        started = time.monotonic()
+        acks: Dict[Future, str] = {}
+        for replica in replicas:
+            ack: Future = Future()
+            acks[ack] = replica.config.name
+            if self._executor is not None and len(replicas) > 1:
+                self._executor.submit(replica.enqueue_event, event, ack)
+            else:
+                replica.enqueue_event(event, ack)
+        
+        acked = 0
+        failed = 0
+        pending = set(acks)
+        deadline = started + self.ack_timeout
+        while pending and acked < required and len(replicas) - failed >= required:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for ack in done:
+                if ack.result():
+                    acked += 1
+                else:
+                    failed += 1
+                    self.logger.warning(f"Replica {acks[ack]} failed to apply event {event.event_id}")
+        
+        if acked >= required:
+            with self._lock:
+                self._ack_latencies.append((time.monotonic() - started) * 1000)
+                self.ack_stats['acked_writes'] += 1
+            return
         
-        if synced_count < self.min_replicas_sync:
-            self.logger.warning(f"Only {synced_count}/{self.min_replicas_sync} replicas synced")
+        self._handle_missing_acks(event, acked, required, [acks[a] for a in pending])
+    
+    def _handle_missing_acks(self, event: ReplicationEvent, acked: int, required: int,
+                             waiting_on: List[str]):
+        """Apply the ack timeout policy when a write did not reach its quorum"""
+        with self._lock:
+            self.ack_stats['ack_timeouts'] += 1
+        message = (f"Event {event.event_id} acknowledged by {acked}/{required} replicas "
+                   f"within {self.ack_timeout}s (waiting on: {', '.join(waiting_on) or 'none'})")
+        
+        if self.ack_timeout_policy == 'raise':
+            raise ReplicationTimeoutError(message)
+        
+        self.degraded = True
+        self.logger.warning(f"{message}; degrading to asynchronous replication until replicas catch up")
+    
+    @staticmethod
+    def _replicas_caught_up(replicas: List[ReplicaManager]) -> bool:
+        """True once every replica has applied everything queued to it"""
+        return all(r.event_queue.unfinished_tasks == 0 for r in replicas)
+    
+    def get_ack_latency_percentiles(self) -> Dict[str, Optional[float]]:
+        """p50/p95/p99 of the time writes spent waiting for replica acks (ms)"""
+        with self._lock:
+            ordered = sorted(self._ack_latencies)
+        result: Dict[str, Optional[float]] = {}
+        for percentile in (50, 95, 99):
+            if not ordered:
+                result[f'p{percentile}'] = None
+                continue
+            index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+            result[f'p{percentile}'] = round(ordered[index], 2)
+        return result
     
     def _get_operation_type(self, query: str) -> str:
         """Extract operation type from query"""
@@ -501,7 +1432,11 @@ class DatabaseReplicationManager:
                 for name, replica in self.replicas.items()
             },
             'total_replicas': len(self.replicas),
-            'healthy_replicas': sum(1 for r in self.replicas.values() if r.is_connected)
+            'healthy_replicas': sum(1 for r in self.replicas.values() if r.is_connected),
+            'degraded': self.degraded,
+            'ack_stats': dict(self.ack_stats),
+            'ack_latency_ms': self.get_ack_latency_percentiles(),
+            'read_stats': dict(self.read_stats)
         }
     
     def promote_replica(self, replica_name: str):
@@ -537,23 +1472,44 @@ class ReplicatedDatabase:
     """
     Easy-to-use wrapper for replicated database operations
     Usage is identical to regular database operations
+    
+    With read_your_writes=True, execute() returns the write's sequence token
+    and later reads only use replicas that have applied this wrapper's most
+    recent write.
     """
     
-    def __init__(self, replication_manager: DatabaseReplicationManager):
+    def __init__(self, replication_manager: DatabaseReplicationManager,
+                 read_your_writes: bool = False, max_staleness: Optional[float] = None):
         self.manager = replication_manager
         self.logger = logging.getLogger('ReplicatedDatabase')
+        self.read_your_writes = read_your_writes
+        self.max_staleness = max_staleness
+        self.last_token: Optional[int] = None
     
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
         """Execute write query (INSERT, UPDATE, DELETE)"""
-        return self.manager.execute(query, params)
+        if not self.read_your_writes:
+            return self.manager.execute(query, params)
+        token = self.manager.execute(query, params, return_token=True)
+        if token is not None and (self.last_token is None or token > self.last_token):
+            self.last_token = token
+        return token
     
-    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+    def fetch_one(self, query: str, params: Optional[tuple] = None,
+                  max_staleness: Optional[float] = None) -> Optional[Dict]:
         """Fetch single row"""
-        return self.manager.execute_query(query, params, fetch='one')
+        return self.manager.execute_query(query, params, fetch='one', **self._read_options(max_staleness))
     
-    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+    def fetch_all(self, query: str, params: Optional[tuple] = None,
+                  max_staleness: Optional[float] = None) -> List[Dict]:
         """Fetch all rows"""
-        return self.manager.execute_query(query, params, fetch='all')
+        return self.manager.execute_query(query, params, fetch='all', **self._read_options(max_staleness))
+    
+    def _read_options(self, max_staleness: Optional[float]) -> Dict[str, Any]:
+        return {
+            'max_staleness': max_staleness if max_staleness is not None else self.max_staleness,
+            'min_sequence': self.last_token if self.read_your_writes else None
+        }
     
     def commit(self):
         """Commit (handled automatically)"""
@@ -0,0 +1,196 @@
+"""
+Test suite for the asyncio database layer
+Run with: pytest test_database_async.py -v
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import shutil
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+# Add the root directory (3 levels up) to Python path
+root_dir = os.path.join(os.path.dirname(__file__), '../../..')
+sys.path.insert(0, root_dir)
+
+from nexus.database.database_management import IsolationLevel
+from nexus.database.database_async import (
+    AsyncDatabaseManager, AsyncConnectionPool, AsyncSQLiteDatabase,
+    ThreadOffloadDatabase, _to_numeric_placeholders
+)
+
+
+class TestAsyncDatabaseManager(unittest.TestCase):
+    """Tests for AsyncDatabaseManager using the thread-offload path on SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.params = {'database': os.path.join(self.temp_dir, 'async.db')}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _manager(self, **kwargs):
+        return AsyncDatabaseManager('sqlite', self.params, prefer_native=False,
+                                    pool_config={'min_size': 1, 'max_size': 4}, **kwargs)
+
+    def test_execute_and_fetch(self):
+        """Test 1: Execute and fetch through the async manager"""
+        async def run():
+            async with self._manager() as db:
+                await db.execute_query("CREATE TABLE users (id INTEGER, name TEXT)")
+                ok = await db.execute_transaction([
+                    ("INSERT INTO users VALUES (?, ?)", (1, 'John')),
+                    ("INSERT INTO users VALUES (?, ?)", (2, 'Jane')),
+                ])
+                one = await db.execute_query("SELECT * FROM users WHERE id = ?", (2,), fetch='one')
+                rows = await db.execute_query("SELECT * FROM users ORDER BY id", fetch='all')
+                return ok, one, rows
+
+        ok, one, rows = asyncio.run(run())
+        assert ok is True
+        assert one == {'id': 2, 'name': 'Jane'}
+        assert [r['name'] for r in rows] == ['John', 'Jane']
+
+    def test_transaction_rollback(self):
+        """Test 2: Failed transaction rolls back and returns False"""
+        async def run():
+            async with self._manager() as db:
+                await db.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+                ok = await db.execute_transaction([
+                    ("INSERT INTO t VALUES (?)", (1,)),
+                    ("INSERT INTO missing VALUES (?)", (2,)),
+                ], IsolationLevel.SERIALIZABLE)
+                rows = await db.execute_query("SELECT * FROM t", fetch='all')
+                return ok, rows
+
+        ok, rows = asyncio.run(run())
+        assert ok is False
+        assert rows == []
+
+    def test_concurrency_bounded_by_pool(self):
+        """Test 3: Many concurrent queries share a bounded set of threads"""
+        thread_names = set()
+
+        async def run():
+            async with self._manager() as db:
+                original = ThreadOffloadDatabase._run
+
+                async def tracking_run(conn, func, *args):
+                    def wrapped(*a):
+                        thread_names.add(threading.current_thread().name)
+                        return func(*a)
+                    return await original(conn, wrapped, *args)
+
+                with patch.object(ThreadOffloadDatabase, '_run', tracking_run):
+                    results = await asyncio.gather(*[
+                        db.execute_query("SELECT ? AS n", (i,), fetch='one')
+                        for i in range(200)
+                    ])
+                return results, db.pool.get_stats()
+
+        results, stats = asyncio.run(run())
+        assert sorted(r['n'] for r in results) == list(range(200))
+        assert stats['active_connections'] <= 4
+        assert len(thread_names) <= 4
+
+    def test_health_check_and_metrics(self):
+        """Test 4: Health check structure and shared metrics"""
+        async def run():
+            async with self._manager() as db:
+                await db.execute_query("SELECT 1", fetch='one')
+                return await db.health_check(), db.get_metrics()
+
+        health, metrics = asyncio.run(run())
+        assert health['status'] == 'healthy'
+        assert health['driver'] == 'thread_offload'
+        assert 'pool_stats' in health
+        assert metrics['query_metrics']['total_queries'] >= 1
+
+    def test_without_pool(self):
+        """Test 5: Manager without pooling opens a connection per call"""
+        async def run():
+            db = self._manager(use_pool=False)
+            result = await db.execute_query("SELECT 42 AS answer", fetch='one')
+            await db.close()
+            return result
+
+        assert asyncio.run(run()) == {'answer': 42}
+
+    def test_unsupported_database(self):
+        """Test 6: Unsupported database type raises ValueError"""
+        with self.assertRaises(ValueError):
+            AsyncDatabaseManager('unsupported_db', {})
+
+    def test_native_driver_selection(self):
+        """Test 7: Native driver chosen when installed, offload otherwise"""
+        with patch('nexus.database.database_async.importlib.util.find_spec', return_value=Mock()):
+            manager = AsyncDatabaseManager('sqlite', self.params)
+            assert manager.native is True
+            assert isinstance(manager._create_connection(), AsyncSQLiteDatabase)
+
+        with patch('nexus.database.database_async.importlib.util.find_spec', return_value=None):
+            manager = AsyncDatabaseManager('sqlite', self.params)
+            assert manager.native is False
+            assert isinstance(manager._create_connection(), ThreadOffloadDatabase)
+            manager._executor.shutdown()
+
+        # MySQL has no async driver mapping and always offloads
+        manager = AsyncDatabaseManager('mysql', {'database': 'x', 'user': 'u', 'password': 'p'})
+        assert manager.native is False
+        manager._executor.shutdown()
+
+
+class TestAsyncConnectionPool(unittest.TestCase):
+    """Tests for AsyncConnectionPool"""
+
+    def _factory(self):
+        conn = Mock()
+
+        async def noop(*args, **kwargs):
+            return None
+
+        conn.connect = noop
+        conn.disconnect = noop
+        return conn
+
+    def test_pool_exhaustion_timeout(self):
+        """Test 8: Waiting on an exhausted pool times out"""
+        async def run():
+            pool = AsyncConnectionPool(self._factory, min_size=0, max_size=1)
+            await pool.get_connection()
+            with self.assertRaises(TimeoutError):
+                await pool.get_connection(timeout=0.05)
+
+        asyncio.run(run())
+
+    def test_pool_reuses_released_connections(self):
+        """Test 9: Released connections are reused instead of recreated"""
+        async def run():
+            pool = AsyncConnectionPool(self._factory, min_size=1, max_size=2)
+            await pool.initialize()
+            async with pool.acquire() as first:
+                pass
+            async with pool.acquire() as second:
+                pass
+            return first, second, pool.get_stats()
+
+        first, second, stats = asyncio.run(run())
+        assert first is second
+        assert stats['active_connections'] == 1
+
+
+class TestPlaceholderConversion(unittest.TestCase):
+    """Tests for DB-API to asyncpg placeholder conversion"""
+
+    def test_numeric_placeholders(self):
+        """Test 10: %s placeholders become $1..$n"""
+        query = "SELECT * FROM t WHERE a = %s AND b = %s"
+        assert _to_numeric_placeholders(query) == "SELECT * FROM t WHERE a = $1 AND b = $2"
+
+
+if __name__ == '__main__':
+    unittest.main()
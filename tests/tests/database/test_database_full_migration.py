@@ -9,6 +9,7 @@ from datetime import datetime
 import json
 import tempfile
 import os
+import shutil
 import sys
 from dataclasses import asdict
 import threading
@@ -18,21 +19,39 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 
 # Add the root directory to Python path
-root_dir = os.path.join(os.path.dirname(__file__), '../../..')
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../..')
 sys.path.insert(0, root_dir)
 
+# The migration modules write their log files (and reports) into the working
+# directory, so imports and tests run from a scratch directory
+OUTPUT_DIR = tempfile.mkdtemp(prefix='nexus-migration-tests-')
+ORIGINAL_CWD = os.getcwd()
+
 # Import classes to test
-from nexus.database.database_full_migration import (
-    SchemaExtractor,
-    SchemaCreator,
-    FullDatabaseMigration,
-    TableMetadata,
-    DatabaseSchema,
-    FullMigrationConfig,
-    FullMigrationStats,
-    MigrationPhase
-)
-from nexus.database.database_simple_migration import MigrationStrategy
+os.chdir(OUTPUT_DIR)
+try:
+    from nexus.database.database_full_migration import (
+        SchemaExtractor,
+        SchemaCreator,
+        FullDatabaseMigration,
+        TableMetadata,
+        DatabaseSchema,
+        FullMigrationConfig,
+        FullMigrationStats,
+        MigrationPhase
+    )
+    from nexus.database.database_simple_migration import MigrationStrategy
+finally:
+    os.chdir(ORIGINAL_CWD)
+
+
+def setUpModule():
+    os.chdir(OUTPUT_DIR)
+
+
+def tearDownModule():
+    os.chdir(ORIGINAL_CWD)
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
 
 
 class TestSchemaExtractor(unittest.TestCase):
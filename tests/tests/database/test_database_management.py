@@ -10,8 +10,14 @@ import unittest
 from unittest.mock import Mock, MagicMock, patch, call
 import threading
 import time
+import tempfile
+import shutil
+import gzip
+import json
+import sqlite3
 from datetime import datetime
 from queue import Queue, Empty
+from contextlib import contextmanager
 
 # Add the root directory (3 levels up) to Python path
 root_dir = os.path.join(os.path.dirname(__file__), '../../..')
@@ -23,7 +29,12 @@ from nexus.database.database_management import (
     PostgreSQLDatabase, MySQLDatabase, SQLiteDatabase, MongoDBDatabase,
     OracleDatabase, SQLServerDatabase, RedisDatabase, CassandraDatabase,
     ElasticsearchDatabase, MariaDBDatabase, DatabaseManager, DatabaseFactory,
-    bulk_insert, export_to_json, migrate_data
+    PreparedStatementCache, SlowQueryExplainer, ReplicaRouter, fingerprint_query,
+    is_read_only_query, QueryResultCache, referenced_tables,
+    AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitState, is_connection_error,
+    ConcurrencyLimitExceeded, CircuitOpenError, HedgePolicy,
+    bulk_insert, export_to_json, migrate_data, _to_numeric_placeholders,
+    stream_export, stream_migrate, _group_statements, _HedgeAttempt
 )
 
 
@@ -655,5 +666,1240 @@ class TestUtilityFunctions(unittest.TestCase):
         assert count == 2
 
 
+class TestPreparedStatementCache(unittest.TestCase):
+    """Tests for the per-connection prepared statement cache"""
+    
+    def _pg(self, **extra):
+        params = {'database': 'test', 'user': 'user', 'password': 'pass', **extra}
+        db = PostgreSQLDatabase(params)
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = {'id': 1}
+        mock_conn = Mock()
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=False)
+        db.connection = mock_conn
+        return db, mock_cursor
+    
+    def test_lru_eviction_deallocates(self):
+        """Test 51: Least recently used statement is evicted and released"""
+        evicted = []
+        cache = PreparedStatementCache(max_size=2, on_evict=evicted.append)
+        cache.put("q1", "h1")
+        cache.put("q2", "h2")
+        cache.lookup("q1")
+        cache.put("q3", "h3")
+        
+        assert "q2" not in cache
+        assert "q1" in cache and "q3" in cache
+        assert evicted == ["h2"]
+    
+    def test_postgresql_prepares_once(self):
+        """Test 52: Repeated PostgreSQL statements reuse one server-side PREPARE"""
+        db, cursor = self._pg()
+        query = "SELECT * FROM users WHERE id = %s"
+        
+        db.fetch_one(query, (1,))
+        db.fetch_one(query, (2,))
+        
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        prepares = [q for q in statements if 'PREPARE nexus_stmt_' in q]
+        executes = [q for q in statements if q.startswith('EXECUTE nexus_stmt_')]
+        assert len(prepares) == 1
+        assert 'WHERE id = $1' in prepares[0]
+        assert len(executes) == 2
+        
+        stats = db.get_metrics()
+        assert stats['statement_cache_hits'] == 1
+        assert stats['statement_cache_misses'] == 1
+        assert stats['statement_cache_hit_rate'] == 0.5
+    
+    def test_postgresql_unpreparable_falls_back(self):
+        """Test 53: A failed PREPARE rolls back to a savepoint and runs plain SQL"""
+        db, cursor = self._pg()
+        
+        def execute(sql, params=None):
+            if 'PREPARE' in sql and 'SAVEPOINT nexus_prepare;' in sql and 'ROLLBACK' not in sql:
+                raise Exception("could not determine data type of parameter $1")
+        cursor.execute.side_effect = execute
+        
+        db.fetch_one("SELECT %s AS value", (1,))
+        db.fetch_one("SELECT %s AS value", (1,))
+        
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert any(q.startswith('ROLLBACK TO SAVEPOINT') for q in statements)
+        assert statements.count("SELECT %s AS value") == 2
+        assert sum('PREPARE' in q for q in statements) == 1
+    
+    def test_postgresql_declares_parameter_types(self):
+        """Test 105: PREPARE declares literal types and caches per type signature"""
+        db, cursor = self._pg()
+        query = "SELECT * FROM events WHERE id = %s AND created > %s"
+        
+        db.fetch_one(query, (1, 'yesterday'))
+        db.fetch_one(query, (1.5, datetime(2025, 1, 1)))
+        db.fetch_one(query, (2, 'today'))
+        db.fetch_one(query, ([1, 2], 'today'))
+        
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        prepares = [q for q in statements if 'PREPARE nexus_stmt_' in q]
+        assert len(prepares) == 2
+        assert '(bigint, unknown) AS' in prepares[0]
+        assert '(numeric, timestamp) AS' in prepares[1]
+        assert query in statements  # list parameter ran unprepared
+    
+    def test_postgresql_explicit_prepare_is_reused(self):
+        """Test 113: A statement from prepare(query) is executed by later calls, not prepared again"""
+        db, cursor = self._pg()
+        query = "SELECT * FROM users WHERE id = %s"
+        
+        name = db.prepare(query)
+        db.fetch_one(query, (1,))
+        db.execute(query, (2,))
+        
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert sum('PREPARE nexus_stmt_' in q for q in statements) == 1
+        assert statements.count(f"EXECUTE {name} (%s)") == 2
+    
+    def test_cache_disabled_and_unparameterized(self):
+        """Test 54: Disabled cache or queries without params use plain execution"""
+        db, cursor = self._pg(statement_cache_size=0)
+        db.execute("UPDATE users SET active = %s", (True,))
+        
+        db2, cursor2 = self._pg()
+        db2.execute("DELETE FROM sessions")
+        db2.execute("CREATE TABLE t (id INT)", (1,))
+        
+        assert cursor.execute.call_args_list == [call("UPDATE users SET active = %s", (True,))]
+        assert all('PREPARE' not in c.args[0] for c in cursor2.execute.call_args_list)
+        assert len(db2.statement_cache) == 0
+    
+    def test_mysql_reuses_prepared_cursor(self):
+        """Test 55: MySQL keeps one prepared cursor per statement"""
+        db = MySQLDatabase({'database': 'test', 'user': 'user', 'password': 'pass'})
+        prepared_cursor = Mock()
+        prepared_cursor.column_names = ('id', 'name')
+        prepared_cursor.fetchall.return_value = [(1, 'John')]
+        db.connection = Mock()
+        db.connection.cursor.return_value = prepared_cursor
+        
+        first = db.fetch_all("SELECT id, name FROM users WHERE id = %s", (1,))
+        second = db.fetch_all("SELECT id, name FROM users WHERE id = %s", (1,))
+        
+        db.connection.cursor.assert_called_once_with(prepared=True)
+        assert first == second == [{'id': 1, 'name': 'John'}]
+    
+    def test_explicit_prepare_cassandra(self):
+        """Test 56: Explicit prepare() caches the native Cassandra statement"""
+        db = CassandraDatabase({'keyspace': 'ks'})
+        db.connection = Mock()
+        db.connection.execute.return_value = []
+        
+        handle = db.prepare("SELECT * FROM users WHERE id = %s")
+        db.fetch_all("SELECT * FROM users WHERE id = %s", (1,))
+        
+        db.connection.prepare.assert_called_once_with("SELECT * FROM users WHERE id = ?")
+        db.connection.execute.assert_called_once_with(handle, (1,))
+    
+    def test_numeric_placeholders(self):
+        """Test 57: Placeholder conversion keeps escaped percent signs and skips quoted literals"""
+        query = "SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c = %s"
+        assert _to_numeric_placeholders(query) == "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = $2"
+        assert (_to_numeric_placeholders("SELECT '%s', 'it''s %s' FROM t WHERE a = %s")
+                == "SELECT '%s', 'it''s %s' FROM t WHERE a = $1")
+
+
+class TestFetchIter(unittest.TestCase):
+    """Tests for streaming fetch_iter implementations"""
+    
+    def test_sqlite_streams_in_batches(self):
+        """Test 58: SQLite fetch_iter yields every row using fetchmany batches"""
+        db = SQLiteDatabase({'database': ':memory:'})
+        db.connect()
+        db.execute("CREATE TABLE items (id INTEGER)")
+        db.execute_many("INSERT INTO items VALUES (?)", [(i,) for i in range(2500)])
+        
+        rows = db.fetch_iter("SELECT id FROM items ORDER BY id", batch_size=1000)
+        assert next(rows) == {'id': 0}
+        assert sum(1 for _ in rows) == 2499
+        db.disconnect()
+    
+    def test_postgresql_named_cursor(self):
+        """Test 59: PostgreSQL fetch_iter uses a named server-side cursor"""
+        db = PostgreSQLDatabase({'database': 'test', 'user': 'user', 'password': 'pass'})
+        cursor = Mock()
+        cursor.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+        db.connection = Mock()
+        db.connection.cursor.return_value = cursor
+        
+        with patch.dict(sys.modules, {'psycopg2': Mock(), 'psycopg2.extras': Mock()}):
+            rows = list(db.fetch_iter("SELECT * FROM big", batch_size=2))
+        
+        assert rows == [{'id': 1}, {'id': 2}, {'id': 3}]
+        assert db.connection.cursor.call_args.kwargs['name'].startswith('nexus_iter_')
+        assert cursor.itersize == 2
+        cursor.close.assert_called_once()
+    
+    def test_mongodb_cursor_batching(self):
+        """Test 60: MongoDB fetch_iter passes batch_size to the cursor"""
+        db = MongoDBDatabase({'uri': 'mongodb://localhost', 'database': 'test'})
+        collection = Mock()
+        collection.find.return_value = MagicMock()
+        collection.find.return_value.__iter__.return_value = iter([{'a': 1}, {'a': 2}])
+        db.connection = MagicMock()
+        db.connection.__getitem__.return_value = collection
+        
+        assert list(db.fetch_iter('users', {'active': True}, batch_size=500)) == [{'a': 1}, {'a': 2}]
+        collection.find.assert_called_once_with({'active': True}, batch_size=500)
+    
+    def test_elasticsearch_search_after(self):
+        """Test 61: Elasticsearch fetch_iter pages with a point-in-time and search_after"""
+        db = ElasticsearchDatabase({'host': 'localhost'})
+        db.connection = Mock()
+        db.connection.open_point_in_time.return_value = {'id': 'pit-1'}
+        db.connection.search.side_effect = [
+            {'pit_id': 'pit-2', 'hits': {'hits': [
+                {'_source': {'n': 1}, 'sort': [1]}, {'_source': {'n': 2}, 'sort': [2]}
+            ]}},
+            {'pit_id': 'pit-3', 'hits': {'hits': [{'_source': {'n': 3}, 'sort': [3]}]}},
+        ]
+        
+        docs = list(db.fetch_iter('logs', batch_size=2))
+        
+        assert docs == [{'n': 1}, {'n': 2}, {'n': 3}]
+        second_body = db.connection.search.call_args_list[1].kwargs['body']
+        assert second_body['search_after'] == [2]
+        assert second_body['pit']['id'] == 'pit-2'
+        db.connection.close_point_in_time.assert_called_once_with(body={'id': 'pit-3'})
+    
+    def test_cassandra_paging_state(self):
+        """Test 62: Cassandra fetch_iter follows paging state across pages"""
+        db = CassandraDatabase({'keyspace': 'ks'})
+        row = Mock()
+        row._asdict.return_value = {'id': 1}
+        page1 = Mock(current_rows=[row], paging_state=b'next')
+        page2 = Mock(current_rows=[row], paging_state=None)
+        db.connection = Mock()
+        db.connection.execute.side_effect = [page1, page2]
+        
+        with patch.dict(sys.modules, {'cassandra': Mock(), 'cassandra.query': Mock()}):
+            rows = list(db.fetch_iter("SELECT * FROM events", batch_size=100))
+        
+        assert rows == [{'id': 1}, {'id': 1}]
+        assert db.connection.execute.call_args_list[1].kwargs['paging_state'] == b'next'
+    
+    def test_redis_scan_instead_of_keys(self):
+        """Test 63: Redis fetch_iter uses SCAN with batched MGET"""
+        db = RedisDatabase({'host': 'localhost'})
+        db.connection = Mock()
+        db.connection.scan_iter.return_value = iter(['k1', 'k2', 'k3'])
+        db.connection.mget.side_effect = [['v1', 'v2'], ['v3']]
+        
+        rows = list(db.fetch_iter('k*', batch_size=2))
+        
+        assert [r['key'] for r in rows] == ['k1', 'k2', 'k3']
+        db.connection.keys.assert_not_called()
+        assert db.metrics.query_count == 1
+
+
+class TestSlowQueryExplain(unittest.TestCase):
+    """Tests for automatic EXPLAIN capture of slow queries"""
+    
+    def test_fingerprint_ignores_literals(self):
+        """Test 64: Queries differing only in literal values share a fingerprint"""
+        a = fingerprint_query("SELECT * FROM users WHERE id = 5 AND name = 'bob'")
+        b = fingerprint_query("select *  from users where id = 42 and name = 'alice'")
+        c = fingerprint_query("SELECT * FROM orders WHERE id = 5")
+        assert a == b
+        assert a != c
+        assert fingerprint_query("SELECT 1 WHERE x IN (1, 2, 3)") == fingerprint_query("SELECT 1 WHERE x IN (7)")
+    
+    def test_slow_record_has_fingerprint(self):
+        """Test 65: Slow query records carry a fingerprint and honour the threshold"""
+        metrics = DatabaseMetrics(slow_query_threshold=0.5)
+        metrics.record_query("SELECT * FROM t WHERE id = 1", 0.6)
+        metrics.record_query("SELECT * FROM t WHERE id = 2", 0.4)
+        assert len(metrics.slow_queries) == 1
+        assert metrics.slow_queries[0]['fingerprint'] == fingerprint_query("SELECT * FROM t WHERE id = 9")
+    
+    def test_sqlite_plan_captured_in_background(self):
+        """Test 66: SQLite slow queries get an EXPLAIN QUERY PLAN attached"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            params = {
+                'database': os.path.join(temp_dir, 'explain.db'),
+                'slow_query_threshold': 0.0,
+                'explain_slow_queries': True
+            }
+            db = SQLiteDatabase(params)
+            db.connect()
+            db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            db.commit()
+            
+            db.fetch_all("SELECT * FROM items WHERE id = ?", (1,))
+            db.explainer.queue.join()
+            
+            fingerprint = fingerprint_query("SELECT * FROM items WHERE id = ?")
+            plan = db.metrics.get_query_plan(fingerprint)
+            assert plan is not None
+            assert any('items' in str(row) for row in plan['plan'])
+            record = [r for r in db.metrics.slow_queries if r['fingerprint'] == fingerprint][0]
+            assert record['plan'] == plan['plan']
+            
+            db.disable_slow_query_explain()
+            db.disconnect()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_rate_limited_per_fingerprint(self):
+        """Test 67: A fingerprint is explained at most once per interval"""
+        explainer = SlowQueryExplainer(Mock(), "EXPLAIN", on_plan=Mock(), min_interval=60)
+        explainer._ensure_worker = Mock()
+        record = {'fingerprint': 'abc'}
+        
+        assert explainer.submit(record, "SELECT * FROM t WHERE id = 1") is True
+        assert explainer.submit(record, "SELECT * FROM t WHERE id = 2") is False
+        assert explainer.submit({'fingerprint': 'ddl'}, "CREATE TABLE x (id INT)") is False
+        assert explainer.queue.qsize() == 1
+    
+    def test_json_plan_normalized(self):
+        """Test 68: Single-cell JSON plans are decoded"""
+        conn = Mock()
+        conn.fetch_all.return_value = [{'EXPLAIN': '{"query_block": {"cost": 1}}'}]
+        explainer = SlowQueryExplainer(lambda: conn, "EXPLAIN FORMAT=JSON", on_plan=Mock())
+        
+        plan = explainer.explain("SELECT * FROM t WHERE id = %s", (1,))
+        
+        assert plan == {'query_block': {'cost': 1}}
+        conn.fetch_all.assert_called_once_with("EXPLAIN FORMAT=JSON SELECT * FROM t WHERE id = %s", (1,))
+        conn.rollback.assert_called_once()
+    
+    def test_unsupported_backend(self):
+        """Test 69: Backends without EXPLAIN refuse to enable capture"""
+        db = RedisDatabase({'host': 'localhost'})
+        assert db.enable_slow_query_explain() is False
+        assert db.explainer is None
+
+    def test_pool_shares_one_explainer(self):
+        """Test 106: Pooled connections share one explainer and close_all stops it"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            params = {
+                'database': os.path.join(temp_dir, 'pooled.db'),
+                'slow_query_threshold': 0.0,
+                'explain_slow_queries': True
+            }
+            pool = ConnectionPool(SQLiteDatabase, params, min_size=2, max_size=2)
+            first, second = pool.get_connection(), pool.get_connection()
+            assert first.explainer is pool.explainer
+            assert second.explainer is pool.explainer
+
+            first.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+            first.commit()
+            second.fetch_all("SELECT * FROM items WHERE id = ?", (1,))
+            pool.explainer.queue.join()
+            fingerprint = fingerprint_query("SELECT * FROM items WHERE id = ?")
+            assert second.metrics.get_query_plan(fingerprint) is not None
+
+            pool.release_connection(first)
+            pool.release_connection(second)
+            pool.close_all()
+            assert pool.explainer._worker is None
+            assert pool.explainer._connection is None
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+    """Tests for read/write splitting across a primary and read replicas"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = {}
+        for name in ('primary', 'replica_a', 'replica_b'):
+            path = os.path.join(self.temp_dir, f'{name}.db')
+            db = SQLiteDatabase({'database': path})
+            db.connect()
+            db.execute("CREATE TABLE source (name TEXT)")
+            db.execute("INSERT INTO source VALUES (?)", (name,))
+            db.commit()
+            db.disconnect()
+            self.paths[name] = path
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _manager(self, replicas=('replica_a',)):
+        return DatabaseManager(
+            'sqlite', {'database': self.paths['primary']},
+            pool_config={'min_size': 1, 'max_size': 4},
+            replicas=[{'name': name, 'database': self.paths[name]} for name in replicas],
+            replica_health_interval=0
+        )
+    
+    def test_read_only_classification(self):
+        """Test 70: Only pure reads are classified as replica-safe"""
+        assert is_read_only_query("SELECT * FROM users WHERE name = 'update me'")
+        assert is_read_only_query("  WITH t AS (SELECT 1) SELECT * FROM t")
+        assert not is_read_only_query("SELECT * FROM users FOR UPDATE")
+        assert not is_read_only_query("SELECT * INTO backup FROM users")
+        assert not is_read_only_query("WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d")
+        assert not is_read_only_query("INSERT INTO t VALUES (1) RETURNING id")
+    
+    def test_reads_to_replica_writes_to_primary(self):
+        """Test 71: SELECTs hit the replica while writes stay on the primary"""
+        manager = self._manager()
+        try:
+            row = manager.execute_query("SELECT name FROM source", fetch='one')
+            assert row['name'] == 'replica_a'
+            
+            manager.execute_query("INSERT INTO source VALUES (?)", ('written',))
+            rows = manager.execute_query("SELECT name FROM source", fetch='all')
+            assert [r['name'] for r in rows] == ['replica_a']
+            
+            primary = manager.execute_query(
+                "INSERT INTO source VALUES (?) RETURNING name", ('returned',), fetch='one'
+            )
+            assert primary['name'] == 'returned'
+        finally:
+            manager.close()
+    
+    def test_transaction_pins_to_primary(self):
+        """Test 72: Reads inside an open transaction use the primary connection"""
+        manager = self._manager()
+        try:
+            with manager.transaction():
+                manager.execute_query("INSERT INTO source VALUES (?)", ('pending',))
+                rows = manager.execute_query("SELECT name FROM source ORDER BY rowid", fetch='all')
+            assert [r['name'] for r in rows] == ['primary', 'pending']
+            
+            with manager.transaction(read_only=True) as conn:
+                assert conn.fetch_one("SELECT name FROM source")['name'] == 'replica_a'
+            
+            assert manager.execute_transaction([("SELECT 1", None)], read_only=True) is True
+        finally:
+            manager.close()
+    
+    def test_least_outstanding_balancing(self):
+        """Test 73: The replica with fewer requests in flight is chosen"""
+        manager = self._manager(replicas=('replica_a', 'replica_b'))
+        try:
+            router = manager.router
+            busy = router.choose()
+            other = router.choose()
+            assert busy is not other
+            
+            router.release(other)
+            for _ in range(3):
+                chosen = router.choose()
+                assert chosen is other
+                router.release(chosen)
+            router.release(busy)
+        finally:
+            manager.close()
+    
+    def test_unhealthy_replica_ejected_and_readmitted(self):
+        """Test 74: Failing health checks eject a replica until it recovers"""
+        manager = self._manager()
+        try:
+            node = manager.router.nodes[0]
+            with patch.object(node.manager, 'health_check',
+                              return_value={'status': 'unhealthy', 'error': 'down'}):
+                health = manager.health_check()
+            
+            assert health['replicas'] == {'replica_a': 'unhealthy'}
+            assert node.healthy is False
+            row = manager.execute_query("SELECT name FROM source", fetch='one')
+            assert row['name'] == 'primary'
+            
+            manager.router.check_health()
+            assert node.healthy is True
+            stats = manager.get_metrics()['replica_stats'][0]
+            assert stats['name'] == 'replica_a' and stats['outstanding_requests'] == 0
+        finally:
+            manager.close()
+    
+    def test_replica_connection_failure_falls_back(self):
+        """Test 75: A replica that cannot hand out connections is ejected for that read"""
+        manager = self._manager()
+        try:
+            node = manager.router.nodes[0]
+            with patch.object(node.manager, 'get_connection', side_effect=Exception("refused")):
+                row = manager.execute_query("SELECT name FROM source", fetch='one')
+            assert row['name'] == 'primary'
+            assert node.healthy is False
+            assert node.outstanding == 0
+        finally:
+            manager.close()
+
+
+class TestBatchExecute(unittest.TestCase):
+    """Tests for statement-grouped batch execution"""
+    
+    def test_group_consecutive_statements(self):
+        """Test 76: Only consecutive identical statements with params are grouped"""
+        insert = "INSERT INTO t VALUES (%s)"
+        groups = _group_statements([
+            (insert, (1,)), (insert, (2,)), ("DELETE FROM t", None),
+            ("DELETE FROM t", None), (insert, (3,))
+        ])
+        assert groups == [
+            (insert, [(1,), (2,)]), ("DELETE FROM t", [None]),
+            ("DELETE FROM t", [None]), (insert, [(3,)])
+        ]
+    
+    def test_sqlite_batch_execute_groups_round_trips(self):
+        """Test 77: SQLite batch_execute reports per-batch stats and affected rows"""
+        db = SQLiteDatabase({'database': ':memory:'})
+        db.connect()
+        db.execute("CREATE TABLE items (id INTEGER, name TEXT)")
+        
+        queries = [("INSERT INTO items VALUES (?, ?)", (i, f'item{i}')) for i in range(250)]
+        queries.append(("UPDATE items SET name = ? WHERE id < ?", ('low', 10)))
+        seen = []
+        affected = db.batch_execute(queries, batch_size=200, on_batch=seen.append)
+        
+        assert affected == 260
+        assert [b['statements'] for b in db.last_batch_stats] == [200, 51]
+        assert [b['round_trips'] for b in db.last_batch_stats] == [1, 2]
+        assert seen == db.last_batch_stats
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM items")['n'] == 250
+        db.disconnect()
+    
+    def test_mysql_multi_row_insert_rewrite(self):
+        """Test 78: MySQL INSERTs are rewritten into chunked multi-row VALUES"""
+        db = MySQLDatabase({'database': 'test', 'user': 'user', 'password': 'pass'})
+        cursor = Mock()
+        cursor.rowcount = 1000
+        db.connection = Mock()
+        db.connection.cursor.return_value = cursor
+        
+        params = [(i, f'n{i}') for i in range(2500)]
+        db.execute_many("INSERT INTO t (a, b) VALUES (%s, %s) ON DUPLICATE KEY UPDATE b = VALUES(b)", params)
+        
+        assert cursor.execute.call_count == 3
+        query, values = cursor.execute.call_args_list[2][0]
+        assert query == ("INSERT INTO t (a, b) VALUES " + ", ".join(["(%s, %s)"] * 500) +
+                         " ON DUPLICATE KEY UPDATE b = VALUES(b)")
+        assert values[:4] == (2000, 'n2000', 2001, 'n2001')
+        
+        db._execute_batch("UPDATE t SET b = %s WHERE a = %s", [('x', 1), ('y', 2)])
+        cursor.executemany.assert_called_once()
+    
+    def test_postgresql_execute_values(self):
+        """Test 79: PostgreSQL INSERT batches use execute_values; other statements report real rowcounts"""
+        db = PostgreSQLDatabase({'database': 'test', 'user': 'user', 'password': 'pass'})
+        cursor = Mock()
+        cursor.rowcount = 2
+        db.connection = Mock()
+        db.connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+        db.connection.cursor.return_value.__exit__ = Mock(return_value=False)
+        extras = Mock()
+        
+        with patch.dict(sys.modules, {'psycopg2': Mock(extras=extras), 'psycopg2.extras': extras}):
+            affected = db._execute_batch("INSERT INTO t (a, b) VALUES (%s, %s)", [(1, 2), (3, 4)])
+            cursor.rowcount = 50
+            updated = db._execute_batch("UPDATE t SET a = %s WHERE b = %s", [(1, 2), (3, 4), (5, 6)])
+        
+        assert affected == 2
+        extras.execute_values.assert_called_once_with(
+            cursor, "INSERT INTO t (a, b) VALUES %s", [(1, 2), (3, 4)],
+            template="(%s, %s)", page_size=2
+        )
+        # Rows touched by each UPDATE, not the number of statements
+        assert updated == 150
+        extras.execute_batch.assert_not_called()
+
+
+class TestBulkWrite(unittest.TestCase):
+    """Tests for backend-native bulk_write"""
+    
+    def test_sqlite_reports_failed_records(self):
+        """Test 80: SQL bulk_write retries a failed batch per record and reports failures"""
+        db = SQLiteDatabase({'database': ':memory:'})
+        db.connect()
+        db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        records = [(1,), (2,), (2,), (3,), (4,), (4,)]
+        
+        result = db.bulk_write("INSERT INTO items VALUES (?)", records, batch_size=3)
+        assert result['succeeded'] == 4
+        assert [f['index'] for f in result['failed']] == [2, 5]
+        assert result['skipped'] == 0
+        
+        ordered = db.bulk_write("INSERT INTO items VALUES (?)", [(5,), (1,), (6,)], ordered=True)
+        assert ordered['succeeded'] == 1 and ordered['skipped'] == 1
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM items")['n'] == 5
+        db.disconnect()
+    
+    def test_mongodb_unordered_bulk_write(self):
+        """Test 81: MongoDB maps write errors back to record indexes"""
+        class BulkWriteError(Exception):
+            def __init__(self, details):
+                self.details = details
+        
+        pymongo = Mock()
+        errors = Mock(BulkWriteError=BulkWriteError)
+        db = MongoDBDatabase({'database': 'test'})
+        collection = Mock()
+        collection.bulk_write.side_effect = [
+            None,
+            BulkWriteError({'writeErrors': [{'index': 1, 'errmsg': 'duplicate key'}]})
+        ]
+        db.connection = {'events': collection}
+        records = [{'_id': i} for i in range(4)]
+        
+        with patch.dict(sys.modules, {'pymongo': pymongo, 'pymongo.errors': errors}):
+            result = db.bulk_write('events', records, batch_size=2)
+        
+        assert result['succeeded'] == 3
+        assert result['failed'] == [{'index': 3, 'record': {'_id': 3}, 'error': 'duplicate key'}]
+        assert collection.bulk_write.call_args[1] == {'ordered': False}
+    
+    def test_redis_pipeline_bulk_write(self):
+        """Test 82: Redis bulk_write uses non-transactional pipelines and per-reply errors"""
+        db = RedisDatabase({'host': 'localhost'})
+        pipeline = Mock()
+        pipeline.execute.return_value = [True, Exception("WRONGTYPE"), True]
+        db.connection = Mock()
+        db.connection.pipeline.return_value = pipeline
+        
+        result = db.bulk_write('SET', [('a', 1), ('b', 2), ('c', 3)])
+        
+        db.connection.pipeline.assert_called_once_with(transaction=False)
+        pipeline.execute.assert_called_once_with(raise_on_error=False)
+        assert result['succeeded'] == 2
+        assert result['failed'][0]['record'] == ('b', 2)
+    
+    def test_cassandra_execute_concurrent(self):
+        """Test 83: Cassandra bulk_write collects failures from execute_concurrent"""
+        db = CassandraDatabase({'keyspace': 'ks'})
+        db.connection = Mock()
+        concurrent = Mock()
+        concurrent.execute_concurrent_with_args.return_value = [(True, None), (False, Exception("timeout"))]
+        
+        with patch.dict(sys.modules, {'cassandra': Mock(), 'cassandra.concurrent': concurrent}):
+            result = db.bulk_write("INSERT INTO t (a) VALUES (%s)", [(1,), (2,)])
+        
+        db.connection.prepare.assert_called_once_with("INSERT INTO t (a) VALUES (?)")
+        assert concurrent.execute_concurrent_with_args.call_args[1]['raise_on_first_error'] is False
+        assert result['succeeded'] == 1
+        assert result['failed'][0]['index'] == 1
+    
+    def test_elasticsearch_parallel_bulk(self):
+        """Test 84: Elasticsearch bulk_write builds actions and uses parallel_bulk"""
+        db = ElasticsearchDatabase({'hosts': ['localhost:9200']})
+        db.connection = Mock()
+        helpers = Mock()
+        captured = []
+        
+        def parallel_bulk(client, actions, **kwargs):
+            captured.extend(actions)
+            return [(True, {}), (False, {'index': {'error': 'mapper_parsing_exception'}})]
+        
+        helpers.parallel_bulk.side_effect = parallel_bulk
+        with patch.dict(sys.modules, {'elasticsearch': Mock(helpers=helpers)}):
+            result = db.bulk_write('logs', [{'_id': 'x', 'msg': 'ok'}, {'msg': 'bad'}])
+        
+        assert captured[0] == {'_index': 'logs', '_id': 'x', '_source': {'msg': 'ok'}}
+        assert result['succeeded'] == 1
+        assert result['failed'][0]['error'] == 'mapper_parsing_exception'
+
+    def test_ordered_stops_at_first_failure(self):
+        """Test 107: Ordered bulk_write sends nothing after the first failing record"""
+        redis_db = RedisDatabase({'host': 'localhost'})
+        redis_db.connection = Mock()
+        redis_db.connection.execute_command.side_effect = [True, Exception("WRONGTYPE"), True]
+        result = redis_db.bulk_write('SET', [('a', 1), ('b', 2), ('c', 3)], ordered=True)
+        assert redis_db.connection.execute_command.call_count == 2
+        assert (result['succeeded'], result['skipped']) == (1, 1)
+
+        cassandra_db = CassandraDatabase({'keyspace': 'ks'})
+        cassandra_db.connection = Mock()
+        cassandra_db.connection.execute.side_effect = [None, Exception("timeout"), None]
+        with patch.dict(sys.modules, {'cassandra': Mock(), 'cassandra.concurrent': Mock()}):
+            result = cassandra_db.bulk_write("INSERT INTO t (a) VALUES (%s)", [(1,), (2,), (3,)], ordered=True)
+        assert cassandra_db.connection.execute.call_count == 2
+        assert result['failed'][0]['index'] == 1 and result['skipped'] == 1
+
+        es_db = ElasticsearchDatabase({'hosts': ['localhost:9200']})
+        es_db.connection = Mock()
+        helpers = Mock()
+        sent = []
+
+        def streaming_bulk(client, actions, chunk_size, **kwargs):
+            for action in actions:
+                sent.append(action)
+                yield (len(sent) != 2, {'index': {'error': 'bad'}})
+
+        helpers.streaming_bulk.side_effect = streaming_bulk
+        with patch.dict(sys.modules, {'elasticsearch': Mock(helpers=helpers)}):
+            result = es_db.bulk_write('logs', [{'n': 1}, {'n': 2}, {'n': 3}], ordered=True)
+        assert helpers.streaming_bulk.call_args[1]['chunk_size'] == 1
+        assert len(sent) == 2
+        assert (result['succeeded'], result['skipped']) == (1, 1)
+
+
+class TestStreamingUtilities(unittest.TestCase):
+    """Tests for streaming export and migration"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = SQLiteDatabase({'database': os.path.join(self.temp_dir, 'source.db')})
+        self.source.connect()
+        self.source.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        self.source.execute_many("INSERT INTO users VALUES (?, ?)", [(i, f'user{i}') for i in range(2500)])
+        self.source.commit()
+    
+    def tearDown(self):
+        self.source.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_stream_export_gzip_ndjson(self):
+        """Test 85: stream_export writes compressed NDJSON batch by batch"""
+        output_file = os.path.join(self.temp_dir, 'users.ndjson.gz')
+        progress = []
+        
+        count = stream_export(self.source, "SELECT * FROM users ORDER BY id",
+                              output_file=output_file, batch_size=1000,
+                              progress_callback=progress.append)
+        
+        assert count == 2500
+        assert progress == [1000, 2000, 2500]
+        with gzip.open(output_file, 'rt') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 2500
+        assert json.loads(lines[-1]) == {'id': 2499, 'name': 'user2499'}
+    
+    def test_stream_export_rejects_unknown_format(self):
+        """Test 86: Unknown export formats and compressions raise ValueError"""
+        output_file = os.path.join(self.temp_dir, 'users.csv')
+        with pytest.raises(ValueError):
+            stream_export(self.source, "SELECT * FROM users", output_file=output_file, format='csv')
+        with pytest.raises(ValueError):
+            stream_export(self.source, "SELECT * FROM users", output_file=output_file, compression='brotli')
+    
+    def test_stream_migrate_pipelines_batches(self):
+        """Test 87: stream_migrate transforms and inserts every batch"""
+        target = Mock()
+        target.transaction.return_value.__enter__ = Mock(return_value=target)
+        target.transaction.return_value.__exit__ = Mock(return_value=False)
+        inserted = []
+        target.execute_many.side_effect = lambda query, params_list: inserted.extend(params_list)
+        progress = []
+        
+        count = stream_migrate(
+            self.source, target, "SELECT * FROM users ORDER BY id", 'users_copy',
+            batch_size=1000, transform_fn=lambda r: {**r, 'name': r['name'].upper()},
+            queue_size=1, progress_callback=progress.append
+        )
+        
+        assert count == 2500
+        assert progress == [1000, 2000, 2500]
+        assert inserted[0] == (0, 'USER0')
+        assert len(inserted) == 2500
+        query = target.execute_many.call_args[0][0]
+        assert query == "INSERT INTO users_copy (id, name) VALUES (%s, %s)"
+    
+    def test_stream_migrate_propagates_errors(self):
+        """Test 88: Errors on either side stop the pipeline and are raised"""
+        target = Mock()
+        target.transaction.return_value.__enter__ = Mock(return_value=target)
+        target.transaction.return_value.__exit__ = Mock(return_value=False)
+        target.execute_many.side_effect = Exception("target down")
+        
+        with pytest.raises(Exception, match="target down"):
+            stream_migrate(self.source, target, "SELECT * FROM users", 'users_copy',
+                           batch_size=100, queue_size=1)
+        
+        with pytest.raises(Exception):
+            stream_migrate(self.source, target, "SELECT * FROM missing_table", 'users_copy')
+
+
+class TestQueryResultCache(unittest.TestCase):
+    """Tests for the DatabaseManager result cache"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'cache.db')
+        self.manager = DatabaseManager('sqlite', {'database': self.path},
+                                       pool_config={'min_size': 1, 'max_size': 2},
+                                       cache_config={'default_ttl': 60})
+        self.manager.execute_transaction([
+            ("CREATE TABLE sales (region TEXT, amount INTEGER)", None),
+            ("INSERT INTO sales VALUES (?, ?)", ('eu', 10))
+        ])
+        # A side connection writes without going through the manager
+        self.side = SQLiteDatabase({'database': self.path})
+        self.side.connect()
+    
+    def tearDown(self):
+        self.side.disconnect()
+        self.manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _total(self, **kwargs):
+        return self.manager.execute_query("SELECT SUM(amount) AS total FROM sales", fetch='one', **kwargs)['total']
+    
+    def _side_insert(self, amount):
+        self.side.execute("INSERT INTO sales VALUES (?, ?)", ('us', amount))
+        self.side.commit()
+    
+    def test_referenced_tables(self):
+        """Test 89: Table extraction covers joins, comma lists, schemas and writes"""
+        assert referenced_tables("SELECT * FROM public.users u JOIN orders o ON o.uid = u.id") == {'users', 'orders'}
+        assert referenced_tables('SELECT 1 FROM a x, "B" y WHERE 1 = 1') == {'a', 'b'}
+        assert referenced_tables("UPDATE accounts SET balance = 0 WHERE note = 'from x'") == {'accounts'}
+        assert referenced_tables("TRUNCATE TABLE logs") == {'logs'}
+    
+    def test_hits_and_write_invalidation(self):
+        """Test 90: Repeated reads are cached until a write touches the table"""
+        assert self._total() == 10
+        self._side_insert(5)
+        assert self._total() == 10  # served from cache
+        
+        self.manager.execute_transaction([("INSERT INTO sales VALUES (?, ?)", ('asia', 1))])
+        assert self._total() == 16
+        
+        stats = self.manager.get_metrics()['result_cache']
+        assert stats['hits'] == 1
+        assert stats['invalidations'] >= 1
+    
+    def test_ttl_override_and_bypass(self):
+        """Test 91: cache_ttl expires entries early and 0 bypasses the cache"""
+        assert self._total(cache_ttl=0.05) == 10
+        self._side_insert(5)
+        assert self._total(cache_ttl=0) == 15
+        time.sleep(0.1)
+        assert self._total() == 15
+    
+    def test_transaction_invalidates_on_exit(self):
+        """Test 92: Writes inside a transaction invalidate once it finishes"""
+        assert self._total() == 10
+        with self.manager.transaction():
+            self.manager.execute_query("UPDATE sales SET amount = ?", (20,))
+            # Reads inside the transaction bypass the cache and see their own write
+            assert self._total() == 20
+        assert self._total() == 20
+        
+        assert self.manager.execute_transaction([("DELETE FROM sales", None)]) is True
+        assert self._total() is None
+
+    def test_direct_connection_writes_invalidate(self):
+        """Test 108: Writes on the connection yielded by transaction() invalidate on exit"""
+        assert self._total() == 10
+        with self.manager.transaction() as conn:
+            conn.execute("UPDATE sales SET amount = ?", (30,))
+            conn.execute_many("INSERT INTO sales VALUES (?, ?)", [('us', 1), ('asia', 2)])
+        assert self._total() == 33
+        assert conn.metrics.on_query is None
+    
+    def test_byte_bounded_lru_and_stale_fill(self):
+        """Test 93: Entries are evicted by size and concurrent writes veto stale fills"""
+        cache = QueryResultCache(max_bytes=600, default_ttl=60)
+        for i in range(5):
+            key = cache.make_key("SELECT * FROM t WHERE id = %s", (i,), 'all')
+            cache.put(key, [{'payload': 'x' * 100}], {'t'}, cache.snapshot({'t'}))
+        stats = cache.get_stats()
+        assert stats['bytes'] <= 600
+        assert stats['evictions'] > 0
+        assert cache.get(cache.make_key("SELECT * FROM t WHERE id = %s", (4,), 'all'))[0] is True
+        assert cache.get(cache.make_key("SELECT * FROM t WHERE id = %s", (0,), 'all'))[0] is False
+        
+        snapshot = cache.snapshot({'u'})
+        cache.invalidate_tables({'u'})
+        assert cache.put("stale", [1], {'u'}, snapshot) is False
+
+
+class TestOverloadProtection(unittest.TestCase):
+    """Tests for adaptive concurrency limiting and circuit breaking"""
+    
+    def test_limiter_sheds_when_full(self):
+        """Test 94: Requests beyond the limit are rejected instead of queued"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_wait=0)
+        assert limiter.acquire() and limiter.acquire()
+        assert limiter.acquire() is False
+        assert limiter.get_stats()['rejected'] == 1
+        
+        limiter.release(0.01)
+        assert limiter.acquire() is True
+    
+    def test_limiter_aimd(self):
+        """Test 95: Slow or failed calls shrink the limit, fast calls grow it back"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_target=0.1)
+        limiter.acquire()
+        limiter.release(0.5)
+        assert limiter.get_stats()['limit'] == 9
+        
+        limiter._last_decrease = 0
+        limiter.acquire()
+        limiter.release(0.01, success=False)
+        assert limiter.get_stats()['limit'] == 8
+        
+        for _ in range(40):
+            for _ in range(8):
+                limiter.acquire()
+            for _ in range(8):
+                limiter.release(0.01)
+        assert limiter.get_stats()['limit'] > 9
+    
+    def test_circuit_breaker_lifecycle(self):
+        """Test 96: Breaker opens on error rate, probes after timeout and recovers"""
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, minimum_calls=4, open_timeout=0.05)
+        for outcome in (True, True, False, False):
+            assert breaker.allow_request()
+            breaker.record_success() if outcome else breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow_request() is False
+        
+        time.sleep(0.06)
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False  # only one probe at a time
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        
+        time.sleep(0.06)
+        assert breaker.allow_request() is True
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_stats()['times_opened'] == 2
+    
+    def _manager_with_connection(self, conn, **kwargs):
+        manager = DatabaseManager('sqlite', {'database': ':memory:'}, use_pool=False, **kwargs)
+        
+        @contextmanager
+        def get_connection(read_only=False):
+            yield conn
+        
+        manager.get_connection = get_connection
+        return manager
+    
+    def test_manager_sheds_excess_load(self):
+        """Test 97: Under overload excess queries fail fast while admitted ones complete"""
+        conn = Mock()
+        peak = {'current': 0, 'max': 0}
+        lock = threading.Lock()
+        
+        def slow_fetch(query, params):
+            with lock:
+                peak['current'] += 1
+                peak['max'] = max(peak['max'], peak['current'])
+            time.sleep(0.05)
+            with lock:
+                peak['current'] -= 1
+            return []
+        
+        conn.fetch_all.side_effect = slow_fetch
+        manager = self._manager_with_connection(
+            conn, concurrency_config={'initial_limit': 3, 'max_wait': 0}
+        )
+        results = {'ok': 0, 'shed': 0}
+        
+        def worker():
+            try:
+                manager.execute_query("SELECT 1", fetch='all')
+                outcome = 'ok'
+            except ConcurrencyLimitExceeded:
+                outcome = 'shed'
+            with lock:
+                results[outcome] += 1
+        
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert results['ok'] >= 3
+        assert results['shed'] > 0
+        assert peak['max'] <= 3
+        assert manager.get_metrics()['concurrency']['in_flight'] == 0
+    
+    def test_manager_circuit_opens(self):
+        """Test 98: Repeated failures open the circuit and stop calling the database"""
+        conn = Mock()
+        conn.fetch_one.side_effect = Exception("connection reset")
+        manager = self._manager_with_connection(
+            conn, circuit_breaker_config={'minimum_calls': 3, 'open_timeout': 60}
+        )
+        
+        for _ in range(3):
+            with pytest.raises(Exception, match="connection reset"):
+                manager.execute_query("SELECT 1", fetch='one')
+        with pytest.raises(CircuitOpenError):
+            manager.execute_query("SELECT 1", fetch='one')
+        
+        assert conn.fetch_one.call_count == 3
+        assert manager.get_metrics()['circuit_breaker']['state'] == 'open'
+
+    def test_client_errors_do_not_trip_circuit(self):
+        """Test 109: Syntax errors and constraint violations never open the circuit"""
+        assert is_connection_error(sqlite3.OperationalError("unable to open database file"))
+        assert is_connection_error(ConnectionRefusedError())
+        assert not is_connection_error(sqlite3.OperationalError('near "SELEC": syntax error'))
+        assert not is_connection_error(sqlite3.IntegrityError("UNIQUE constraint failed: t.id"))
+        assert not is_connection_error(ValueError("bad parameter"))
+
+        conn = Mock()
+        conn.fetch_one.side_effect = sqlite3.OperationalError('near "SELEC": syntax error')
+        conn.execute.side_effect = sqlite3.IntegrityError("UNIQUE constraint failed: t.id")
+        manager = self._manager_with_connection(
+            conn, circuit_breaker_config={'minimum_calls': 3, 'open_timeout': 60}
+        )
+        for _ in range(3):
+            with pytest.raises(sqlite3.OperationalError):
+                manager.execute_query("SELEC 1", fetch='one')
+            with pytest.raises(sqlite3.IntegrityError):
+                manager.execute_query("INSERT INTO t VALUES (1)")
+
+        assert manager.get_metrics()['circuit_breaker']['state'] == 'closed'
+
+
+class TestSQLitePerformanceProfile(unittest.TestCase):
+    """Tests for the SQLite PRAGMA profile and read-only reader pool"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'edge.db')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _db(self, **params):
+        db = SQLiteDatabase({'database': self.path, **params})
+        db.connect()
+        return db
+    
+    def test_profile_pragmas(self):
+        """Test 99: Connection applies WAL, synchronous, cache, mmap, temp_store and busy timeout"""
+        db = self._db(cache_size=-8000, mmap_size=1048576, temp_store='memory', busy_timeout=2500)
+        assert db.fetch_one("PRAGMA journal_mode")['journal_mode'] == 'wal'
+        assert db.fetch_one("PRAGMA synchronous")['synchronous'] == 1
+        assert db.fetch_one("PRAGMA cache_size")['cache_size'] == -8000
+        assert db.fetch_one("PRAGMA temp_store")['temp_store'] == 2
+        assert db.fetch_one("PRAGMA busy_timeout")['timeout'] == 2500
+        db.disconnect()
+        
+        with pytest.raises(ValueError):
+            self._db(synchronous='SOMETIMES; DROP TABLE x')
+    
+    def test_reader_pool_routing(self):
+        """Test 100: Plain reads use read-only connections, own uncommitted writes stay on the writer"""
+        db = self._db(read_pool_size=2)
+        db.execute("CREATE TABLE kv (k TEXT, v INTEGER)")
+        db.execute("INSERT INTO kv VALUES (?, ?)", ('a', 1))
+        # Uncommitted: only the writer can see it
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM kv")['n'] == 1
+        db.commit()
+        
+        reader = db._readers.queue[0]
+        with pytest.raises(Exception):
+            reader.execute("INSERT INTO kv VALUES ('b', 2)")
+        
+        with db.transaction():
+            db.execute("INSERT INTO kv VALUES (?, ?)", ('b', 2))
+            assert db.fetch_one("SELECT COUNT(*) AS n FROM kv")['n'] == 2
+        assert [r['k'] for r in db.fetch_all("SELECT k FROM kv ORDER BY k")] == ['a', 'b']
+        assert db._readers.qsize() == 2
+        db.disconnect()
+    
+    def test_concurrent_readers(self):
+        """Test 101: Reader threads run queries in parallel across the pool"""
+        db = self._db(read_pool_size=4)
+        db.execute("CREATE TABLE t (id INTEGER)")
+        db.commit()
+        
+        # Each query blocks until all four are running at once, so a serialized pool fails
+        barrier = threading.Barrier(4, timeout=5)
+        results = []
+        
+        def rendezvous(value):
+            barrier.wait()
+            return value
+        
+        for reader in list(db._readers.queue):
+            reader.create_function('rendezvous', 1, rendezvous)
+        
+        def worker():
+            results.append(db.fetch_one("SELECT rendezvous(1) AS v")['v'])
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert results == [1, 1, 1, 1]
+        assert not barrier.broken
+        db.disconnect()
+    
+    def test_uncommitted_writes_owned_per_thread(self):
+        """Test 110: Other threads read committed data from readers while a transaction is open"""
+        db = self._db(read_pool_size=2)
+        db.execute("CREATE TABLE kv (k TEXT)")
+        db.commit()
+        
+        written, finish = threading.Event(), threading.Event()
+        seen = {}
+        
+        def writer():
+            with db.transaction():
+                db.execute("INSERT INTO kv VALUES ('a')")
+                seen['writer'] = db.fetch_one("SELECT COUNT(*) AS n FROM kv")['n']
+                written.set()
+                finish.wait(5)
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        assert written.wait(5)
+        seen['other'] = db.fetch_one("SELECT COUNT(*) AS n FROM kv")['n']
+        finish.set()
+        thread.join()
+        
+        assert seen == {'writer': 1, 'other': 0}
+        assert db._writer_owner is None
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM kv")['n'] == 1
+        db.disconnect()
+    
+    def test_cancel_interrupts_checked_out_reader(self):
+        """Test 111: cancel_query interrupts the reader running that thread's statement"""
+        db = self._db(read_pool_size=2)
+        db.execute("CREATE TABLE t (id INTEGER)")
+        db.commit()
+        started, release = threading.Event(), threading.Event()
+        
+        def block(value):
+            if value == 1:
+                started.set()
+                release.wait(5)
+            return value
+        
+        for reader in list(db._readers.queue):
+            reader.create_function('block', 1, block)
+        
+        errors = []
+        
+        def worker():
+            try:
+                db.fetch_one("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 10000000) "
+                             "SELECT MAX(block(x)) AS v FROM c")
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert started.wait(5)
+        assert db.cancel_query(thread.ident) is True
+        release.set()
+        thread.join(10)
+        
+        assert errors == ['interrupted']
+        assert db._running == {}
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM t")['n'] == 0
+        db.disconnect()
+    
+    def test_hedge_cancel_skips_detached_connection(self):
+        """Test 112: A finished attempt never cancels the connection it handed back"""
+        node = Mock()
+        attempt = _HedgeAttempt(node)
+        attempt.future = Mock()
+        attempt.future.cancel.return_value = False
+        conn = Mock()
+        
+        assert attempt.attach(conn) is True
+        attempt.attach(None)
+        assert attempt.cancel() is False
+        conn.cancel_query.assert_not_called()
+        
+        attempt = _HedgeAttempt(node)
+        attempt.future = Mock()
+        attempt.future.cancel.return_value = False
+        attempt.attach(conn)
+        attempt.cancel()
+        conn.cancel_query.assert_called_once_with(threading.get_ident())
+
+
+class TestHedgedReads(unittest.TestCase):
+    """Tests for hedged replica reads"""
+    
+    def test_hedge_delay_and_budget(self):
+        """Test 102: Delay follows the rolling percentile and hedges stay within budget"""
+        policy = HedgePolicy(percentile=95, budget_percent=10, min_samples=20)
+        assert policy.hedge_delay() is None
+        for i in range(1, 101):
+            policy.record_latency(i / 1000)
+        assert policy.hedge_delay() == pytest.approx(0.095)
+        
+        allowed = 0
+        for _ in range(100):
+            policy.on_request()
+            allowed += policy.try_hedge()
+        assert allowed == 10
+        assert policy.get_stats()['hedge_rate'] == 0.1
+    
+    def _manager(self):
+        manager = DatabaseManager(
+            'sqlite', {'database': ':memory:'}, use_pool=False,
+            replicas=[{'name': 'slow', 'database': ':memory:'}, {'name': 'fast', 'database': ':memory:'}],
+            replica_health_interval=0,
+            hedge_config={'budget_percent': 100, 'min_samples': 5}
+        )
+        slow, fast = manager.router.nodes
+        cancelled = threading.Event()
+        
+        slow_conn = Mock()
+        slow_conn.cancel_query.side_effect = lambda thread_id=None: cancelled.set() or True
+        
+        def slow_fetch(query, params):
+            if cancelled.wait(2):
+                raise Exception("canceling statement due to user request")
+            return {'source': 'slow'}
+        
+        slow_conn.fetch_one.side_effect = slow_fetch
+        fast_conn = Mock()
+        fast_conn.fetch_one.side_effect = lambda query, params: time.sleep(0.01) or {'source': 'fast'}
+        
+        for node, conn in ((slow, slow_conn), (fast, fast_conn)):
+            @contextmanager
+            def get_connection(read_only=False, conn=conn):
+                yield conn
+            node.manager.get_connection = get_connection
+        
+        for _ in range(5):
+            manager.hedging.record_latency(0.02)
+        return manager, slow, slow_conn
+    
+    def test_hedge_wins_and_cancels_loser(self):
+        """Test 103: A slow first attempt is hedged, the fast answer wins and the loser is cancelled"""
+        manager, slow, slow_conn = self._manager()
+        try:
+            manager.router._next = 0  # first choice is the slow replica
+            start = time.time()
+            row = manager.execute_query("SELECT 1", fetch='one')
+            
+            assert row == {'source': 'fast'}
+            assert time.time() - start < 1
+            slow_conn.cancel_query.assert_called_once()
+            
+            stats = manager.get_metrics()['hedging']
+            assert stats['hedges_sent'] == 1 and stats['hedges_won'] == 1
+            deadline = time.time() + 2
+            while slow.outstanding and time.time() < deadline:
+                time.sleep(0.01)
+            assert [n['outstanding_requests'] for n in manager.router.get_stats()] == [0, 0]
+        finally:
+            manager.close()
+    
+    def test_fast_first_attempt_not_hedged(self):
+        """Test 104: Reads answering within the hedge delay send no duplicate"""
+        manager, _, slow_conn = self._manager()
+        try:
+            manager.router._next = 1  # first choice is the fast replica
+            manager.hedging.min_delay = 0.5
+            assert manager.execute_query("SELECT 1", fetch='one') == {'source': 'fast'}
+            assert manager.get_metrics()['hedging']['hedges_sent'] == 0
+            slow_conn.fetch_one.assert_not_called()
+        finally:
+            manager.close()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
@@ -12,10 +12,11 @@ import queue
 import time
 import tempfile
 import os
+import shutil
 import sys
 
 # Add the root directory (3 levels up) to Python path
-root_dir = os.path.join(os.path.dirname(__file__), '../../..')
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../..')
 sys.path.insert(0, root_dir)
 
 # Import classes to test
@@ -29,9 +30,24 @@ from nexus.database.database_replication import (
     ReplicationLog,
     ReplicaManager,
     DatabaseReplicationManager,
-    ReplicatedDatabase
+    ReplicatedDatabase,
+    EventsNotRetainedError
 )
 
+# Managers built without a log_config write replication.log into the working
+# directory, so the tests run from a scratch directory
+OUTPUT_DIR = tempfile.mkdtemp(prefix='nexus-replication-tests-')
+ORIGINAL_CWD = os.getcwd()
+
+
+def setUpModule():
+    os.chdir(OUTPUT_DIR)
+
+
+def tearDownModule():
+    os.chdir(ORIGINAL_CWD)
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
 
 class TestReplicationEnums(unittest.TestCase):
     """Test enum classes"""
@@ -1271,6 +1287,725 @@ class TestReplicationIntegration(unittest.TestCase):
         manager.stop()
 
 
+class TestSegmentedReplicationLog(unittest.TestCase):
+    """Test segmented, indexed ReplicationLog"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'replication.log')
+
+    def tearDown(self):
+        """Clean up test files"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _event(self, i, base_time=datetime(2025, 1, 1, 12, 0, 0)):
+        return ReplicationEvent(
+            event_id=f'evt{i}',
+            timestamp=base_time + timedelta(seconds=i),
+            operation='INSERT',
+            table='users',
+            query='INSERT INTO users VALUES (%s)',
+            params=(f'User{i}',),
+            source_db='primary',
+            checksum=f'check{i}'
+        )
+
+    def test_segments_roll_and_reads_span_them(self):
+        """Test 62: Log rolls into sealed segments and reads cross segment boundaries"""
+        log = ReplicationLog(self.log_path, segment_size=2048, index_interval=256)
+        sequences = [log.log_event(self._event(i)) for i in range(60)]
+
+        self.assertEqual(sequences, list(range(1, 61)))
+        self.assertGreater(log.get_stats()['segments'], 2)
+        self.assertTrue(os.path.exists(self.log_path))
+
+        events = log.get_events_since(datetime(2025, 1, 1, 12, 0, 45))
+        self.assertEqual([e.event_id for e in events], [f'evt{i}' for i in range(45, 60)])
+
+        after = log.get_events_after(10)
+        self.assertEqual([e.sequence for e in after], list(range(11, 61)))
+        self.assertEqual(log.get_events_after(60), [])
+
+    def test_read_seeks_past_old_events(self):
+        """Test 63: Catch-up only parses events near the requested position"""
+        log = ReplicationLog(self.log_path, index_interval=256)
+        for i in range(500):
+            log.log_event(self._event(i))
+
+        with patch.object(ReplicationLog, '_parse_event',
+                          wraps=ReplicationLog._parse_event) as parse:
+            events = log.get_events_after(495)
+
+        self.assertEqual([e.sequence for e in events], [496, 497, 498, 499, 500])
+        self.assertLess(parse.call_count, 20)
+
+    def test_reopen_recovers_index_and_sequence(self):
+        """Test 64: A new ReplicationLog resumes from segments on disk"""
+        log = ReplicationLog(self.log_path, segment_size=2048)
+        for i in range(30):
+            log.log_event(self._event(i))
+
+        reopened = ReplicationLog(self.log_path, segment_size=2048)
+        self.assertEqual(reopened.last_sequence, 30)
+        self.assertEqual(reopened.log_event(self._event(30)), 31)
+        self.assertEqual(len(reopened.get_events_since(datetime(2025, 1, 1))), 31)
+
+    def test_retention_removes_old_segments(self):
+        """Test 65: Retention keeps only the newest sealed segments"""
+        log = ReplicationLog(self.log_path, segment_size=1024, retention_segments=1)
+        for i in range(40):
+            log.log_event(self._event(i))
+
+        sealed = [n for n in os.listdir(self.temp_dir)
+                  if n.startswith('replication.log.') and not n.endswith('.idx')]
+        self.assertEqual(len(sealed), 1)
+        self.assertEqual(log.get_stats()['segments'], 2)
+
+        first = log.get_stats()['first_sequence']
+        self.assertGreater(first, 1)
+        remaining = log.get_events_after(first - 1)
+        self.assertEqual([e.sequence for e in remaining], list(range(first, 41)))
+
+    def test_pruned_range_raises(self):
+        """Test 81: Reads that start before the retained range raise instead of returning a partial list"""
+        log = ReplicationLog(self.log_path, segment_size=1024, retention_segments=1)
+        for i in range(40):
+            log.log_event(self._event(i))
+        first = log.get_stats()['first_sequence']
+
+        with self.assertRaises(EventsNotRetainedError) as ctx:
+            log.get_events_after(0)
+        self.assertEqual(ctx.exception.first_sequence, first)
+        with self.assertRaises(EventsNotRetainedError):
+            log.get_events_since(datetime(2025, 1, 1))
+        self.assertEqual(log.get_events_since(datetime(2025, 1, 1, 12, 0, 39))[0].event_id, 'evt39')
+
+        # A reopened log cannot know what was pruned, so it compares with the first retained event
+        reopened = ReplicationLog(self.log_path, segment_size=1024, retention_segments=1)
+        with self.assertRaises(EventsNotRetainedError):
+            reopened.get_events_since(datetime(2025, 1, 1))
+        self.assertEqual(len(reopened.get_events_after(first - 1)), 41 - first)
+
+    def test_reads_pin_segments_against_roll_and_retention(self):
+        """Test 82: Segments opened by a read stay readable while the writer rolls and prunes"""
+        log = ReplicationLog(self.log_path, segment_size=1024, retention_segments=1)
+        for i in range(20):
+            log.log_event(self._event(i))
+        first = log.get_stats()['first_sequence']
+
+        with log._pinned_segments() as pinned:
+            for i in range(20, 80):
+                log.log_event(self._event(i))
+            self.assertGreater(log.get_stats()['first_sequence'], 20)
+            sequences = [e.sequence for segment, handle, size in pinned
+                         for e in log._read_segment(handle, size, (segment.base_seq, 0))]
+
+        self.assertEqual(sequences, list(range(first, 21)))
+
+    def test_group_commit_batches_concurrent_writers(self):
+        """Test 66: Concurrent writers share batched writes and syncs"""
+        log = ReplicationLog(self.log_path, max_batch_delay=0.01)
+        barrier = threading.Barrier(8)
+        sequences = []
+
+        def writer(worker_id):
+            barrier.wait()
+            for i in range(25):
+                sequences.append(log.log_event(self._event(worker_id * 100 + i)))
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        log.close()
+
+        stats = log.get_stats()
+        self.assertEqual(sorted(sequences), list(range(1, 201)))
+        self.assertEqual(stats['events_written'], 200)
+        self.assertLess(stats['batches_written'], 200)
+        self.assertEqual(stats['fsyncs'], stats['batches_written'])
+        with open(self.log_path, 'r') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['seq'] for line in lines], list(range(1, 201)))
+
+    def test_async_futures_and_fsync_policy(self):
+        """Test 67: log_event_async resolves after the write; fsync='none' never syncs"""
+        log = ReplicationLog(self.log_path, fsync='none')
+        futures = [log.log_event_async(self._event(i)) for i in range(10)]
+        self.assertEqual([f.result(timeout=5) for f in futures], list(range(1, 11)))
+        self.assertEqual(log.get_stats()['fsyncs'], 0)
+        self.assertEqual(log.get_events_after(8)[0].event_id, 'evt8')
+
+        # Writer restarts transparently after close
+        log.close()
+        self.assertEqual(log.log_event(self._event(10)), 11)
+        log.close()
+
+        with self.assertRaises(ValueError):
+            ReplicationLog(self.log_path, fsync='sometimes')
+
+    def test_failed_batch_fails_futures(self):
+        """Test 68: A write failure surfaces on the callers' futures"""
+        log = ReplicationLog(os.path.join(self.temp_dir, 'missing', 'replication.log'))
+        with self.assertRaises(OSError):
+            log.log_event(self._event(0))
+        self.assertEqual(log.last_sequence, 0)
+        log.close()
+
+
+class TestBatchedReplicaApply(unittest.TestCase):
+    """Test batched transactional apply in ReplicaManager"""
+
+    def setUp(self):
+        """Set up a SQLite replica"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ReplicaConfig(
+            name='sqlite-replica',
+            db_type='sqlite',
+            connection_params={'database': os.path.join(self.temp_dir, 'replica.db')},
+            apply_batch_ms=50
+        )
+        self.manager = ReplicaManager(self.config)
+        self.manager.connect()
+        self.manager.db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        self.manager.db.commit()
+
+    def tearDown(self):
+        """Clean up"""
+        import shutil
+        self.manager.stop_worker()
+        self.manager.disconnect()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _insert(self, i, query="INSERT INTO users (id, name) VALUES (?, ?)"):
+        return ReplicationEvent(
+            event_id=f'evt{i}', timestamp=datetime.now(), operation='INSERT',
+            table='users', query=query, params=(i, f'User{i}'),
+            source_db='primary', checksum=f'check{i}'
+        )
+
+    def test_identical_statements_grouped_into_execute_many(self):
+        """Test 69: Runs of identical statements become one execute_many and one commit"""
+        events = [self._insert(i) for i in range(5)]
+        events.append(ReplicationEvent(
+            event_id='upd', timestamp=datetime.now(), operation='UPDATE', table='users',
+            query="UPDATE users SET name = ? WHERE id = ?", params=('Renamed', 0),
+            source_db='primary', checksum='upd'
+        ))
+
+        with patch.object(self.manager.db, 'execute_many', wraps=self.manager.db.execute_many) as many, \
+                patch.object(self.manager.db, 'commit', wraps=self.manager.db.commit) as commit:
+            results = self.manager._apply_batch(events)
+
+        self.assertEqual(results, [True] * 6)
+        many.assert_called_once()
+        commit.assert_called_once()
+        self.assertEqual(self.manager.stats.batches_applied, 1)
+        rows = self.manager.db.fetch_all("SELECT * FROM users ORDER BY id")
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['name'], 'Renamed')
+
+    def test_failed_batch_falls_back_per_event(self):
+        """Test 70: A bad statement is isolated and the rest of the batch still applies"""
+        events = [self._insert(1), self._insert(2), self._insert(1), self._insert(3)]
+
+        results = self.manager._apply_batch(events)
+
+        self.assertEqual(results, [True, True, False, True])
+        self.assertEqual(self.manager.stats.batch_fallbacks, 1)
+        rows = self.manager.db.fetch_all("SELECT id FROM users ORDER BY id")
+        self.assertEqual([r['id'] for r in rows], [1, 2, 3])
+
+    def test_worker_drains_queue_in_batches(self):
+        """Test 71: Worker applies queued events in far fewer transactions than events"""
+        for i in range(200):
+            self.manager.event_queue.put(self._insert(i))
+
+        self.manager.start_worker()
+        self.manager.event_queue.join()
+
+        self.assertEqual(self.manager.stats.events_processed, 200)
+        self.assertLess(self.manager.stats.batches_applied, 10)
+        count = self.manager.db.fetch_one("SELECT COUNT(*) AS n FROM users")
+        self.assertEqual(count['n'], 200)
+
+    def test_raising_batch_still_acks_and_releases_events(self):
+        """Test 83: A batch whose apply raises is acked False and marked done"""
+        from concurrent.futures import Future
+        acks = [Future(), Future()]
+        for i, ack in enumerate(acks):
+            self.manager.enqueue_event(self._insert(i), ack=ack)
+
+        with patch.object(self.manager, '_apply_batch', side_effect=RuntimeError('boom')):
+            self.manager.start_worker()
+            self.manager.event_queue.join()
+
+        self.assertEqual([ack.result(timeout=1) for ack in acks], [False, False])
+        self.assertEqual(self.manager.event_queue.unfinished_tasks, 0)
+        self.assertEqual(self.manager.stats.events_failed, 2)
+        self.assertEqual(self.manager.applied_sequence, 0)
+
+    def test_failing_rollback_still_falls_back_per_event(self):
+        """Test 84: A rollback error after a failed batch does not escape the apply"""
+        events = [self._insert(1), self._insert(1), self._insert(2)]
+
+        with patch.object(self.manager.db, 'rollback', side_effect=RuntimeError('connection lost')):
+            results = self.manager._apply_batch(events)
+
+        self.assertEqual(len(results), 3)
+        self.assertFalse(results[1])
+        self.assertEqual(self.manager.stats.batch_fallbacks, 1)
+
+
+class TestAcknowledgedReplication(unittest.TestCase):
+    """Test commit acknowledgements for SYNCHRONOUS and SEMI_SYNC modes"""
+
+    def setUp(self):
+        """Set up SQLite primary and replicas"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _config(self, name, **kwargs):
+        return ReplicaConfig(
+            name=name,
+            db_type='sqlite',
+            connection_params={'database': os.path.join(self.temp_dir, f'{name}.db')},
+            **kwargs
+        )
+
+    def _manager(self, mode, replicas=('replica-1', 'replica-2'), **kwargs):
+        manager = DatabaseReplicationManager(
+            primary_config=self._config('primary'),
+            replica_configs=[self._config(name) for name in replicas],
+            mode=mode,
+            log_config={'log_file': os.path.join(self.temp_dir, 'replication.log')},
+            **kwargs
+        )
+        manager.start()
+        for member in [manager.primary] + list(manager.replicas.values()):
+            member.db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            member.db.commit()
+        return manager
+
+    def _count(self, replica):
+        return replica.db.fetch_one("SELECT COUNT(*) AS n FROM users")['n']
+
+    def test_synchronous_waits_for_replica_commit(self):
+        """Test 72: SYNCHRONOUS execute returns only after every replica committed"""
+        manager = self._manager(ReplicationMode.SYNCHRONOUS)
+        try:
+            for i in range(5):
+                manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (i, f'User{i}'), 'users')
+                for replica in manager.replicas.values():
+                    self.assertEqual(self._count(replica), i + 1)
+
+            status = manager.get_status()
+            self.assertEqual(status['ack_stats']['acked_writes'], 5)
+            self.assertIsNotNone(status['ack_latency_ms']['p99'])
+            self.assertLessEqual(status['ack_latency_ms']['p50'], status['ack_latency_ms']['p99'])
+        finally:
+            manager.stop()
+
+    def test_semi_sync_returns_on_quorum(self):
+        """Test 73: SEMI_SYNC only needs min_replicas_sync acknowledgements"""
+        manager = self._manager(ReplicationMode.SEMI_SYNC, min_replicas_sync=1, ack_timeout=2)
+        try:
+            manager.replicas['replica-2'].stop_worker()
+            started = time.monotonic()
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (1, 'John'), 'users')
+
+            self.assertLess(time.monotonic() - started, 1)
+            self.assertEqual(manager.ack_stats['ack_timeouts'], 0)
+            self.assertEqual(self._count(manager.replicas['replica-1']), 1)
+        finally:
+            manager.stop()
+
+    def test_ack_timeout_raise_policy(self):
+        """Test 74: 'raise' policy surfaces a ReplicationTimeoutError after the primary commit"""
+        from nexus.database.database_replication import ReplicationTimeoutError
+
+        manager = self._manager(ReplicationMode.SYNCHRONOUS, replicas=('replica-1',),
+                                ack_timeout=0.2, ack_timeout_policy='raise')
+        try:
+            manager.replicas['replica-1'].stop_worker()
+            with self.assertRaises(ReplicationTimeoutError):
+                manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (1, 'John'), 'users')
+            self.assertEqual(self._count(manager.primary), 1)
+            self.assertEqual(manager.ack_stats['ack_timeouts'], 1)
+        finally:
+            manager.stop()
+
+        with self.assertRaises(ValueError):
+            DatabaseReplicationManager(self._config('p'), [], ack_timeout_policy='ignore')
+
+    def test_ack_timeout_degrades_then_recovers(self):
+        """Test 75: 'degrade' policy goes asynchronous until replicas drain, then waits again"""
+        manager = self._manager(ReplicationMode.SYNCHRONOUS, replicas=('replica-1',), ack_timeout=0.2)
+        replica = manager.replicas['replica-1']
+        try:
+            replica.stop_worker()
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (1, 'John'), 'users')
+            self.assertTrue(manager.degraded)
+
+            started = time.monotonic()
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (2, 'Jane'), 'users')
+            self.assertLess(time.monotonic() - started, 0.2)
+            self.assertEqual(manager.ack_stats['degraded_writes'], 1)
+
+            replica.start_worker()
+            replica.event_queue.join()
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (3, 'Jim'), 'users')
+            self.assertFalse(manager.degraded)
+            self.assertEqual(self._count(replica), 3)
+        finally:
+            manager.stop()
+
+
+class TestPartitionedReplicaApply(unittest.TestCase):
+    """Test key-partitioned parallel apply lanes"""
+
+    def setUp(self):
+        """Set up fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ReplicaConfig(
+            name='lane-replica',
+            db_type='sqlite',
+            connection_params={'database': os.path.join(self.temp_dir, 'replica.db')},
+            apply_lanes=4,
+            apply_batch_size=64,
+            partition_keys={'counters': 'id'}
+        )
+
+    def tearDown(self):
+        """Clean up"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _event(self, operation, table, query, params=None):
+        return ReplicationEvent(
+            event_id=f'{operation}-{params}', timestamp=datetime.now(), operation=operation,
+            table=table, query=query, params=params, source_db='primary', checksum='c'
+        )
+
+    def test_lane_routing(self):
+        """Test 76: Same row shares a lane; DDL and key-less writes are barriers"""
+        manager = ReplicaManager(self.config)
+        lane = manager._lane_for
+
+        row_events = [
+            self._event('INSERT', 'counters', "INSERT INTO counters (id, value) VALUES (?, ?)", (7, 0)),
+            self._event('UPDATE', 'COUNTERS', "UPDATE counters SET value = ? WHERE id = ?", (1, 7)),
+            self._event('DELETE', 'counters', "DELETE FROM counters WHERE id = %s", (7,)),
+        ]
+        self.assertEqual(len({lane(e) for e in row_events}), 1)
+        self.assertIsNotNone(lane(row_events[0]))
+
+        # Other rows spread across lanes
+        lanes = {lane(self._event('UPDATE', 'counters', "UPDATE counters SET value = ? WHERE id = ?", (1, i)))
+                 for i in range(50)}
+        self.assertGreater(len(lanes), 1)
+
+        barriers = [
+            self._event('OTHER', 'counters', "ALTER TABLE counters ADD COLUMN flag INTEGER"),
+            self._event('UPDATE', 'counters', "UPDATE counters SET value = ? WHERE name = ?", (1, 'x')),
+            self._event('UPDATE', 'counters', "UPDATE counters SET id = ? WHERE id = ?", (2, 1)),
+            self._event('DELETE', 'counters', "DELETE FROM counters WHERE id = ? OR id = ?", (1, 2)),
+        ]
+        for event in barriers:
+            self.assertIsNone(lane(event), event.query)
+
+        # Tables without a configured key are partitioned by table
+        log_lanes = {lane(self._event('INSERT', 'logs', "INSERT INTO logs (msg) VALUES (?)", (f'm{i}',)))
+                     for i in range(10)}
+        self.assertEqual(len(log_lanes), 1)
+
+    def test_parallel_apply_preserves_per_row_order(self):
+        """Test 77: Parallel lanes keep per-row ordering and honour DDL barriers"""
+        manager = ReplicaManager(self.config)
+        manager.connect()
+        manager.db.execute("CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER, history TEXT)")
+        manager.db.commit()
+
+        rows = 16
+        for i in range(rows):
+            manager.event_queue.put(self._event(
+                'INSERT', 'counters', "INSERT INTO counters (id, value, history) VALUES (?, ?, ?)", (i, 0, '')
+            ))
+        for step in range(1, 31):
+            if step == 15:
+                manager.event_queue.put(self._event(
+                    'OTHER', 'counters', "ALTER TABLE counters ADD COLUMN flag INTEGER"
+                ))
+            for i in range(rows):
+                if step > 15:
+                    query = "UPDATE counters SET value = ?, history = history || ?, flag = ? WHERE id = ?"
+                    params = (step, f'{step},', step, i)
+                else:
+                    query = "UPDATE counters SET value = ?, history = history || ? WHERE id = ?"
+                    params = (step, f'{step},', i)
+                manager.event_queue.put(self._event('UPDATE', 'counters', query, params))
+
+        try:
+            manager.start_worker()
+            manager.event_queue.join()
+        finally:
+            manager.stop_worker()
+
+        expected_history = ''.join(f'{step},' for step in range(1, 31))
+        result = manager.db.fetch_all("SELECT * FROM counters ORDER BY id")
+        manager.disconnect()
+
+        self.assertEqual(manager.stats.events_failed, 0)
+        self.assertEqual(len(result), rows)
+        for row in result:
+            self.assertEqual(row['value'], 30)
+            self.assertEqual(row['history'], expected_history)
+            self.assertEqual(row['flag'], 30)
+
+    def test_cross_table_failures_retried_in_log_order(self):
+        """Test 85: A child insert applied before its parent's lane is retried after the lanes"""
+        manager = ReplicaManager(self.config)
+        manager.connect()
+        manager.db.execute("CREATE TABLE parents (id INTEGER PRIMARY KEY)")
+        manager.db.execute("CREATE TABLE children (id INTEGER PRIMARY KEY, parent_id INTEGER)")
+        manager.db.execute(
+            "CREATE TRIGGER children_fk BEFORE INSERT ON children "
+            "WHEN NOT EXISTS (SELECT 1 FROM parents WHERE id = NEW.parent_id) "
+            "BEGIN SELECT RAISE(ABORT, 'missing parent'); END"
+        )
+        manager.db.execute("INSERT INTO parents (id) VALUES (4)")
+        manager.db.commit()
+
+        events = [
+            self._event('INSERT', 'children', "INSERT INTO children (id, parent_id) VALUES (?, ?)", (1, 4)),
+            self._event('INSERT', 'parents', "INSERT INTO parents (id) VALUES (?)", (5,)),
+            self._event('INSERT', 'children', "INSERT INTO children (id, parent_id) VALUES (?, ?)", (2, 5)),
+        ]
+
+        # Without an executor lanes run one after another, children's lane first
+        lane_of = {'children': 0, 'parents': 1}
+        try:
+            with patch.object(manager, '_lane_for', side_effect=lambda e: lane_of[e.table]):
+                results = manager._apply_partitioned(events)
+            ids = [r['id'] for r in manager.db.fetch_all("SELECT id FROM children")]
+        finally:
+            manager.disconnect()
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(sorted(ids), [1, 2])
+
+    def test_applied_sequence_stops_at_first_failure(self):
+        """Test 86: applied_sequence only advances over contiguous successes"""
+        manager = ReplicaManager(self.config)
+        batch = []
+        for seq in range(1, 6):
+            event = self._event('INSERT', 'counters', "INSERT INTO counters (id) VALUES (?)", (seq,))
+            event.sequence = seq
+            manager.event_queue.put(event)
+            batch.append(manager.event_queue.get())
+
+        manager._finish_batch(batch[:3], [True, False, True])
+        self.assertEqual(manager.applied_sequence, 1)
+        self.assertEqual(manager.failed_sequence, 2)
+
+        manager._finish_batch(batch[3:], [True, True])
+        self.assertEqual(manager.applied_sequence, 1)
+        self.assertEqual(manager.get_stats()['failed_sequence'], 2)
+
+    def test_applied_sequence_waits_for_gaps_and_dropped_events(self):
+        """Test 88: Out-of-order applies wait for the gap; a dropped enqueue blocks the token"""
+        manager = ReplicaManager(self.config)
+
+        def event(seq):
+            e = self._event('INSERT', 'counters', "INSERT INTO counters (id) VALUES (?)", (seq,))
+            e.sequence = seq
+            return e
+
+        # Sequences 1 and 3 applied before 2: only 1 is published until 2 lands
+        for seq in (1, 3):
+            manager._record_applied_sequence(seq)
+        self.assertEqual(manager.applied_sequence, 1)
+        manager._record_applied_sequence(2)
+        self.assertEqual(manager.applied_sequence, 3)
+
+        # A full queue drops 5; 4 and 6 apply, but the replica never claims 5 or beyond
+        manager.event_queue = queue.Queue(maxsize=1)
+        manager.event_queue.put(event(4))
+        with patch.object(manager.event_queue, 'put', side_effect=queue.Full):
+            self.assertFalse(manager.enqueue_event(event(5)))
+        self.assertEqual(manager.failed_sequence, 5)
+
+        manager._finish_batch([manager.event_queue.get()], [True])
+        self.assertTrue(manager.enqueue_event(event(6)))
+        manager._finish_batch([manager.event_queue.get()], [True])
+        self.assertEqual(manager.applied_sequence, 4)
+
+    def test_replicas_start_synced_with_existing_log(self):
+        """Test 89: Replicas started against a non-empty log count earlier events as applied"""
+        log_file = os.path.join(self.temp_dir, 'replication.log')
+        log = ReplicationLog(log_file=log_file)
+        for i in range(3):
+            log.log_event(self._event('INSERT', 'counters', "INSERT INTO counters (id) VALUES (?)", (i,)))
+        log.close()
+
+        manager = DatabaseReplicationManager(
+            primary_config=ReplicaConfig(name='primary', db_type='sqlite',
+                                         connection_params={'database': os.path.join(self.temp_dir, 'p.db')}),
+            replica_configs=[self.config],
+            mode=ReplicationMode.ASYNCHRONOUS,
+            log_config={'log_file': log_file}
+        )
+        manager.start()
+        try:
+            self.assertEqual(manager.replicas['lane-replica'].applied_sequence, 3)
+        finally:
+            manager.stop()
+
+
+class TestReadRouting(unittest.TestCase):
+    """Test lag-aware read routing and read-your-writes tokens"""
+
+    def setUp(self):
+        """Set up SQLite primary and replicas"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _config(self, name):
+        return ReplicaConfig(
+            name=name,
+            db_type='sqlite',
+            connection_params={'database': os.path.join(self.temp_dir, f'{name}.db')}
+        )
+
+    def _manager(self, **kwargs):
+        manager = DatabaseReplicationManager(
+            primary_config=self._config('primary'),
+            replica_configs=[self._config('replica-1'), self._config('replica-2')],
+            mode=ReplicationMode.ASYNCHRONOUS,
+            log_config={'log_file': os.path.join(self.temp_dir, 'replication.log')},
+            **kwargs
+        )
+        manager.start()
+        for member in [manager.primary] + list(manager.replicas.values()):
+            member.db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            member.db.commit()
+        return manager
+
+    def _drain(self, manager):
+        for replica in manager.replicas.values():
+            replica.event_queue.join()
+
+    def test_reads_spread_over_fresh_replicas(self):
+        """Test 78: SELECTs go to replicas within the staleness bound"""
+        manager = self._manager(read_routing=True)
+        try:
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (1, 'John'), 'users')
+            self._drain(manager)
+
+            for _ in range(4):
+                row = manager.execute_query("SELECT * FROM users WHERE id = ?", (1,), fetch='one')
+                self.assertEqual(row['name'], 'John')
+            self.assertEqual(manager.read_stats['replica_reads'], 4)
+            self.assertEqual(manager.read_stats['primary_reads'], 0)
+
+            # replica-2 falls behind: it has pending work and last applied a minute ago
+            lagging = manager.replicas['replica-2']
+            lagging.stop_worker()
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (2, 'Jane'), 'users')
+            lagging.applied_through = datetime.now() - timedelta(seconds=60)
+            self.assertGreater(lagging.get_staleness(), 50)
+
+            chosen = {manager._route_read(max_staleness=5).config.name for _ in range(6)}
+            self.assertEqual(chosen, {'replica-1'})
+            chosen = {manager._route_read(max_staleness=120).config.name for _ in range(6)}
+            self.assertEqual(chosen, {'replica-1', 'replica-2'})
+        finally:
+            manager.stop()
+
+    def test_read_your_writes_token(self):
+        """Test 79: Token reads use only replicas that applied the write, else the primary"""
+        manager = self._manager(read_routing=True)
+        db = ReplicatedDatabase(manager, read_your_writes=True)
+        try:
+            for replica in manager.replicas.values():
+                replica.stop_worker()
+
+            token = db.execute("INSERT INTO users (id, name) VALUES (?, ?)", (1, 'John'))
+            self.assertIsInstance(token, int)
+            self.assertEqual(db.last_token, token)
+
+            # Replicas look fresh by time but have not applied the token
+            for replica in manager.replicas.values():
+                replica.applied_through = datetime.now()
+            self.assertEqual(db.fetch_one("SELECT * FROM users WHERE id = ?", (1,))['name'], 'John')
+            self.assertEqual(manager.read_stats['token_fallbacks'], 1)
+            self.assertEqual(manager.read_stats['primary_reads'], 1)
+
+            for replica in manager.replicas.values():
+                replica.start_worker()
+            self._drain(manager)
+            self.assertTrue(all(r.applied_sequence >= token for r in manager.replicas.values()))
+
+            rows = db.fetch_all("SELECT * FROM users")
+            self.assertEqual([r['name'] for r in rows], ['John'])
+            self.assertEqual(manager.read_stats['replica_reads'], 1)
+        finally:
+            manager.stop()
+
+    def test_routing_disabled_and_tokens_increase(self):
+        """Test 80: Reads stay on the primary by default; tokens are increasing"""
+        manager = self._manager()
+        try:
+            tokens = [
+                manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (i, f'U{i}'),
+                                'users', return_token=True)
+                for i in range(3)
+            ]
+            self.assertEqual(tokens, sorted(tokens))
+            self.assertEqual(len(set(tokens)), 3)
+
+            manager.execute_query("SELECT * FROM users", fetch='all')
+            self.assertIs(manager._route_read(), manager.primary)
+            self.assertEqual(manager.read_stats['replica_reads'], 0)
+            self.assertIn('read_stats', manager.get_status())
+        finally:
+            manager.stop()
+
+    def test_routed_reads_use_dedicated_connection(self):
+        """Test 87: Routed reads never run on the connection the apply worker uses"""
+        manager = self._manager(read_routing=True)
+        try:
+            manager.execute("INSERT INTO users (id, name) VALUES (?, ?)", (1, 'John'), 'users')
+            self._drain(manager)
+
+            with patch.object(manager.replicas['replica-1'].db, 'fetch_one') as worker_read, \
+                    patch.object(manager.replicas['replica-2'].db, 'fetch_one') as other_worker_read:
+                for _ in range(4):
+                    row = manager.execute_query("SELECT * FROM users WHERE id = ?", (1,), fetch='one')
+                    self.assertEqual(row['name'], 'John')
+            worker_read.assert_not_called()
+            other_worker_read.assert_not_called()
+
+            for replica in manager.replicas.values():
+                self.assertIsNotNone(replica.read_db)
+                self.assertIsNot(replica.read_db, replica.db)
+        finally:
+            manager.stop()
+
+        self.assertTrue(all(r.read_db is None for r in manager.replicas.values()))
+
+
 # Test runner
 if __name__ == '__main__':
     # Create test suite
@@ -1283,9 +2018,14 @@ if __name__ == '__main__':
     suite.addTests(loader.loadTestsFromTestCase(TestReplicaConfig))
     suite.addTests(loader.loadTestsFromTestCase(TestReplicationStats))
     suite.addTests(loader.loadTestsFromTestCase(TestReplicationLog))
+    suite.addTests(loader.loadTestsFromTestCase(TestSegmentedReplicationLog))
     suite.addTests(loader.loadTestsFromTestCase(TestReplicaManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchedReplicaApply))
+    suite.addTests(loader.loadTestsFromTestCase(TestPartitionedReplicaApply))
     suite.addTests(loader.loadTestsFromTestCase(TestDatabaseReplicationManager))
     suite.addTests(loader.loadTestsFromTestCase(TestReplicatedDatabase))
+    suite.addTests(loader.loadTestsFromTestCase(TestAcknowledgedReplication))
+    suite.addTests(loader.loadTestsFromTestCase(TestReadRouting))
     suite.addTests(loader.loadTestsFromTestCase(TestReplicationEdgeCases))
     suite.addTests(loader.loadTestsFromTestCase(TestReplicationIntegration))
     
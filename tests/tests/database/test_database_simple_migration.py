@@ -11,26 +11,45 @@ import threading
 from queue import Queue
 import tempfile
 import os
+import shutil
 import sys
 
 # Add the root directory (3 levels up) to Python path
-root_dir = os.path.join(os.path.dirname(__file__), '../../..')
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../..')
 sys.path.insert(0, root_dir)
 
+# The migration modules write their log files (and reports) into the working
+# directory, so imports and tests run from a scratch directory
+OUTPUT_DIR = tempfile.mkdtemp(prefix='nexus-migration-tests-')
+ORIGINAL_CWD = os.getcwd()
+
 # Import classes to test
-from nexus.database.database_simple_migration import (
-    MigrationStrategy,
-    MigrationStatus,
-    MigrationConfig,
-    MigrationStats,
-    MigrationCheckpoint,
-    DataValidator,
-    BaseMigration,
-    ChunkedMigration,
-    ParallelMigration,
-    StreamingMigration,
-    MigrationOrchestrator
-)
+os.chdir(OUTPUT_DIR)
+try:
+    from nexus.database.database_simple_migration import (
+        MigrationStrategy,
+        MigrationStatus,
+        MigrationConfig,
+        MigrationStats,
+        MigrationCheckpoint,
+        DataValidator,
+        BaseMigration,
+        ChunkedMigration,
+        ParallelMigration,
+        StreamingMigration,
+        MigrationOrchestrator
+    )
+finally:
+    os.chdir(ORIGINAL_CWD)
+
+
+def setUpModule():
+    os.chdir(OUTPUT_DIR)
+
+
+def tearDownModule():
+    os.chdir(ORIGINAL_CWD)
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
 
 
 class TestMigrationEnums(unittest.TestCase):
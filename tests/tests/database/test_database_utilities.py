@@ -6,7 +6,10 @@ Comprehensive unit tests for Enterprise Database Features
 import unittest
 from unittest.mock import Mock, MagicMock, patch, mock_open, call
 from datetime import datetime, timedelta
+import io
 import json
+import sqlite3
+from decimal import Decimal
 import time
 import threading
 import queue
@@ -22,9 +25,11 @@ root_dir = os.path.join(os.path.dirname(__file__), '../../..')
 sys.path.insert(0, root_dir)
 
 # Import classes to test
+from nexus.database.database_management import SQLiteDatabase
 from nexus.database.database_utilities import (
     AdvancedConnectionPool,
     MultiLevelCache,
+    CacheCodec,
     QueryBuilder,
     AuditLogger,
     EncryptedDatabase,
@@ -94,11 +99,19 @@ class TestAdvancedConnectionPool(unittest.TestCase):
         mock_db.execute.return_value = None
         mock_factory.return_value = mock_db
         
-        pool = AdvancedConnectionPool(self.db_config, min_size=1)
+        pool = AdvancedConnectionPool(self.db_config, min_size=1, validation_idle_threshold=30)
         conn = pool.get_connection()
         
-        # Health check should have been performed
-        mock_db.execute.assert_called()
+        # Recently used connections skip the health check
+        mock_db.execute.assert_not_called()
+        pool.release_connection(conn)
+        
+        # Connections idle past the threshold are validated
+        conn_info = pool.pool.get()
+        conn_info['last_used'] = time.time() - 60
+        pool.pool.put(conn_info)
+        pool.get_connection()
+        mock_db.execute.assert_called_with("SELECT 1")
     
     @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
     def test_release_connection(self, mock_factory):
@@ -141,10 +154,14 @@ class TestAdvancedConnectionPool(unittest.TestCase):
         mock_factory.return_value = mock_db
         
         pool = AdvancedConnectionPool(self.db_config, min_size=1)
+        conn_info = pool.pool.get()
+        conn_info['last_used'] = time.time() - 60  # idle long enough to be validated
+        pool.pool.put(conn_info)
         
         # This should trigger recycling due to failed health check
         conn = pool.get_connection()
         self.assertIsNotNone(conn)
+        mock_db.disconnect.assert_called_once()
     
     @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
     def test_get_stats(self, mock_factory):
@@ -160,6 +177,109 @@ class TestAdvancedConnectionPool(unittest.TestCase):
         self.assertIn('pool_size', stats)
         self.assertIn('active', stats)
 
+    
+    @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
+    def test_checkout_accounting(self, mock_factory):
+        """Test 101: Active, idle and total counts track checkouts and releases"""
+        mock_factory.side_effect = lambda *args: Mock()
+        
+        pool = AdvancedConnectionPool(self.db_config, min_size=2, max_size=3)
+        conns = [pool.get_connection() for _ in range(3)]
+        stats = pool.get_stats()
+        self.assertEqual((stats['active'], stats['idle'], stats['total']), (3, 0, 3))
+        
+        # At max_size the pool waits for a release instead of opening more
+        with self.assertRaises(Exception):
+            pool.get_connection(timeout=0.05)
+        
+        for conn in conns:
+            pool.release_connection(conn)
+        stats = pool.get_stats()
+        self.assertEqual((stats['active'], stats['idle'], stats['total']), (0, 3, 3))
+        
+        # Releasing a connection twice is ignored
+        pool.release_connection(conns[0])
+        self.assertEqual(pool.get_stats()['idle'], 3)
+    
+    @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
+    def test_release_returns_same_connection(self, mock_factory):
+        """Test 102: Released connections are reused by the next checkout"""
+        mock_factory.side_effect = lambda *args: Mock()
+        
+        pool = AdvancedConnectionPool(self.db_config, min_size=1, max_size=1)
+        first = pool.get_connection()
+        pool.release_connection(first)
+        second = pool.get_connection(timeout=0.05)
+        
+        self.assertIs(first, second)
+        self.assertEqual(mock_factory.call_count, 1)
+    
+    @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
+    def test_leak_detection(self, mock_factory):
+        """Test 103: Connections held past the leak threshold are reported with a stack"""
+        mock_factory.side_effect = lambda *args: Mock()
+        
+        pool = AdvancedConnectionPool(self.db_config, min_size=1, leak_threshold=10, capture_stacks=True)
+        held = pool.get_connection()
+        released = pool.get_connection()
+        pool.release_connection(released)
+        self.assertEqual(pool.find_leaks(), [])
+        
+        pool._checked_out[id(held)][0]['checked_out_at'] -= 20
+        leaks = pool.find_leaks()
+        
+        self.assertEqual(len(leaks), 1)
+        self.assertEqual(leaks[0]['connection_id'], id(held))
+        self.assertIn('test_leak_detection', leaks[0]['stack'])
+    
+    @patch('nexus.database.database_utilities.traceback.format_stack')
+    @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
+    def test_leak_detection_without_stacks(self, mock_factory, mock_format_stack):
+        """Test 127: By default checkouts record only a timestamp, leaks are still found"""
+        mock_factory.side_effect = lambda *args: Mock()
+        
+        pool = AdvancedConnectionPool(self.db_config, min_size=1, leak_threshold=10)
+        held = pool.get_connection()
+        pool._checked_out[id(held)][0]['checked_out_at'] -= 20
+        leaks = pool.find_leaks()
+        
+        mock_format_stack.assert_not_called()
+        self.assertEqual(len(leaks), 1)
+        self.assertEqual(leaks[0]['stack'], '')
+
+
+class _FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands MultiLevelCache uses"""
+    
+    def __init__(self, decode_responses=False):
+        self.data = {}
+        self.ttls = {}
+        self.decode_responses = decode_responses
+        self.connection_pool = Mock(connection_kwargs={'decode_responses': decode_responses})
+    
+    def get(self, key):
+        value = self.data.get(key)
+        if self.decode_responses and isinstance(value, bytes):
+            return value.decode('utf-8')
+        return value
+    
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+    
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+    
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return key in self.data
+    
+    def smembers(self, key):
+        return {m.encode() for m in self.data.get(key, set())}
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
 
 class TestMultiLevelCache(unittest.TestCase):
     """Test MultiLevelCache class"""
@@ -293,6 +413,168 @@ class TestMultiLevelCache(unittest.TestCase):
         self.assertNotEqual(key1, key3)  # Different params, different key
         self.assertTrue(key1.startswith('cache:'))
     
+    def test_get_or_compute_single_flight(self):
+        """Test 104: Concurrent misses for one key share a single computation"""
+        self.mock_redis.get.return_value = None
+        cache = MultiLevelCache(self.mock_db, self.mock_redis)
+        calls = []
+        
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'total': 42}
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('report', compute)))
+                   for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'total': 42}] * 10)
+        self.assertEqual(cache.stats['coalesced'], 9)
+    
+    def test_get_or_compute_early_refresh(self):
+        """Test 105: Entries close to expiry are recomputed early"""
+        self.mock_redis.get.return_value = None
+        cache = MultiLevelCache(self.mock_db, self.mock_redis, ttl=60)
+        cache.get_or_compute('k', lambda: 'v1')
+        
+        # Cheap to compute and far from expiry: served from L1
+        cache._l1_meta['k'] = (0.001, time.time() + 60)
+        self.assertEqual(cache.get_or_compute('k', lambda: 'v2'), 'v1')
+        
+        # Slow to compute and a second from expiry: refreshed ahead of time
+        cache._l1_meta['k'] = (10.0, time.time() + 1)
+        with patch('nexus.database.database_utilities.random.random', return_value=0.5):
+            self.assertEqual(cache.get_or_compute('k', lambda: 'v2'), 'v2')
+        self.assertEqual(cache.stats['early_refreshes'], 1)
+    
+    def test_invalidate_tags(self):
+        """Test 106: Tag invalidation removes only the tagged keys"""
+        redis_client = _FakeRedis()
+        cache = MultiLevelCache(self.mock_db, redis_client)
+        cache.get_or_compute('user:1', lambda: 'a', tags=['users'])
+        cache.get_or_compute('user:2', lambda: 'b', tags=['users'])
+        cache.get_or_compute('order:1', lambda: 'c', tags=['orders'])
+        
+        removed = cache.invalidate_tags('users')
+        
+        self.assertEqual(removed, 2)
+        self.assertEqual(set(cache.l1_cache), {'order:1'})
+        self.assertEqual(set(redis_client.data), {'order:1', 'cache-tag:orders'})
+        
+        # Another process's keys are found through the Redis tag set
+        cache.get_or_compute('user:3', lambda: 'd', tags=['users'])
+        cache._tag_index.clear()
+        self.assertEqual(cache.invalidate_tags('users'), 1)
+        self.assertNotIn('user:3', redis_client.data)
+    
+    def test_invalidate_tables_for_queries(self):
+        """Test 107: Query results are tagged with their tables and stale fills are dropped"""
+        self.mock_redis.get.return_value = None
+        self.mock_db.fetch_all.return_value = [{'id': 1}]
+        cache = MultiLevelCache(self.mock_db, self.mock_redis)
+        cache.get('SELECT * FROM users WHERE id = %s', (1,))
+        cache.get('SELECT * FROM orders', None)
+        
+        cache.invalidate_tables('USERS')
+        
+        self.assertEqual(len(cache.l1_cache), 1)
+        self.mock_redis.scan_iter.assert_not_called()
+        
+        # A value computed across an invalidation of its tag is returned but not cached
+        def compute():
+            cache.invalidate_tags('users')
+            return 'stale'
+        
+        self.assertEqual(cache.get_or_compute('user:9', compute, tags=['users']), 'stale')
+        self.assertNotIn('user:9', cache.l1_cache)
+    
+    def test_codec_preserves_types_and_compresses(self):
+        """Test 108: Cache codec round-trips typed values and compresses large ones"""
+        codec = CacheCodec(serializer='pickle', compression='zlib', compress_threshold=256)
+        rows = [{'id': i, 'created': datetime(2024, 1, 1, 12, 0), 'price': Decimal('9.99')}
+                for i in range(100)]
+        
+        encoded = codec.encode(rows)
+        small = codec.encode({'id': 1})
+        
+        self.assertEqual(codec.decode(encoded), rows)
+        self.assertEqual(encoded[1] & 0x0F, CacheCodec.COMPRESSORS['zlib'])
+        self.assertEqual(small[1] & 0x0F, 0)  # below the threshold
+        self.assertLess(len(encoded), len(json.dumps(rows, default=str)))
+        
+        # Values written as plain JSON by older versions still decode
+        self.assertEqual(codec.decode(json.dumps([{'id': 1}])), [{'id': 1}])
+        self.assertEqual(CacheCodec(serializer='json').decode(CacheCodec(serializer='json').encode([1])), [1])
+        with self.assertRaises(ValueError):
+            CacheCodec(serializer='yaml')
+    
+    def test_l2_round_trip_keeps_types(self):
+        """Test 109: Values read back from Redis by another process keep their types"""
+        redis_client = _FakeRedis()
+        writer = MultiLevelCache(self.mock_db, redis_client, compression='zlib')
+        reader = MultiLevelCache(self.mock_db, redis_client, compression='zlib')
+        value = [{'at': datetime(2024, 5, 1), 'amount': Decimal('10.50')}]
+        
+        writer.get_or_compute('k', lambda: value)
+        result = reader.get_or_compute('k', lambda: self.fail('should hit L2'))
+        
+        self.assertEqual(result, value)
+        self.assertIsInstance(result[0]['amount'], Decimal)
+        stats = reader.get_stats()
+        self.assertEqual((stats['l1_misses'], stats['l2_hits']), (1, 1))
+        self.assertIn('avg_l2_read_ms', stats)
+        self.assertGreater(writer.get_stats()['l2_bytes_written'], 0)
+
+    def test_l2_round_trip_with_decoding_client(self):
+        """Test 134: Clients that decode responses get headerless JSON that reads back"""
+        redis_client = _FakeRedis(decode_responses=True)
+        writer = MultiLevelCache(self.mock_db, redis_client, compression='zlib', compress_threshold=1)
+        reader = MultiLevelCache(self.mock_db, redis_client)
+        value = [{'id': i, 'name': f'user{i}'} for i in range(50)]
+        
+        writer.get_or_compute('k', lambda: value)
+        result = reader.get_or_compute('k', lambda: self.fail('should hit L2'))
+        
+        self.assertEqual(result, value)
+        json.loads(redis_client.data['k'].decode('utf-8'))  # stored without a binary header
+        self.assertEqual(reader.get_stats()['l2_errors'], 0)
+        with self.assertRaises(ValueError):
+            CacheCodec(serializer='pickle', compression=None, framed=False)
+    
+    def test_manual_set_expires_tag_sets(self):
+        """Test 135: Tag sets written by set() expire with the longest TTL of their members"""
+        redis_client = _FakeRedis()
+        cache = MultiLevelCache(self.mock_db, redis_client, ttl=60)
+        
+        cache.set('a', 1, ttl=120, tags=['users'])
+        cache.set('b', 2, tags=['users'])
+        
+        self.assertEqual(redis_client.data['cache-tag:users'], {'a', 'b'})
+        self.assertEqual(redis_client.ttls['cache-tag:users'], 120)
+    
+    def test_stats_are_thread_safe(self):
+        """Test 110: Concurrent hits are all counted"""
+        cache = MultiLevelCache(self.mock_db, self.mock_redis)
+        cache.set('k', 'v')
+        
+        def worker():
+            for _ in range(500):
+                cache.get_or_compute('k', lambda: 'v')
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        self.assertEqual(cache.stats['total_requests'], 4000)
+        self.assertEqual(cache.stats['l1_hits'], 4000)
+    
     def test_get_stats(self):
         """Test 20: Get cache statistics"""
         cache = MultiLevelCache(self.mock_db, self.mock_redis)
@@ -574,6 +856,102 @@ class TestQueryBuilder(unittest.TestCase):
         self.assertIsNone(self.builder._table)
         self.assertEqual(len(self.builder._where), 0)
 
+    
+    def test_keyset_predicates(self):
+        """Test 111: Keyset pagination emits seek predicates instead of OFFSET"""
+        sql = self.builder.table('events').keyset(['created_at', 'id'], after=('2024-01-01', 7), limit=20).to_sql()
+        self.assertIn('WHERE (created_at, id) > (%s, %s)', sql)
+        self.assertIn('ORDER BY created_at ASC, id ASC LIMIT 20', sql)
+        self.assertNotIn('OFFSET', sql)
+        self.assertEqual(self.builder._params, ['2024-01-01', 7])
+        
+        # Mixed directions expand into an OR chain
+        builder = QueryBuilder(self.mock_db)
+        sql = builder.table('events').keyset([('score', 'DESC'), 'id'], after=(10, 3)).to_sql()
+        self.assertIn('((score < %s) OR (score = %s AND id > %s))', sql)
+        self.assertEqual(builder._params, [10, 10, 3])
+    
+    def test_paginate_with_cursor(self):
+        """Test 112: Paging through a table with cursor tokens visits every row once"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            db = SQLiteDatabase({'database': os.path.join(temp_dir, 'pages.db')})
+            db.connect()
+            db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, grp INTEGER)")
+            db.execute_many("INSERT INTO items VALUES (?, ?)", [(i, i % 3) for i in range(1, 251)])
+            db.commit()
+            
+            seen, cursor, pages = [], None, 0
+            while True:
+                page = QueryBuilder(db).table('items').where('grp', '>=', 0).paginate(
+                    [('grp', 'DESC'), 'id'], page_size=100, cursor=cursor)
+                seen.extend((row['grp'], row['id']) for row in page['rows'])
+                pages += 1
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            db.disconnect()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, sorted(seen, key=lambda r: (-r[0], r[1])))
+        self.assertEqual(len(set(seen)), 250)
+    
+    def test_cursor_tokens(self):
+        """Test 113: Cursor tokens keep value types and reject other orderings"""
+        values = [datetime(2024, 3, 1, 8, 30), Decimal('1.50'), 42]
+        token = QueryBuilder.encode_cursor(['at', 'price', 'id'], values)
+        
+        self.assertEqual(QueryBuilder.decode_cursor(token, ['at', 'price', 'id']), values)
+        with self.assertRaises(ValueError):
+            QueryBuilder.decode_cursor(token, ['id'])
+        with self.assertRaises(ValueError):
+            QueryBuilder.decode_cursor('not-a-cursor', ['id'])
+    
+    def test_dialect_placeholders_and_compiled_cache(self):
+        """Test 114: Placeholders follow the dialect and query shapes compile once"""
+        sqlite_sql = QueryBuilder(self.mock_db, dialect='sqlite').table('t').where('a', '=', 1).to_sql()
+        oracle_sql = (QueryBuilder(self.mock_db, dialect='oracle').table('t')
+                      .where('a', '=', 1).where('b', '=', 2).order_by('a').limit(5).to_sql())
+        
+        self.assertEqual(sqlite_sql, 'SELECT * FROM t WHERE a = ?')
+        self.assertEqual(oracle_sql, 'SELECT * FROM t WHERE a = :1 AND b = :2 ORDER BY a ASC '
+                                     'OFFSET 0 ROWS FETCH NEXT 5 ROWS ONLY')
+        self.assertEqual(QueryBuilder(SQLiteDatabase({'database': ':memory:'})).dialect, 'sqlite')
+        
+        # '%s' inside a quoted literal is text, not a placeholder
+        literal_sql = (QueryBuilder(self.mock_db, dialect='oracle').table('t')
+                       .where('a', '=', 1).having("name LIKE '%s%'").where('b', '=', 2).to_sql())
+        self.assertEqual(literal_sql, "SELECT * FROM t WHERE a = :1 AND b = :2 HAVING name LIKE '%s%'")
+        
+        before = QueryBuilder.compiled_cache_info()['hits']
+        for value in range(3):
+            QueryBuilder(self.mock_db).table('shape_test').where('id', '=', value).to_sql()
+        self.assertEqual(QueryBuilder.compiled_cache_info()['hits'] - before, 2)
+    
+    def test_compile_memoized_per_state(self):
+        """Test 128: Unchanged builder state is compiled once, any change recompiles"""
+        builder = QueryBuilder(self.mock_db).table('memo').where('id', '=', 1)
+        with patch.object(QueryBuilder, '_compile_select', wraps=QueryBuilder._compile_select) as compile_select:
+            first = builder.to_sql()
+            self.assertEqual(builder.to_sql(), first)
+            self.assertEqual(compile_select.call_count, 1)
+            
+            builder.limit(5)
+            self.assertTrue(builder.to_sql().endswith('LIMIT 5'))
+            self.assertEqual(compile_select.call_count, 2)
+        
+        builder.get()
+        self.mock_db.fetch_all.assert_called_once_with('SELECT * FROM memo WHERE id = %s LIMIT 5', (1,))
+    
+    def test_paginate_uppercase_columns(self):
+        """Test 129: Cursor values are found when the driver upper-cases column names"""
+        self.mock_db.fetch_all.return_value = [{'ID': 1}, {'ID': 2}, {'ID': 3}]
+        page = QueryBuilder(self.mock_db, dialect='oracle').table('items').paginate(['id'], page_size=2)
+        
+        self.assertEqual(QueryBuilder.decode_cursor(page['next_cursor'], ['id']), [2])
+
 
 class TestAuditLogger(unittest.TestCase):
     """Test AuditLogger class"""
@@ -749,6 +1127,126 @@ class TestAuditLogger(unittest.TestCase):
         self.assertEqual(params[8], '192.168.1.1')
         self.assertEqual(params[9], 'Mozilla/5.0')
 
+    
+    def _blocked_async_logger(self, **config):
+        """Async logger whose first batch write blocks until the returned event is set"""
+        release = threading.Event()
+        started = threading.Event()
+        
+        def execute(query, params=None):
+            if query.startswith('INSERT INTO audit_log') and not release.is_set():
+                started.set()
+                release.wait(5)
+        
+        logger = AuditLogger(self.mock_db, async_config={'queue_size': 2, 'flush_interval': 0.01, **config, 'connection_factory': lambda: self.mock_db})
+        self.mock_db.execute.side_effect = execute
+        logger.log_change('INSERT', 'users', 0, user_id='u')
+        self.assertTrue(started.wait(2))
+        return logger, release
+    
+    def test_async_batched_writes(self):
+        """Test 115: Async logging enqueues and writes multi-row batches"""
+        logger = AuditLogger(self.mock_db, async_config={'batch_size': 10, 'flush_interval': 5, 'connection_factory': lambda: self.mock_db})
+        self.mock_db.reset_mock()
+        
+        for i in range(25):
+            logger.log_change('UPDATE', 'users', i, old_values={'a': 1}, new_values={'a': 2}, user_id='u')
+        logger.flush()
+        
+        inserts = [c[0] for c in self.mock_db.execute.call_args_list]
+        self.assertTrue(all(q.startswith('INSERT INTO audit_log') for q, _ in inserts))
+        self.assertEqual(sum(len(params) for _, params in inserts), 25 * 12)
+        self.assertLessEqual(max(len(params) for _, params in inserts), 10 * 12)
+        stats = logger.get_stats()
+        self.assertEqual(stats['written'], 25)
+        self.assertEqual(stats['batches'], len(inserts))
+        logger.close()
+    
+    def test_async_drop_oldest(self):
+        """Test 116: Full queue drops the oldest event under drop_oldest"""
+        logger, release = self._blocked_async_logger(overflow='drop_oldest')
+        for i in range(1, 4):
+            logger.log_change('INSERT', 'users', i, user_id='u')
+        release.set()
+        logger.close()
+        
+        stats = logger.get_stats()
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['written'], 3)
+        written_ids = [c[0][1][4::12] for c in self.mock_db.execute.call_args_list
+                       if c[0][0].startswith('INSERT INTO audit_log')]
+        self.assertEqual(written_ids, [('0',), ('2', '3')])
+    
+    def test_async_spill_and_replay(self):
+        """Test 117: Full queue spills to disk and spilled events can be replayed"""
+        temp_dir = tempfile.mkdtemp()
+        spill_path = os.path.join(temp_dir, 'spill.ndjson')
+        try:
+            logger, release = self._blocked_async_logger(overflow='spill', spill_path=spill_path)
+            for i in range(1, 4):
+                logger.log_change('INSERT', 'users', i, user_id='u')
+            
+            with open(spill_path) as f:
+                spilled = [json.loads(line) for line in f]
+            self.assertEqual([row[4] for row in spilled], ['3'])
+            
+            release.set()
+            logger.flush()
+            self.assertEqual(logger.replay_spill(), 1)
+            self.assertFalse(os.path.exists(spill_path))
+            self.assertEqual(logger.get_stats()['written'], 4)
+            logger.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_async_close_flushes(self):
+        """Test 118: Closing the logger writes events still waiting for a batch"""
+        logger = AuditLogger(self.mock_db, async_config={'batch_size': 1000, 'flush_interval': 60, 'connection_factory': lambda: self.mock_db})
+        self.mock_db.reset_mock()
+        logger.log_change('DELETE', 'users', 7, old_values={'name': 'x'}, user_id='u')
+        self.mock_db.execute.assert_not_called()
+        
+        logger.close()
+        
+        self.assertIn('INSERT INTO audit_log', self.mock_db.execute.call_args[0][0])
+        self.assertEqual(logger.get_stats()['written'], 1)
+        with self.assertRaises(RuntimeError):
+            logger.log_change('DELETE', 'users', 8)
+    
+    def test_async_writer_uses_own_connection(self):
+        """Test 130: The writer commits on its own connection, never on the caller's"""
+        writer_db = Mock()
+        logger = AuditLogger(self.mock_db, async_config={'connection_factory': lambda: writer_db})
+        self.mock_db.reset_mock()
+        
+        logger.log_change('INSERT', 'users', 1, user_id='u')
+        logger.close()
+        
+        self.assertIn('INSERT INTO audit_log', writer_db.execute.call_args[0][0])
+        writer_db.commit.assert_called_once()
+        writer_db.disconnect.assert_called_once()
+        self.mock_db.execute.assert_not_called()
+        self.mock_db.commit.assert_not_called()
+        self.mock_db.rollback.assert_not_called()
+        
+        with self.assertRaises(ValueError):
+            AuditLogger(self.mock_db, async_config={})
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            db = SQLiteDatabase({'database': os.path.join(temp_dir, 'audit.db')})
+            db.connect()
+            logger = AuditLogger(db, async_config={'flush_interval': 60})
+            second = logger._connection_factory()
+            self.assertIsInstance(second, SQLiteDatabase)
+            self.assertIsNot(second.connection, db.connection)
+            self.assertEqual(second.connection_params, db.connection_params)
+            second.disconnect()
+            logger.close()
+            db.disconnect()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
 
 class TestEncryptedDatabase(unittest.TestCase):
     """Test EncryptedDatabase class"""
@@ -866,6 +1364,76 @@ class TestEncryptedDatabase(unittest.TestCase):
         result = enc_db._decrypt_fields('users', data)
         self.assertEqual(result['ssn'], 'plaintext')
 
+    
+    def test_blind_index_values(self):
+        """Test 119: Blind indexes are deterministic, keyed per field and written on insert"""
+        from cryptography.fernet import Fernet
+        
+        enc_db = EncryptedDatabase(self.mock_db, self.encryption_key)
+        enc_db.register_encrypted_fields('users', ['email', 'ssn'], indexed=['email'], normalize=str.lower)
+        
+        index = enc_db.blind_index('users', 'email', 'Ann@Example.com')
+        self.assertEqual(index, enc_db.blind_index('users', 'email', 'ann@example.com'))
+        self.assertNotEqual(index, enc_db.blind_index('admins', 'email', 'ann@example.com'))
+        self.assertNotEqual(index, EncryptedDatabase(self.mock_db, Fernet.generate_key())
+                            .blind_index('users', 'email', 'ann@example.com'))
+        self.assertEqual(len(index), EncryptedDatabase.BLIND_INDEX_LENGTH)
+        
+        enc_db.insert('users', {'name': 'Ann', 'email': 'ann@example.com', 'ssn': '1'})
+        query, params = self.mock_db.execute.call_args[0]
+        self.assertIn('email_bidx', query)
+        self.assertIn(index, params)
+        self.assertNotIn('ann@example.com', params)
+        self.assertEqual(len(enc_db.blind_index_ddl('users')), 2)
+    
+    def test_find_by_encrypted_field(self):
+        """Test 120: Lookup by an encrypted field is a single indexed query"""
+        enc_db = EncryptedDatabase(self.mock_db, self.encryption_key)
+        enc_db.register_encrypted_fields('users', ['email'], indexed=['email'])
+        stored = enc_db._encrypt_fields('users', {'id': 1, 'email': 'ann@example.com'})
+        self.mock_db.fetch_all.return_value = [stored]
+        
+        rows = enc_db.find_by('users', 'email', 'ann@example.com')
+        
+        self.mock_db.fetch_all.assert_called_once_with(
+            "SELECT * FROM users WHERE email_bidx = %s",
+            (enc_db.blind_index('users', 'email', 'ann@example.com'),)
+        )
+        self.assertEqual(rows[0]['email'], 'ann@example.com')
+        with self.assertRaises(ValueError):
+            enc_db.find_by('users', 'name', 'Ann')
+    
+    def test_batch_encrypt_decrypt(self):
+        """Test 121: Large result sets are processed in parallel and keep their order"""
+        enc_db = EncryptedDatabase(self.mock_db, self.encryption_key, workers=4, parallel_threshold=50)
+        enc_db.register_encrypted_fields('users', ['ssn'])
+        rows = [{'id': i, 'ssn': f'ssn-{i}'} for i in range(500)]
+        
+        encrypted = enc_db.encrypt_rows('users', rows)
+        self.assertTrue(all(e['ssn'] != r['ssn'] for e, r in zip(encrypted, rows)))
+        self.assertEqual(enc_db.decrypt_rows('users', encrypted), rows)
+        
+        self.assertEqual(enc_db.insert_many('users', rows[:10]), 10)
+        query, params = self.mock_db.execute_many.call_args[0]
+        self.assertEqual(query, "INSERT INTO users (id, ssn) VALUES (%s, %s)")
+        self.assertEqual(len(params), 10)
+        enc_db.close()
+    
+    def test_backfill_blind_indexes(self):
+        """Test 122: Existing rows get blind index values in keyset batches"""
+        enc_db = EncryptedDatabase(self.mock_db, self.encryption_key)
+        enc_db.register_encrypted_fields('users', ['email'], indexed=['email'])
+        rows = [enc_db._encrypt_fields('users', {'id': i, 'email': f'u{i}@x.io'}) for i in (1, 2, 3)]
+        for row in rows:
+            row.pop('email_bidx')
+        self.mock_db.fetch_all.side_effect = [rows[:2], rows[2:]]
+        
+        self.assertEqual(enc_db.backfill_blind_indexes('users', batch_size=2), 3)
+        
+        self.assertEqual(self.mock_db.fetch_all.call_args_list[1][0][1], (2,))
+        updates = [p for c in self.mock_db.execute_many.call_args_list for p in c[0][1]]
+        self.assertEqual(updates[2], (enc_db.blind_index('users', 'email', 'u3@x.io'), 3))
+
 
 class TestBackupManager(unittest.TestCase):
     """Test BackupManager class"""
@@ -894,23 +1462,35 @@ class TestBackupManager(unittest.TestCase):
         self.assertEqual(manager.backup_dir, self.temp_dir)
         self.assertTrue(os.path.exists(self.temp_dir))
     
-    @patch('os.system')
-    def test_create_postgresql_backup(self, mock_system):
+    def _fake_dump(self, output=b'-- SQL DUMP\n', returncode=0):
+        """Popen stand-in whose stdout yields a dump"""
+        process = Mock()
+        process.stdout = io.BytesIO(output)
+        process.stderr = io.BytesIO(b'' if returncode == 0 else b'connection refused')
+        process.wait.return_value = returncode
+        return process
+    
+    @patch('nexus.database.database_utilities.subprocess.Popen')
+    def test_create_postgresql_backup(self, mock_popen):
         """Test 65: Create PostgreSQL backup"""
+        mock_popen.return_value = self._fake_dump()
         manager = BackupManager(self.db_config, backup_dir=self.temp_dir)
         
-        # Mock the backup file creation
-        backup_file = os.path.join(self.temp_dir, 'test_backup.sql')
-        with open(backup_file, 'w') as f:
-            f.write('-- SQL DUMP')
-        
         result = manager.create_backup('test_backup')
         
-        mock_system.assert_called()
+        mock_popen.assert_called()
         self.assertTrue(result.endswith('.sql.gz'))
-    
-    @patch('os.system')
-    def test_create_mysql_backup(self, mock_system):
+        cmd = mock_popen.call_args[0][0]
+        self.assertEqual(cmd[0], 'pg_dump')
+        self.assertNotIn('pass', cmd)
+        self.assertEqual(mock_popen.call_args[1]['env']['PGPASSWORD'], 'pass')
+        with gzip.open(result, 'rb') as f:
+            self.assertEqual(f.read(), b'-- SQL DUMP\n')
+        # No uncompressed intermediate file is left behind
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'test_backup.sql')))
+    
+    @patch('nexus.database.database_utilities.subprocess.Popen')
+    def test_create_mysql_backup(self, mock_popen):
         """Test 66: Create MySQL backup"""
         mysql_config = {
             'type': 'mysql',
@@ -921,16 +1501,17 @@ class TestBackupManager(unittest.TestCase):
                 'password': 'pass'
             }
         }
+        mock_popen.return_value = self._fake_dump()
         
         manager = BackupManager(mysql_config, backup_dir=self.temp_dir)
         
-        backup_file = os.path.join(self.temp_dir, 'mysql_backup.sql')
-        with open(backup_file, 'w') as f:
-            f.write('-- SQL DUMP')
-        
         result = manager.create_backup('mysql_backup')
         
-        mock_system.assert_called()
+        mock_popen.assert_called()
+        cmd = mock_popen.call_args[0][0]
+        self.assertEqual(cmd[0], 'mysqldump')
+        self.assertFalse(any('pass' in arg for arg in cmd))
+        self.assertEqual(mock_popen.call_args[1]['env']['MYSQL_PWD'], 'pass')
     
     def test_compress_backup(self):
         """Test 67: Compress backup file"""
@@ -1004,6 +1585,133 @@ class TestBackupManager(unittest.TestCase):
         
         self.assertEqual(len(backups), 0)
 
+    
+    def test_parallel_gzip_writer(self):
+        """Test 123: Block-parallel gzip output is a valid gzip stream"""
+        from nexus.database.database_utilities import _ParallelGzipWriter
+        data = os.urandom(50000) + b'abc' * 100000
+        path = os.path.join(self.temp_dir, 'blocks.gz')
+        
+        with _ParallelGzipWriter(open(path, 'wb'), threads=4, block_size=16384) as out:
+            for start in range(0, len(data), 7000):
+                out.write(data[start:start + 7000])
+        
+        with gzip.open(path, 'rb') as f:
+            self.assertEqual(f.read(), data)
+    
+    @patch('nexus.database.database_utilities.subprocess.Popen')
+    def test_failed_dump_raises(self, mock_popen):
+        """Test 124: A failing dump raises and leaves no partial backup"""
+        mock_popen.return_value = self._fake_dump(b'partial', returncode=1)
+        manager = BackupManager(self.db_config, backup_dir=self.temp_dir)
+        
+        with self.assertRaises(RuntimeError) as ctx:
+            manager.create_backup('broken')
+        
+        self.assertIn('connection refused', str(ctx.exception))
+        self.assertEqual(manager.list_backups(), [])
+    
+    @patch('nexus.database.database_utilities.subprocess.Popen')
+    def test_incremental_dump_only_changed_tables(self, mock_popen):
+        """Test 125: Incremental dumps include only tables whose counters changed"""
+        mock_popen.side_effect = lambda *args, **kwargs: self._fake_dump()
+        manager = BackupManager(self.db_config, backup_dir=self.temp_dir)
+        
+        with patch.object(manager, '_table_fingerprints', return_value={'public.users': '5', 'public.orders': '9'}):
+            manager.create_backup('full')
+        with patch.object(manager, '_table_fingerprints', return_value={'public.users': '5', 'public.orders': '12'}), \
+                patch.object(manager, '_fetch_from_source', return_value=[]):
+            incremental = manager.create_backup('inc', incremental=True)
+        
+        cmd = mock_popen.call_args[0][0]
+        self.assertEqual(cmd[cmd.index('-t') + 1:], ['public.orders'])
+        self.assertIn('--clean', cmd)
+        self.assertEqual([m['name'] for m in manager._restore_chain(os.path.basename(incremental))],
+                         ['full', 'inc'])
+    
+    @patch('nexus.database.database_utilities.subprocess.Popen')
+    def test_incremental_dump_includes_referencing_tables(self, mock_popen):
+        """Test 131: Tables referencing a changed PostgreSQL table are dumped with it"""
+        mock_popen.side_effect = lambda *args, **kwargs: self._fake_dump()
+        manager = BackupManager(self.db_config, backup_dir=self.temp_dir)
+        edges = [{'child': 'public.orders', 'parent': 'public.users'},
+                 {'child': 'public.order_items', 'parent': 'public.orders'},
+                 {'child': 'public.users', 'parent': 'public.regions'}]
+        
+        with patch.object(manager, '_table_fingerprints', return_value={'public.users': '5', 'public.regions': '1'}):
+            manager.create_backup('full')
+        with patch.object(manager, '_table_fingerprints', return_value={'public.users': '6', 'public.regions': '1'}), \
+                patch.object(manager, '_fetch_from_source', return_value=edges):
+            manager.create_backup('inc', incremental=True)
+        
+        cmd = mock_popen.call_args[0][0]
+        dumped = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-t']
+        self.assertEqual(dumped, ['public.order_items', 'public.orders', 'public.users'])
+    
+    @patch('nexus.database.database_utilities.DatabaseFactory.create_database')
+    def test_mysql_checksum_fingerprints(self, mock_factory):
+        """Test 132: MySQL fingerprints come from CHECKSUM TABLE and NULL checksums are always dumped"""
+        self.db_config['type'] = 'mysql'
+        db = Mock()
+        db.fetch_all.side_effect = lambda query: (
+            [{'name': 'a'}, {'name': 'b'}] if query.startswith('SELECT')
+            else [{'Table': 'testdb.a', 'Checksum': 123}, {'Table': 'testdb.b', 'Checksum': None}]
+        )
+        mock_factory.return_value = db
+        manager = BackupManager(self.db_config, backup_dir=self.temp_dir)
+        
+        self.assertEqual(manager._table_fingerprints(), {'a': '123', 'b': None})
+        self.assertEqual(db.fetch_all.call_args[0][0], 'CHECKSUM TABLE `a`, `b`')
+        db.disconnect.assert_called_once()
+        
+        with patch.object(manager, '_stream_process_output'):
+            manager.create_backup('full')
+            manager.create_backup('inc', incremental=True)
+        self.assertEqual(manager._latest_manifest()['changed_tables'], ['b'])
+    
+    def test_stderr_flood_does_not_deadlock(self):
+        """Test 133: A client writing lots of stderr before stdout still completes"""
+        manager = BackupManager(self.db_config, backup_dir=self.temp_dir)
+        script = "import sys; sys.stderr.write('w' * 1000000); sys.stderr.flush(); sys.stdout.write('-- dump')"
+        path = os.path.join(self.temp_dir, 'flood.sql.gz')
+        
+        worker = threading.Thread(target=manager._stream_process_output,
+                                  args=([sys.executable, '-c', script], dict(os.environ), path), daemon=True)
+        worker.start()
+        worker.join(30)
+        
+        self.assertFalse(worker.is_alive())
+        with gzip.open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'-- dump')
+    
+    def test_sqlite_incremental_backup_and_restore(self):
+        """Test 126: SQLite backups use the online backup API and store only changed pages"""
+        source = os.path.join(self.temp_dir, 'app.db')
+        conn = sqlite3.connect(source)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)")
+        conn.executemany("INSERT INTO items VALUES (?, ?)", [(i, 'x' * 200) for i in range(2000)])
+        conn.commit()
+        
+        manager = BackupManager({'type': 'sqlite', 'params': {'database': source}},
+                                backup_dir=os.path.join(self.temp_dir, 'backups'))
+        manager.create_backup('full')
+        conn.execute("UPDATE items SET body = 'changed' WHERE id = 1500")
+        conn.commit()
+        incremental = manager.create_backup('inc', incremental=True)
+        conn.close()
+        
+        manifest = manager._latest_manifest()
+        self.assertEqual(manifest['type'], 'incremental')
+        self.assertLess(manifest['changed_pages'], manifest['page_count'] // 10)
+        
+        restored = os.path.join(self.temp_dir, 'restored.db')
+        BackupManager({'type': 'sqlite', 'params': {'database': restored}},
+                      backup_dir=manager.backup_dir).restore_backup(incremental)
+        check = sqlite3.connect(restored)
+        self.assertEqual(check.execute("SELECT COUNT(*) FROM items").fetchone()[0], 2000)
+        self.assertEqual(check.execute("SELECT body FROM items WHERE id = 1500").fetchone()[0], 'changed')
+        check.close()
+
 
 class TestConnectionPoolAdvanced(unittest.TestCase):
     """Advanced connection pool tests"""